@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
+from car_dealership.imagenes import url_variante
+from catalogo.busqueda import BusquedaTextoAdminMixin
 from .models import Categoria, Accesorio
 
 @admin.register(Categoria)
@@ -11,14 +13,14 @@ class CategoriaAdmin(admin.ModelAdmin):
     
     def imagen_miniatura(self, obj):
         if obj.imagen:
-            return format_html('<img src="{}" style="max-height: 50px;" />', obj.imagen.url)
+            return format_html('<img src="{}" style="max-height: 50px;" />', url_variante(obj, 'imagen'))
         return "Sin imagen"
     imagen_miniatura.short_description = 'Imagen'
     imagen_miniatura.allow_tags = True
     
     def imagen_preview(self, obj):
         if obj.imagen:
-            return format_html('<img src="{}" style="max-width: 300px; max-height: 300px;" />', obj.imagen.url)
+            return format_html('<img src="{}" style="max-width: 300px; max-height: 300px;" />', url_variante(obj, 'imagen', 'tarjeta'))
         return "Sin imagen"
     imagen_preview.short_description = 'Vista previa de la imagen'
     imagen_preview.allow_tags = True
@@ -28,15 +30,15 @@ class CategoriaAdmin(admin.ModelAdmin):
     cantidad_accesorios.short_description = 'N° de Accesorios'
 
 @admin.register(Accesorio)
-class AccesorioAdmin(admin.ModelAdmin):
+class AccesorioAdmin(BusquedaTextoAdminMixin, admin.ModelAdmin):
     list_display = ('nombre', 'categoria', 'precio_formateado', 'stock', 'disponible', 'imagen_miniatura')
     list_filter = ('categoria', 'fecha_creacion')
-    search_fields = ('nombre', 'descripcion', 'categoria__nombre')
+    search_fields = ('nombre', 'descripcion', 'categoria__nombre', 'sku_proveedor')
     list_editable = ('stock',)
     readonly_fields = ('fecha_creacion', 'fecha_actualizacion', 'imagen_preview')
     fieldsets = (
         (None, {
-            'fields': ('categoria', 'nombre', 'descripcion')
+            'fields': ('sku_proveedor', 'categoria', 'nombre', 'descripcion')
         }),
         ('Precio y Stock', {
             'fields': ('precio', 'stock')
@@ -62,14 +64,14 @@ class AccesorioAdmin(admin.ModelAdmin):
     
     def imagen_miniatura(self, obj):
         if obj.imagen:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px; object-fit: cover;" />', obj.imagen.url)
+            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px; object-fit: cover;" />', url_variante(obj, 'imagen'))
         return "Sin imagen"
     imagen_miniatura.short_description = 'Imagen'
     imagen_miniatura.allow_tags = True
     
     def imagen_preview(self, obj):
         if obj.imagen:
-            return format_html('<img src="{}" style="max-width: 300px; max-height: 300px;" />', obj.imagen.url)
+            return format_html('<img src="{}" style="max-width: 300px; max-height: 300px;" />', url_variante(obj, 'imagen', 'tarjeta'))
         return "Sin imagen"
     imagen_preview.short_description = 'Vista previa de la imagen'
     imagen_preview.allow_tags = True
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AccesoriosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accesorios'
+
+    def ready(self):
+        from car_dealership.cache_respuestas import invalidar_al_cambiar
+        from car_dealership.imagenes import registrar_variantes
+
+        registrar_variantes(self.get_model('Categoria'), 'imagen')
+        registrar_variantes(self.get_model('Accesorio'), 'imagen')
+        invalidar_al_cambiar(self.get_model('Categoria'))
+        invalidar_al_cambiar(self.get_model('Accesorio'))
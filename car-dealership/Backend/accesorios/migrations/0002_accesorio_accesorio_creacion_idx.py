@@ -0,0 +1,17 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accesorios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accesorio',
+            index=models.Index(fields=['fecha_creacion', 'id'], name='accesorio_creacion_idx'),
+        ),
+    ]
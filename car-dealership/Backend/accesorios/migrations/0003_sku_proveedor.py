@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accesorios', '0002_accesorio_accesorio_creacion_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accesorio',
+            name='sku_proveedor',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True, verbose_name='SKU del Proveedor'),
+        ),
+    ]
@@ -5,6 +5,7 @@ class Categoria(models.Model):
     nombre = models.CharField(_('Nombre'), max_length=100)
     descripcion = models.TextField(_('Descripción'), blank=True, null=True)
     imagen = models.ImageField(_('Imagen'), upload_to='categorias/', blank=True, null=True)
+    imagen_variantes = models.JSONField(_('Variantes de imagen'), default=dict, blank=True, editable=False)
 
     class Meta:
         verbose_name = _('Categoría')
@@ -20,11 +21,13 @@ class Accesorio(models.Model):
         on_delete=models.CASCADE,
         verbose_name=_('Categoría')
     )
+    sku_proveedor = models.CharField(_('SKU del Proveedor'), max_length=64, unique=True, null=True, blank=True)
     nombre = models.CharField(_('Nombre'), max_length=200)
     descripcion = models.TextField(_('Descripción'))
     precio = models.DecimalField(_('Precio'), max_digits=10, decimal_places=2)
     stock = models.PositiveIntegerField(_('Stock'))
     imagen = models.ImageField(_('Imagen'), upload_to='accesorios/')
+    imagen_variantes = models.JSONField(_('Variantes de imagen'), default=dict, blank=True, editable=False)
     fecha_creacion = models.DateTimeField(_('Fecha de Creación'), auto_now_add=True)
     fecha_actualizacion = models.DateTimeField(_('Fecha de Actualización'), auto_now=True)
 
@@ -32,6 +35,9 @@ class Accesorio(models.Model):
         verbose_name = _('Accesorio')
         verbose_name_plural = _('Accesorios')
         ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['fecha_creacion', 'id'], name='accesorio_creacion_idx'),
+        ]
 
     def __str__(self):
         return self.nombre
@@ -1,19 +1,24 @@
 from rest_framework import serializers
+from car_dealership.imagenes import VariantesImagenField
 from .models import Categoria, Accesorio
 
 class CategoriaSerializer(serializers.ModelSerializer):
+    imagen_variantes = VariantesImagenField()
+
     class Meta:
         model = Categoria
-        fields = ['id', 'nombre', 'descripcion', 'imagen']
+        fields = ['id', 'nombre', 'descripcion', 'imagen', 'imagen_variantes']
         read_only_fields = ['id']
 
 class AccesorioSerializer(serializers.ModelSerializer):
     categoria_nombre = serializers.CharField(source='categoria.nombre', read_only=True)
+    imagen_variantes = VariantesImagenField()
 
     class Meta:
         model = Accesorio
         fields = [
             'id',
+            'sku_proveedor',
             'categoria',
             'categoria_nombre',
             'nombre',
@@ -21,6 +26,7 @@ class AccesorioSerializer(serializers.ModelSerializer):
             'precio',
             'stock',
             'imagen',
+            'imagen_variantes',
             'fecha_creacion',
             'fecha_actualizacion'
         ]
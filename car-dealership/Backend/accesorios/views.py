@@ -1,21 +1,30 @@
 from rest_framework import generics
+from car_dealership.cache_respuestas import CacheVersionadaMixin
+from car_dealership.condicional import RespuestaCondicionalMixin
+from car_dealership.lectura import LecturaPlanaMixin
+from car_dealership.optimizacion import ConsultaOptimizadaMixin
+from car_dealership.paginacion import PaginacionCursor
 from .models import Categoria, Accesorio
 from .serializers import CategoriaSerializer, AccesorioSerializer
 
-class CategoriaList(generics.ListAPIView):
+class CategoriaList(CacheVersionadaMixin, generics.ListAPIView):
     queryset = Categoria.objects.all()
     serializer_class = CategoriaSerializer
+    pagination_class = PaginacionCursor
 
-class CategoriaDetail(generics.RetrieveAPIView):
+class CategoriaDetail(CacheVersionadaMixin, generics.RetrieveAPIView):
     queryset = Categoria.objects.all()
     serializer_class = CategoriaSerializer
     lookup_field = 'id'
 
-class AccesorioList(generics.ListAPIView):
+class AccesorioList(CacheVersionadaMixin, RespuestaCondicionalMixin, ConsultaOptimizadaMixin, LecturaPlanaMixin, generics.ListAPIView):
+    modelos_cache = (Accesorio, Categoria)
     queryset = Accesorio.objects.all()
     serializer_class = AccesorioSerializer
+    pagination_class = PaginacionCursor
 
-class AccesorioDetail(generics.RetrieveAPIView):
+class AccesorioDetail(CacheVersionadaMixin, RespuestaCondicionalMixin, ConsultaOptimizadaMixin, generics.RetrieveAPIView):
+    modelos_cache = (Accesorio, Categoria)
     queryset = Accesorio.objects.all()
     serializer_class = AccesorioSerializer
     lookup_field = 'id'
@@ -4,7 +4,9 @@ from django.utils import timezone
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
-from .models import TipoAsesoria, Asesoria
+from car_dealership.estados import TransicionesAdminMixin
+from . import estados
+from .models import TipoAsesoria, Asesoria, HistorialEstadoAsesoria
 
 @admin.register(TipoAsesoria)
 class TipoAsesoriaAdmin(admin.ModelAdmin):
@@ -38,13 +40,24 @@ class TipoAsesoriaAdmin(admin.ModelAdmin):
     duracion_estimada_formateada.short_description = 'Duración Estimada'
     duracion_estimada_formateada.admin_order_field = 'duracion_estimada'
 
+class HistorialEstadoAsesoriaInline(admin.TabularInline):
+    model = HistorialEstadoAsesoria
+    extra = 0
+    readonly_fields = ('fecha_cambio', 'usuario', 'estado_anterior', 'estado_nuevo', 'notas')
+    can_delete = False
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+
 @admin.register(Asesoria)
-class AsesoriaAdmin(admin.ModelAdmin):
+class AsesoriaAdmin(TransicionesAdminMixin, admin.ModelAdmin):
+    maquina = estados.maquina
     list_display = ('id', 'cliente', 'tipo_asesoria', 'estado_badge', 'fecha_solicitud_formateada', 'acciones')
     list_filter = ('estado', 'tipo_asesoria', 'fecha_solicitud')
     search_fields = ('cliente__usuario__username', 'cliente__usuario__email', 'tipo_asesoria__nombre')
     list_select_related = ('cliente__usuario', 'tipo_asesoria', 'asesor__usuario')
     readonly_fields = ('fecha_solicitud', 'duracion_real', 'estado_actual', 'historial_estados')
+    inlines = [HistorialEstadoAsesoriaInline]
     fieldsets = (
         ('Información General', {
             'fields': ('cliente', 'tipo_asesoria', 'asesor', 'estado')
@@ -53,7 +66,7 @@ class AsesoriaAdmin(admin.ModelAdmin):
             'fields': ('fecha_solicitud', 'fecha_programada', 'fecha_inicio', 'fecha_fin', 'duracion_real')
         }),
         ('Detalles', {
-            'fields': ('descripcion', 'notas', 'resultados')
+            'fields': ('descripcion', 'resultado', 'comentarios')
         }),
         ('Historial', {
             'fields': ('estado_actual', 'historial_estados'),
@@ -89,9 +102,32 @@ class AsesoriaAdmin(admin.ModelAdmin):
     estado_actual.allow_tags = True
     
     def historial_estados(self, obj):
-        # Aquí iría la lógica para mostrar el historial de cambios de estado
-        # Similar a como se implementó en el modelo de reparaciones
-        return "Historial de cambios de estado"
+        historial = obj.historial_estados.all().order_by('-fecha_cambio')
+        if not historial:
+            return "No hay historial de cambios de estado"
+            
+        rows = []
+        for h in historial:
+            rows.append(
+                f"<tr>"
+                f"<td>{h.fecha_cambio.astimezone(timezone.get_current_timezone()).strftime('%d/%m/%Y %H:%M')}</td>"
+                f"<td>{h.estado_anterior} → {h.estado_nuevo}</td>"
+                f"<td>{h.usuario.username if h.usuario else 'Sistema'}</td>"
+                f"<td>{h.notas or ''}</td>"
+                f"</tr>"
+            )
+        
+        return mark_safe(
+            f'<table class="table">'
+            f'<thead><tr>'
+            f'<th>Fecha</th>'
+            f'<th>Cambio de Estado</th>'
+            f'<th>Usuario</th>'
+            f'<th>Notas</th>'
+            f'</tr></thead>'
+            f'<tbody>{"".join(rows)}</tbody>'
+            f'</table>'
+        )
     historial_estados.short_description = 'Historial de Estados'
     historial_estados.allow_tags = True
     
@@ -109,19 +145,3 @@ class AsesoriaAdmin(admin.ModelAdmin):
         return ""
     acciones.short_description = 'Acciones'
     acciones.allow_tags = True
-    
-    def save_model(self, request, obj, form, change):
-        # Lógica para manejar cambios de estado y cálculo de duración
-        if 'estado' in request.GET:
-            nuevo_estado = request.GET['estado']
-            if nuevo_estado != obj.estado:
-                # Registrar el cambio de estado en el historial
-                obj.estado = nuevo_estado
-                if nuevo_estado == 'EN_PROCESO':
-                    obj.fecha_inicio = timezone.now()
-                elif nuevo_estado in ['COMPLETADA', 'CANCELADA']:
-                    obj.fecha_fin = timezone.now()
-                    if obj.fecha_inicio:
-                        obj.duracion_real = obj.fecha_fin - obj.fecha_inicio
-        
-        super().save_model(request, obj, form, change)
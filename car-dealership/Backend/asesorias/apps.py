@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AsesoriasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'asesorias'
+
+    def ready(self):
+        from car_dealership.cache_respuestas import invalidar_al_cambiar
+
+        invalidar_al_cambiar(self.get_model('TipoAsesoria'))
+        invalidar_al_cambiar(self.get_model('Asesoria'))
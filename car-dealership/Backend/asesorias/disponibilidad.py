@@ -0,0 +1,181 @@
+"""
+Disponibilidad de los asesores y reserva de asesorías.
+
+Cada asesor (empleado activo con cargo en ``CARGOS_ASESORES``) tiene una
+agenda ``Intervalos`` con sus asesorías programadas, de
+``fecha_programada`` a ``fecha_programada + tipo.duracion_estimada``. Las
+agendas de los próximos ``ASESORIAS_HORIZONTE_DIAS`` se guardan en memoria
+del proceso y se reconstruyen cuando cambia la versión de Asesoria,
+TipoAsesoria, Empleado o Usuario en la caché de respuestas (se incrementa al
+confirmar cada cambio), así que consultar huecos no toca la base de datos
+salvo para leer esas versiones.
+
+La reserva no se fía de la caché: dentro de una transacción bloquea la fila
+del asesor y comprueba los solapes contra la base de datos.
+"""
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from car_dealership.agenda import Intervalos, Jornada
+from car_dealership.cache_respuestas import versiones
+from piezas.compatibilidad import normalizar
+from usuarios.models import Empleado, Usuario
+from .models import Asesoria, TipoAsesoria
+
+# Estados en los que una asesoría con fecha ocupa al asesor
+OCUPAN = ('PENDIENTE', 'PROGRAMADA', 'EN_PROCESO')
+
+
+class HorarioNoDisponible(Exception):
+    """La franja pedida se solapa con otra asesoría o cae fuera del horario."""
+
+
+def _paso():
+    return timedelta(minutes=getattr(settings, 'ASESORIAS_PASO_MINUTOS', 30))
+
+
+def _horizonte():
+    return timedelta(days=getattr(settings, 'ASESORIAS_HORIZONTE_DIAS', 30))
+
+
+def asesores():
+    """ids de los empleados que atienden asesorías."""
+    cargos = {normalizar(cargo) for cargo in getattr(settings, 'CARGOS_ASESORES', ('Asesor',))}
+    return [
+        pk for pk, cargo in Empleado.objects.filter(usuario__is_active=True).order_by('pk').values_list('pk', 'cargo')
+        if normalizar(cargo) in cargos
+    ]
+
+
+def _ocupadas(asesor_ids, desde, hasta, excluir=None):
+    """(asesor, inicio, fin) de las asesorías que se solapan con ``[desde, hasta)``."""
+    duracion_maxima = TipoAsesoria.objects.aggregate(maxima=Max('duracion_estimada'))['maxima'] or timedelta(0)
+    filas = Asesoria.objects.filter(
+        asesor_id__in=asesor_ids, estado__in=OCUPAN,
+        fecha_programada__gt=desde - duracion_maxima, fecha_programada__lt=hasta,
+    )
+    if excluir is not None:
+        filas = filas.exclude(pk=excluir)
+    for asesor, inicio, duracion in filas.values_list('asesor_id', 'fecha_programada', 'tipo_asesoria__duracion_estimada'):
+        if inicio + duracion > desde:
+            yield asesor, inicio, inicio + duracion
+
+
+class Agendas:
+    """Agendas de todos los asesores desde ``desde`` hasta ``hasta``."""
+
+    def __init__(self, desde, hasta):
+        self.desde = desde
+        self.hasta = hasta
+        self.asesores = asesores()
+        self.intervalos = {pk: Intervalos() for pk in self.asesores}
+        for asesor, inicio, fin in _ocupadas(self.asesores, desde, hasta):
+            self.intervalos[asesor].ocupar(inicio, fin)
+
+
+_cache = {'version': None, 'agendas': None}
+_lock = threading.Lock()
+
+
+def agendas(ahora=None):
+    """Agendas en memoria; se reconstruyen si cambió algún modelo o el horizonte se quedó corto."""
+    ahora = ahora or timezone.now()
+    version = tuple(versiones([Asesoria, TipoAsesoria, Empleado, Usuario]))
+    with _lock:
+        actuales = _cache['agendas']
+        vigentes = (
+            _cache['version'] == version and actuales is not None
+            and actuales.desde <= ahora and ahora + _horizonte() / 2 <= actuales.hasta
+        )
+        if not vigentes:
+            actuales = _agendas_desde(ahora)
+            _cache.update(version=version, agendas=actuales)
+    return actuales
+
+
+def _agendas_desde(fecha):
+    inicio = fecha.replace(hour=0, minute=0, second=0, microsecond=0)
+    return Agendas(inicio, inicio + _horizonte())
+
+
+def _alinear(fecha, paso):
+    """Primer múltiplo de ``paso`` (contado desde medianoche local) en o después de ``fecha``."""
+    local = timezone.localtime(fecha)
+    medianoche = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    pasos = -((medianoche - local) // paso)
+    return medianoche + pasos * paso
+
+
+def huecos(tipo, cantidad=10, desde=None, asesor=None):
+    """
+    Próximas ``cantidad`` franjas libres para ``tipo`` (TipoAsesoria) como
+    dicts ``{'inicio', 'fin', 'asesores'}``, con los asesores libres en cada una.
+    Un ``desde`` más allá de las agendas en caché se calcula aparte, sin cachear.
+    """
+    ahora = timezone.now()
+    desde = max(desde or ahora, ahora)
+    actuales = agendas(ahora)
+    if desde + _horizonte() / 2 > actuales.hasta:
+        actuales = _agendas_desde(desde)
+    candidatos = [pk for pk in actuales.asesores if asesor is None or pk == asesor]
+    duracion, paso = tipo.duracion_estimada, _paso()
+    resultado = []
+    for tramo_inicio, tramo_fin in Jornada().tramos_entre(desde, actuales.hasta):
+        inicio = _alinear(tramo_inicio, paso)
+        while inicio + duracion <= tramo_fin:
+            libres = [pk for pk in candidatos if actuales.intervalos[pk].libre(inicio, inicio + duracion)]
+            if libres:
+                resultado.append({'inicio': inicio, 'fin': inicio + duracion, 'asesores': libres})
+                if len(resultado) >= cantidad:
+                    return resultado
+            inicio += paso
+    return resultado
+
+
+def _libre_en_bd(asesor, inicio, fin, excluir=None):
+    return next(_ocupadas([asesor], inicio, fin, excluir), None) is None
+
+
+def validar_franja(asesoria):
+    """
+    Lanza ``HorarioNoDisponible`` si la asesoría (con asesor y fecha) se
+    solapa con otra del mismo asesor. La usa ``Asesoria.clean()``.
+    """
+    if not asesoria.asesor_id or not asesoria.fecha_programada or asesoria.estado not in OCUPAN:
+        return
+    fin = asesoria.fecha_programada + asesoria.tipo_asesoria.duracion_estimada
+    if not _libre_en_bd(asesoria.asesor_id, asesoria.fecha_programada, fin, excluir=asesoria.pk):
+        raise HorarioNoDisponible('El asesor ya tiene otra asesoría en ese horario')
+
+
+def reservar(cliente, tipo, inicio, descripcion, asesor=None):
+    """
+    Crea una asesoría PROGRAMADA en ``inicio``. Sin ``asesor`` se elige el
+    primero libre. Lanza ``HorarioNoDisponible`` si no cabe.
+    """
+    fin = inicio + tipo.duracion_estimada
+    if inicio < timezone.now():
+        raise HorarioNoDisponible('La fecha ya pasó')
+    if not Jornada().dentro(inicio, fin):
+        raise HorarioNoDisponible('La franja cae fuera del horario de atención')
+    disponibles = asesores()
+    if asesor is not None:
+        if asesor not in disponibles:
+            raise HorarioNoDisponible('El empleado no atiende asesorías')
+        disponibles = [asesor]
+    with transaction.atomic():
+        # Bloquear a los asesores serializa las reservas que compiten por ellos
+        # (en SQLite lo hace BEGIN IMMEDIATE)
+        list(Empleado.objects.select_for_update().filter(pk__in=disponibles).order_by('pk').values_list('pk', flat=True))
+        for pk in disponibles:
+            if _libre_en_bd(pk, inicio, fin):
+                return Asesoria.objects.create(
+                    cliente=cliente, tipo_asesoria=tipo, asesor_id=pk, estado='PROGRAMADA',
+                    fecha_programada=inicio, descripcion=descripcion,
+                )
+    raise HorarioNoDisponible('No hay asesores libres en ese horario')
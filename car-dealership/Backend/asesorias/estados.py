@@ -0,0 +1,29 @@
+"""Estados de una asesoría y lo que se escribe al entrar en ellos."""
+from django.db.models import DateTimeField, DurationField, ExpressionWrapper, F, Value
+
+from car_dealership.estados import MaquinaEstados
+from .models import Asesoria, HistorialEstadoAsesoria
+
+TRANSICIONES = {
+    'PENDIENTE': ('PROGRAMADA', 'EN_PROCESO', 'CANCELADA'),
+    'PROGRAMADA': ('PENDIENTE', 'EN_PROCESO', 'CANCELADA'),
+    'EN_PROCESO': ('COMPLETADA', 'CANCELADA'),
+}
+
+
+def _terminada(ahora):
+    # Sin fecha_inicio la resta da NULL y duracion_real queda vacía
+    return {
+        'fecha_fin': ahora,
+        'duracion_real': ExpressionWrapper(Value(ahora, DateTimeField()) - F('fecha_inicio'), output_field=DurationField()),
+    }
+
+
+maquina = MaquinaEstados(
+    Asesoria, TRANSICIONES, HistorialEstadoAsesoria, 'asesoria',
+    al_entrar={
+        'EN_PROCESO': lambda ahora: {'fecha_inicio': ahora},
+        'COMPLETADA': _terminada,
+        'CANCELADA': _terminada,
+    },
+)
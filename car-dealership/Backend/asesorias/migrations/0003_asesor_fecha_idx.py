@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asesorias', '0002_initial'),
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asesoria',
+            index=models.Index(fields=['asesor', 'fecha_programada'], name='asesoria_asesor_fecha_idx'),
+        ),
+    ]
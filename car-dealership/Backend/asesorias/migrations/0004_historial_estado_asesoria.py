@@ -0,0 +1,33 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asesorias', '0003_asesor_fecha_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistorialEstadoAsesoria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('estado_anterior', models.CharField(max_length=20, verbose_name='Estado Anterior')),
+                ('estado_nuevo', models.CharField(max_length=20, verbose_name='Estado Nuevo')),
+                ('fecha_cambio', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Cambio')),
+                ('notas', models.TextField(blank=True, null=True, verbose_name='Notas')),
+                ('asesoria', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='historial_estados', to='asesorias.asesoria')),
+                ('usuario', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Historial de Estado de Asesoría',
+                'verbose_name_plural': 'Historial de Estados de Asesorías',
+                'ordering': ['-fecha_cambio'],
+            },
+        ),
+    ]
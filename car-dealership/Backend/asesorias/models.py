@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from usuarios.models import Cliente, Empleado
@@ -57,7 +58,46 @@ class Asesoria(models.Model):
         verbose_name = _('Asesoría')
         verbose_name_plural = _('Asesorías')
         ordering = ['-fecha_solicitud']
+        indexes = [
+            models.Index(fields=['asesor', 'fecha_programada'], name='asesoria_asesor_fecha_idx'),
+        ]
 
     def __str__(self):
         return f'Asesoría #{self.id} - {self.get_estado_display()}'
 
+    def clean(self):
+        # Un asesor no puede tener dos asesorías a la vez
+        from .disponibilidad import HorarioNoDisponible, validar_franja
+
+        if self.tipo_asesoria_id is None:
+            return
+        try:
+            validar_franja(self)
+        except HorarioNoDisponible as e:
+            raise ValidationError({'fecha_programada': str(e)})
+
+
+class HistorialEstadoAsesoria(models.Model):
+    asesoria = models.ForeignKey(
+        Asesoria,
+        on_delete=models.CASCADE,
+        related_name='historial_estados'
+    )
+    estado_anterior = models.CharField(_('Estado Anterior'), max_length=20)
+    estado_nuevo = models.CharField(_('Estado Nuevo'), max_length=20)
+    fecha_cambio = models.DateTimeField(_('Fecha de Cambio'), auto_now_add=True)
+    usuario = models.ForeignKey(
+        'usuarios.Usuario',
+        on_delete=models.SET_NULL,
+        null=True,
+        verbose_name=_('Usuario')
+    )
+    notas = models.TextField(_('Notas'), blank=True, null=True)
+
+    class Meta:
+        verbose_name = _('Historial de Estado de Asesoría')
+        verbose_name_plural = _('Historial de Estados de Asesorías')
+        ordering = ['-fecha_cambio']
+
+    def __str__(self):
+        return f'Cambio de estado en {self.asesoria} el {self.fecha_cambio}'
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from car_dealership.campos import CamposDinamicosMixin
 from .models import TipoAsesoria, Asesoria
 from usuarios.models import Cliente, Empleado
 from usuarios.serializers import ClienteSerializer, EmpleadoSerializer
@@ -20,7 +21,7 @@ class TipoAsesoriaSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('El precio debe ser mayor a 0')
         return value
 
-class AsesoriaSerializer(serializers.ModelSerializer):
+class AsesoriaSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     cliente_detalle = ClienteSerializer(read_only=True, source='cliente')
     cliente_id = serializers.PrimaryKeyRelatedField(
         queryset=Cliente.objects.all(),
@@ -1,3 +1,56 @@
-from django.test import TestCase
+from datetime import date, datetime, timedelta
 
-# Create your tests here.
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from usuarios.models import Cliente, Empleado, Usuario
+from . import disponibilidad
+from .models import Asesoria, TipoAsesoria
+
+
+class ReservaAsesoriaTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = Usuario.objects.create_user(email='cliente@ejemplo.com', username='cliente', password='clave')
+        Cliente.objects.create(usuario=cls.usuario)
+        cls.asesores = []
+        for i in range(2):
+            usuario = Usuario.objects.create_user(email=f'asesor{i}@ejemplo.com', username=f'asesor{i}', password='clave')
+            cls.asesores.append(Empleado.objects.create(usuario=usuario, cargo='Asesor', fecha_contratacion=date(2020, 1, 1)))
+        cls.tipo = TipoAsesoria.objects.create(nombre='Compra', duracion_estimada=timedelta(minutes=30))
+
+    def setUp(self):
+        self.client.force_authenticate(self.usuario)
+
+    def test_asesor_no_valido(self):
+        inicio = disponibilidad.huecos(self.tipo, 1)[0]['inicio']
+        response = self.client.post('/api/asesorias/reservar/', {
+            'tipo_asesoria_id': self.tipo.pk, 'fecha_programada': inicio.isoformat(),
+            'descripcion': 'Quiero comprar', 'asesor_id': 'abc',
+        }, format='json', secure=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('asesor_id', response.json())
+        self.assertFalse(Asesoria.objects.exists())
+        response = self.client.get(f'/api/asesorias/disponibilidad/?tipo={self.tipo.pk}&asesor=abc', secure=True)
+        self.assertEqual(response.status_code, 400)
+
+    def test_reservar_con_asesor(self):
+        inicio = disponibilidad.huecos(self.tipo, 1)[0]['inicio']
+        asesor = self.asesores[1]
+        response = self.client.post('/api/asesorias/reservar/', {
+            'tipo_asesoria_id': self.tipo.pk, 'fecha_programada': inicio.isoformat(),
+            'descripcion': 'Quiero comprar', 'asesor_id': str(asesor.pk),
+        }, format='json', secure=True)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Asesoria.objects.get().asesor_id, asesor.pk)
+
+    def test_desde_mas_alla_del_horizonte(self):
+        desde = timezone.now() + disponibilidad._horizonte() * 3
+        huecos = disponibilidad.huecos(self.tipo, 3, desde)
+        self.assertEqual(len(huecos), 3)
+        self.assertTrue(all(hueco['inicio'] >= desde for hueco in huecos))
+        response = self.client.get(
+            '/api/asesorias/disponibilidad/', {'tipo': self.tipo.pk, 'desde': desde.isoformat(), 'n': 3}, secure=True,
+        )
+        self.assertEqual(len(response.json()['huecos']), 3)
+        self.assertGreaterEqual(datetime.fromisoformat(response.json()['huecos'][0]['inicio']), desde)
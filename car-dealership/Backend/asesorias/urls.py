@@ -1,5 +1,8 @@
 from django.urls import path
-from .views import TipoAsesoriaList, TipoAsesoriaDetail, AsesoriaList, AsesoriaDetail
+from .views import (
+    TipoAsesoriaList, TipoAsesoriaDetail, AsesoriaList, AsesoriaDetail,
+    DisponibilidadView, ReservarAsesoriaView, TransicionAsesoriaView,
+)
 
 urlpatterns = [
     # Tipos de Asesoría
@@ -9,4 +12,10 @@ urlpatterns = [
     # Asesorías
     path('', AsesoriaList.as_view(), name='asesoria-list'),
     path('<int:id>/', AsesoriaDetail.as_view(), name='asesoria-detail'),
+    path('<int:id>/estado/', TransicionAsesoriaView.as_view(), name='asesoria-estado'),
+    path('estado/', TransicionAsesoriaView.as_view(), name='asesoria-estado-lote'),
+
+    # Agenda de asesores
+    path('disponibilidad/', DisponibilidadView.as_view(), name='asesoria-disponibilidad'),
+    path('reservar/', ReservarAsesoriaView.as_view(), name='asesoria-reservar'),
 ]
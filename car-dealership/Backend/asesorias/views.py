@@ -1,21 +1,100 @@
-from rest_framework import generics
+from datetime import datetime
+
+from django.utils import timezone
+from django.utils.duration import duration_string
+from rest_framework import generics, serializers, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from car_dealership.cache_respuestas import CacheVersionadaMixin
+from car_dealership.estados import TransicionView
+from car_dealership.optimizacion import ConsultaOptimizadaMixin
+from . import disponibilidad, estados
 from .models import TipoAsesoria, Asesoria
 from .serializers import TipoAsesoriaSerializer, AsesoriaSerializer
 
-class TipoAsesoriaList(generics.ListAPIView):
+class TipoAsesoriaList(CacheVersionadaMixin, ConsultaOptimizadaMixin, generics.ListAPIView):
     queryset = TipoAsesoria.objects.all()
     serializer_class = TipoAsesoriaSerializer
 
-class TipoAsesoriaDetail(generics.RetrieveAPIView):
+class TipoAsesoriaDetail(ConsultaOptimizadaMixin, generics.RetrieveAPIView):
     queryset = TipoAsesoria.objects.all()
     serializer_class = TipoAsesoriaSerializer
     lookup_field = 'id'
 
-class AsesoriaList(generics.ListAPIView):
+class AsesoriaList(ConsultaOptimizadaMixin, generics.ListAPIView):
     queryset = Asesoria.objects.all()
     serializer_class = AsesoriaSerializer
 
-class AsesoriaDetail(generics.RetrieveAPIView):
+class AsesoriaDetail(ConsultaOptimizadaMixin, generics.RetrieveAPIView):
     queryset = Asesoria.objects.all()
     serializer_class = AsesoriaSerializer
     lookup_field = 'id'
+
+class TransicionAsesoriaView(TransicionView):
+    maquina = estados.maquina
+    serializer_class = AsesoriaSerializer
+
+def _fecha(valor):
+    """Fecha ISO con o sin zona; None si no viene o no es válida."""
+    if not valor:
+        return None
+    try:
+        fecha = datetime.fromisoformat(valor)
+    except (TypeError, ValueError):
+        return None
+    return fecha if timezone.is_aware(fecha) else timezone.make_aware(fecha)
+
+def _entero(valor):
+    try:
+        return int(valor) if valor not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+def _asesor(valor, parametro):
+    """Id de asesor opcional; ValidationError (400) si viene pero no es un entero."""
+    asesor = _entero(valor)
+    if asesor is None and valor not in (None, ''):
+        raise serializers.ValidationError({parametro: 'Debe ser el id de un empleado'})
+    return asesor
+
+class DisponibilidadView(APIView):
+    """
+    Próximas franjas libres para ``?tipo=`` (id de TipoAsesoria). Admite
+    ``?n=`` (10 por defecto, hasta 100), ``?desde=`` y ``?asesor=``.
+    """
+
+    def get(self, request):
+        tipo = TipoAsesoria.objects.filter(pk=_entero(request.query_params.get('tipo'))).first()
+        if tipo is None:
+            return Response({'error': 'Indique un tipo de asesoría válido en ?tipo='}, status=status.HTTP_400_BAD_REQUEST)
+        cantidad = min(100, max(1, _entero(request.query_params.get('n')) or 10))
+        huecos = disponibilidad.huecos(
+            tipo, cantidad, _fecha(request.query_params.get('desde')), _asesor(request.query_params.get('asesor'), 'asesor'),
+        )
+        return Response({'tipo_asesoria': tipo.pk, 'duracion': duration_string(tipo.duracion_estimada), 'huecos': huecos})
+
+class ReservarAsesoriaView(APIView):
+    """
+    Reserva una franja para el cliente autenticado: ``tipo_asesoria_id``,
+    ``fecha_programada``, ``descripcion`` y opcionalmente ``asesor_id``.
+    Responde 409 si la franja ya no está libre.
+    """
+
+    def post(self, request):
+        cliente = getattr(request.user, 'cliente', None)
+        if cliente is None:
+            return Response({'error': 'Solo los clientes pueden reservar asesorías'}, status=status.HTTP_403_FORBIDDEN)
+        tipo = TipoAsesoria.objects.filter(pk=_entero(request.data.get('tipo_asesoria_id'))).first()
+        inicio = _fecha(request.data.get('fecha_programada'))
+        descripcion = request.data.get('descripcion')
+        if tipo is None or inicio is None or not descripcion:
+            return Response(
+                {'error': 'tipo_asesoria_id, fecha_programada y descripcion son obligatorios'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        asesor = _asesor(request.data.get('asesor_id'), 'asesor_id')
+        try:
+            asesoria = disponibilidad.reservar(cliente, tipo, inicio, descripcion, asesor)
+        except disponibilidad.HorarioNoDisponible as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+        return Response(AsesoriaSerializer(asesoria).data, status=status.HTTP_201_CREATED)
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from car_dealership import basedatos
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -52,6 +55,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'car_dealership.replicas.ReplicasMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -138,11 +142,14 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': basedatos.configuracion(BASE_DIR),
 }
+DATABASES.update(basedatos.replicas(DATABASES['default']))
+
+# Lecturas de peticiones GET en las réplicas (DB_REPLICAS), ver car_dealership/replicas.py
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['car_dealership.replicas.EnrutadorReplicas'] if DATABASE_REPLICAS else []
+REPLICAS_VENTANA_ESCRITURA = int(os.environ.get('DB_REPLICA_VENTANA', 5))
 
 
 # Password validation
@@ -175,6 +182,30 @@ USE_I18N = True
 
 USE_TZ = True
 
+# Planificación del taller (reparaciones/planificacion.py): horario por día de
+# la semana (0 = lunes) y cargos de Empleado que reciben reparaciones
+JORNADA_LABORAL = {
+    0: [('08:00', '12:00'), ('13:00', '17:00')],
+    1: [('08:00', '12:00'), ('13:00', '17:00')],
+    2: [('08:00', '12:00'), ('13:00', '17:00')],
+    3: [('08:00', '12:00'), ('13:00', '17:00')],
+    4: [('08:00', '12:00'), ('13:00', '17:00')],
+    5: [('08:00', '12:00')],
+}
+CARGOS_TECNICOS = ['Técnico', 'Mecánico']
+
+# Reserva de asesorías (asesorias/disponibilidad.py): cargos de Empleado que
+# atienden asesorías, separación entre franjas y días que se ofrecen
+CARGOS_ASESORES = ['Asesor']
+ASESORIAS_PASO_MINUTOS = 30
+ASESORIAS_HORIZONTE_DIAS = 30
+
+# Historial de estados (car_dealership/historial.py): días tras los que
+# archivar_historial mueve un cambio a la tabla de archivo y cambios que se
+# incluyen en el detalle de una reparación o devolución
+HISTORIAL_ARCHIVAR_DIAS = 365
+HISTORIAL_RECIENTES = 5
+
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
@@ -0,0 +1,189 @@
+"""
+Agendas de trabajo: intervalos ocupados y jornada laboral.
+
+``Intervalos`` guarda los intervalos ocupados de un recurso (un técnico, un
+asesor) fusionados y ordenados en dos listas paralelas, así que comprobar si
+un hueco está libre o buscar el primer hueco de cierta duración es una
+búsqueda binaria más un recorrido por los huecos que no sirven.
+
+``Jornada`` traduce fechas a "minutos laborables": un eje en el que solo
+cuentan las horas de trabajo. Sobre ese eje un trabajo de 12 horas con una
+jornada de 9 es simplemente un intervalo de 720 minutos que continúa el día
+siguiente, y las noches y fines de semana no ocupan sitio.
+"""
+import math
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+# Lunes a viernes de 8 a 17 con una hora de almuerzo; sábados por la mañana
+JORNADA_POR_DEFECTO = {
+    0: [('08:00', '12:00'), ('13:00', '17:00')],
+    1: [('08:00', '12:00'), ('13:00', '17:00')],
+    2: [('08:00', '12:00'), ('13:00', '17:00')],
+    3: [('08:00', '12:00'), ('13:00', '17:00')],
+    4: [('08:00', '12:00'), ('13:00', '17:00')],
+    5: [('08:00', '12:00')],
+}
+
+# Un lunes cualquiera: las semanas del eje laboral se cuentan desde aquí
+_ORIGEN = date(2000, 1, 3)
+
+
+class Intervalos:
+    """Conjunto de intervalos semiabiertos ``[inicio, fin)`` disjuntos."""
+
+    def __init__(self, intervalos=()):
+        self.inicios = []
+        self.fines = []
+        for inicio, fin in intervalos:
+            self.ocupar(inicio, fin)
+
+    def __len__(self):
+        return len(self.inicios)
+
+    def __iter__(self):
+        return zip(self.inicios, self.fines)
+
+    def ocupar(self, inicio, fin):
+        """Añade ``[inicio, fin)`` fusionándolo con los intervalos que toque."""
+        if fin <= inicio:
+            return
+        # Primer intervalo que termina en o después de inicio y primero que empieza después de fin
+        i = bisect_left(self.fines, inicio)
+        j = bisect_right(self.inicios, fin)
+        if i < j:
+            inicio = min(inicio, self.inicios[i])
+            fin = max(fin, self.fines[j - 1])
+        self.inicios[i:j] = [inicio]
+        self.fines[i:j] = [fin]
+
+    def liberar(self, inicio, fin):
+        """Quita ``[inicio, fin)``, partiendo los intervalos que lo contengan."""
+        if fin <= inicio:
+            return
+        i = bisect_right(self.fines, inicio)
+        j = bisect_left(self.inicios, fin)
+        if i >= j:
+            return
+        restos = []
+        if self.inicios[i] < inicio:
+            restos.append((self.inicios[i], inicio))
+        if self.fines[j - 1] > fin:
+            restos.append((fin, self.fines[j - 1]))
+        self.inicios[i:j] = [a for a, _b in restos]
+        self.fines[i:j] = [b for _a, b in restos]
+
+    def libre(self, inicio, fin):
+        """True si ``[inicio, fin)`` no se solapa con ningún intervalo."""
+        i = bisect_right(self.fines, inicio)
+        return i == len(self.inicios) or self.inicios[i] >= fin
+
+    def primer_hueco(self, desde, duracion, hasta=None):
+        """Inicio del primer hueco de ``duracion`` a partir de ``desde``, o None si no cabe antes de ``hasta``."""
+        candidato = desde
+        i = bisect_right(self.fines, desde)
+        while i < len(self.inicios) and self.inicios[i] < candidato + duracion:
+            candidato = max(candidato, self.fines[i])
+            i += 1
+        if hasta is not None and candidato + duracion > hasta:
+            return None
+        return candidato
+
+    def huecos(self, desde, hasta):
+        """Genera los huecos ``(inicio, fin)`` entre ``desde`` y ``hasta``."""
+        cursor = desde
+        i = bisect_right(self.fines, desde)
+        while cursor < hasta:
+            if i == len(self.inicios) or self.inicios[i] >= hasta:
+                yield cursor, hasta
+                return
+            if self.inicios[i] > cursor:
+                yield cursor, self.inicios[i]
+            cursor = max(cursor, self.fines[i])
+            i += 1
+
+    def ocupado(self, desde, hasta):
+        """Tiempo ocupado dentro de ``[desde, hasta)``."""
+        total = 0
+        i = bisect_right(self.fines, desde)
+        while i < len(self.inicios) and self.inicios[i] < hasta:
+            total += min(self.fines[i], hasta) - max(self.inicios[i], desde)
+            i += 1
+        return total
+
+
+def _minutos(texto):
+    horas, minutos = texto.split(':')
+    return int(horas) * 60 + int(minutos)
+
+
+class Jornada:
+    """
+    Horario semanal (día de la semana -> lista de tramos ``'HH:MM'``) en la
+    zona horaria del proyecto. Por defecto ``settings.JORNADA_LABORAL``.
+    """
+
+    def __init__(self, horario=None, zona=None):
+        horario = horario if horario is not None else getattr(settings, 'JORNADA_LABORAL', JORNADA_POR_DEFECTO)
+        self.zona = zona or timezone.get_default_timezone()
+        self.tramos = [
+            sorted((_minutos(inicio), _minutos(fin)) for inicio, fin in horario.get(dia, horario.get(str(dia), ())))
+            for dia in range(7)
+        ]
+        self.por_dia = [sum(fin - inicio for inicio, fin in tramos) for tramos in self.tramos]
+        self.antes_de = [sum(self.por_dia[:dia]) for dia in range(7)]
+        self.semana = sum(self.por_dia)
+        if not self.semana:
+            raise ValueError('La jornada laboral no tiene ninguna hora de trabajo')
+
+    def a_minutos(self, fecha):
+        """
+        Posición de ``fecha`` en el eje laboral. Un instante fuera de horario
+        cae en el siguiente minuto laborable.
+        """
+        local = timezone.localtime(fecha, self.zona)
+        semanas, dia = divmod((local.date() - _ORIGEN).days, 7)
+        minuto = local.hour * 60 + local.minute + (local.second + local.microsecond / 1e6) / 60
+        dentro = sum(max(0, min(fin, minuto) - inicio) for inicio, fin in self.tramos[dia])
+        return semanas * self.semana + self.antes_de[dia] + math.ceil(dentro)
+
+    def a_fecha(self, minutos, fin=False):
+        """
+        Fecha de la posición ``minutos`` del eje laboral. Con ``fin`` un límite
+        que coincide con el cierre de un tramo se devuelve como ese cierre y no
+        como la apertura del siguiente.
+        """
+        semanas, resto = divmod(minutos, self.semana)
+        if fin and resto == 0 and minutos:
+            semanas, resto = semanas - 1, self.semana
+        for dia in range(7):
+            for inicio, cierre in self.tramos[dia]:
+                largo = cierre - inicio
+                if resto < largo or (fin and resto == largo):
+                    return self._fecha(_ORIGEN + timedelta(days=semanas * 7 + dia), inicio + resto)
+                resto -= largo
+        raise AssertionError('minutos fuera de la semana laboral')
+
+    def _fecha(self, dia, minuto):
+        return datetime.combine(dia, time(minuto // 60, minuto % 60), tzinfo=self.zona)
+
+    def tramos_entre(self, desde, hasta):
+        """Genera los tramos de trabajo ``(inicio, fin)`` entre ``desde`` y ``hasta``, recortados a ese rango."""
+        dia = timezone.localtime(desde, self.zona).date()
+        while self._fecha(dia, 0) < hasta:
+            for inicio, fin in self.tramos[dia.weekday()]:
+                inicio, fin = self._fecha(dia, inicio), self._fecha(dia, fin)
+                if fin > desde and inicio < hasta:
+                    yield max(inicio, desde), min(fin, hasta)
+            dia += timedelta(days=1)
+
+    def dentro(self, inicio, fin):
+        """True si ``[inicio, fin)`` cae entero dentro de un mismo tramo de trabajo."""
+        return any(a <= inicio and fin <= b for a, b in self.tramos_entre(inicio, fin))
+
+    def duracion(self, intervalo):
+        """``timedelta`` -> minutos laborables (redondeando hacia arriba)."""
+        return max(1, math.ceil(intervalo.total_seconds() / 60))
@@ -0,0 +1,119 @@
+"""
+Configuración de ``DATABASES`` a partir de variables de entorno.
+
+``DB_ENGINE`` elige el perfil (por defecto ``postgresql`` si hay ``DB_HOST``
+y ``sqlite`` si no):
+
+- ``postgresql``: ``DB_NAME``, ``DB_USER``, ``DB_PASSWORD``, ``DB_HOST`` y
+  ``DB_PORT``. Conexiones persistentes (``DB_CONN_MAX_AGE`` segundos) con
+  comprobación de salud antes de reutilizarlas. ``DB_POOL_MAX`` activa el pool
+  de psycopg 3 (Django 5.1 o superior); con PgBouncer en modo transacción hay
+  que poner ``DB_PGBOUNCER=True``.
+- ``sqlite``: un solo nodo. Usa el backend ``car_dealership.bd_sqlite`` (WAL,
+  ``synchronous=NORMAL``, mmap y tiempo de espera por bloqueo) y transacciones
+  ``BEGIN IMMEDIATE`` para que las escrituras esperen el bloqueo en lugar de
+  fallar con "database is locked" a mitad de transacción.
+
+``DB_REPLICAS`` (separadas por comas) declara réplicas de solo lectura con el
+mismo perfil: ``host`` o ``host:puerto`` en PostgreSQL y rutas de archivo en
+SQLite. Se llaman ``replica1``, ``replica2``... (ver car_dealership/replicas.py).
+"""
+import os
+
+import django
+
+
+def _entero(nombre, defecto):
+    valor = os.environ.get(nombre)
+    return int(valor) if valor not in (None, '') else defecto
+
+
+def _booleano(nombre, defecto=False):
+    valor = os.environ.get(nombre)
+    if valor in (None, ''):
+        return defecto
+    return valor.lower() in ('1', 'true', 'yes', 'si', 'sí')
+
+
+def postgresql():
+    opciones = {
+        'connect_timeout': _entero('DB_CONNECT_TIMEOUT', 5),
+        'application_name': os.environ.get('DB_APPLICATION_NAME', 'car_dealership'),
+    }
+    if os.environ.get('DB_SSLMODE'):
+        opciones['sslmode'] = os.environ['DB_SSLMODE']
+    if _entero('DB_STATEMENT_TIMEOUT', 0):
+        # Milisegundos; corta las consultas descontroladas en el servidor
+        opciones['options'] = f"-c statement_timeout={_entero('DB_STATEMENT_TIMEOUT', 0)}"
+
+    config = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('DB_NAME', 'car_dealership'),
+        'USER': os.environ.get('DB_USER', ''),
+        'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '5432'),
+        'CONN_MAX_AGE': _entero('DB_CONN_MAX_AGE', 60),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': opciones,
+    }
+
+    pool_max = _entero('DB_POOL_MAX', 0)
+    if pool_max and django.VERSION >= (5, 1):
+        opciones['pool'] = {
+            'min_size': _entero('DB_POOL_MIN', 2),
+            'max_size': pool_max,
+            'timeout': _entero('DB_POOL_TIMEOUT', 10),
+        }
+        # Con pool, Django devuelve la conexión al pool al final de cada petición
+        config['CONN_MAX_AGE'] = 0
+    if _booleano('DB_PGBOUNCER'):
+        # En modo transacción los cursores con nombre no sobreviven entre transacciones
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return config
+
+
+def sqlite(base_dir):
+    return {
+        'ENGINE': 'car_dealership.bd_sqlite',
+        'NAME': os.environ.get('DB_NAME') or base_dir / 'db.sqlite3',
+        'OPTIONS': {
+            # Segundos que una conexión espera el bloqueo de escritura
+            'timeout': _entero('SQLITE_BUSY_TIMEOUT', 20),
+            'transaccion_inmediata': _booleano('SQLITE_TRANSACCION_INMEDIATA', True),
+            'pragmas': {
+                'journal_mode': 'WAL',
+                'synchronous': 'NORMAL',
+                'mmap_size': _entero('SQLITE_MMAP', 256 * 1024 * 1024),
+                'cache_size': -_entero('SQLITE_CACHE_KB', 64 * 1024),
+                'temp_store': 'MEMORY',
+            },
+        },
+    }
+
+
+def replicas(principal):
+    """Alias -> configuración de cada réplica de ``DB_REPLICAS``."""
+    config = {}
+    entradas = [e.strip() for e in os.environ.get('DB_REPLICAS', '').split(',') if e.strip()]
+    for i, entrada in enumerate(entradas, 1):
+        replica = dict(principal, OPTIONS=dict(principal.get('OPTIONS', {})))
+        if replica['ENGINE'] == 'django.db.backends.postgresql':
+            host, _, puerto = entrada.partition(':')
+            replica.update(HOST=host, PORT=puerto or principal['PORT'])
+        else:
+            replica['NAME'] = entrada
+        # En las pruebas las réplicas apuntan a la base de datos de pruebas principal
+        replica['TEST'] = {'MIRROR': 'default'}
+        config[f'replica{i}'] = replica
+    return config
+
+
+def configuracion(base_dir):
+    """Valor de ``DATABASES['default']``."""
+    motor = os.environ.get('DB_ENGINE') or ('postgresql' if os.environ.get('DB_HOST') else 'sqlite')
+    if motor in ('postgresql', 'postgres'):
+        return postgresql()
+    if motor == 'sqlite':
+        return sqlite(base_dir)
+    raise ValueError(f'DB_ENGINE no soportado: {motor}')
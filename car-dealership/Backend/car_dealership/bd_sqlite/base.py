@@ -0,0 +1,36 @@
+"""
+Backend SQLite con PRAGMAs por conexión y transacciones ``BEGIN IMMEDIATE``.
+
+SQLite admite un solo escritor. Con ``BEGIN`` (diferido) una transacción que
+lee y luego escribe puede encontrarse con el bloqueo tomado y fallar al
+instante con "database is locked", sin que el ``timeout`` ayude; con
+``BEGIN IMMEDIATE`` el bloqueo se pide al empezar y se espera ``timeout``.
+En WAL los lectores no bloquean al escritor ni al revés.
+
+Opciones propias en ``OPTIONS`` (se quitan antes de ``sqlite3.connect``):
+``pragmas`` (dict nombre -> valor) y ``transaccion_inmediata``.
+"""
+from django.db.backends.sqlite3 import base
+
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pragmas = params.pop('pragmas', PRAGMAS)
+        self.transaccion_inmediata = params.pop('transaccion_inmediata', True)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for nombre, valor in self.pragmas.items():
+            conn.execute(f'PRAGMA {nombre} = {valor}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE' if self.transaccion_inmediata else 'BEGIN')
@@ -0,0 +1,236 @@
+"""
+Caché versionada de respuestas de lectura.
+
+Cada modelo registrado tiene un contador de versión en la caché que se
+incrementa (al confirmar la transacción) en cada ``post_save``/``post_delete``;
+las escrituras masivas que no disparan señales llaman a ``invalidar()``. La clave de
+una respuesta incluye la URL completa y las versiones de los modelos de los
+que depende, así que un cambio deja inservibles exactamente las entradas
+afectadas y no hace falta adivinar un TTL.
+
+El almacenamiento es el alias ``CACHE_RESPUESTAS_ALIAS`` de ``CACHES``
+(memoria local con expulsión LRU, archivos o Redis). Con varios procesos la
+caché debe ser compartida (archivos o Redis) para que todos vean las
+versiones nuevas.
+"""
+import hashlib
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from car_dealership.metricas import CUBOS, Histograma
+from car_dealership.replicas import principal
+from car_dealership.vuelo_unico import adquirir
+
+# Cabeceras de la respuesta original que se guardan con los datos
+CABECERAS = ('ETag', 'Last-Modified')
+
+
+def cache():
+    return caches[getattr(settings, 'CACHE_RESPUESTAS_ALIAS', 'default')]
+
+
+def _clave_version(modelo):
+    return f'version:{modelo._meta.label_lower}'
+
+
+def versiones(modelos):
+    """Versión actual de cada modelo; las que falten se inicializan."""
+    claves = [_clave_version(m) for m in modelos]
+    encontradas = cache().get_many(claves)
+    for clave in claves:
+        if clave not in encontradas:
+            # Valor inicial único: si la clave se expulsó, no se reutiliza una
+            # versión vieja que aún tenga respuestas guardadas
+            cache().add(clave, time.time_ns(), timeout=None)
+            encontradas[clave] = cache().get(clave)
+    return [encontradas[clave] for clave in claves]
+
+
+def _incrementar(modelo):
+    clave = _clave_version(modelo)
+    try:
+        cache().incr(clave)
+    except ValueError:
+        cache().set(clave, time.time_ns(), timeout=None)
+
+
+def invalidar(*modelos):
+    """Invalida las respuestas que dependen de ``modelos`` al confirmar la transacción."""
+    for modelo in modelos:
+        transaction.on_commit(lambda modelo=modelo: _incrementar(modelo))
+
+
+def _al_cambiar(sender, raw=False, **kwargs):
+    if not raw:
+        invalidar(sender)
+
+
+def invalidar_al_cambiar(modelo):
+    """
+    Conecta post_save/post_delete de ``modelo``. Se llama desde AppConfig.ready().
+    Se conecta por modelo y no de forma global para no desactivar el borrado
+    rápido (sin señales) de los demás modelos.
+    """
+    post_save.connect(_al_cambiar, sender=modelo, dispatch_uid=f'cache_save_{modelo._meta.label}')
+    post_delete.connect(_al_cambiar, sender=modelo, dispatch_uid=f'cache_delete_{modelo._meta.label}')
+
+
+class EstadisticasCache:
+    """
+    Por nombre de URL (por proceso): aciertos y fallos, y para las vistas con
+    vuelo único cuántas veces se recalculó, cuántas se sirvió la versión
+    anterior y cuánto esperaron los que aguardaron al recálculo.
+    """
+    CONTADORES = ('aciertos', 'fallos', 'recalculos', 'obsoletas', 'esperas')
+
+    def __init__(self, ventana=1000):
+        self._lock = threading.Lock()
+        self._por_url = defaultdict(lambda: dict.fromkeys(self.CONTADORES, 0))
+        self._esperas = defaultdict(lambda: Histograma(CUBOS['db_ms'], ventana))
+
+    def registrar(self, nombre, contador):
+        with self._lock:
+            self._por_url[nombre][contador] += 1
+
+    def registrar_espera(self, nombre, ms):
+        with self._lock:
+            self._por_url[nombre]['esperas'] += 1
+            self._esperas[nombre].agregar(ms)
+
+    def resumen(self):
+        with self._lock:
+            resumen = {}
+            for nombre, conteos in self._por_url.items():
+                total = conteos['aciertos'] + conteos['fallos']
+                resumen[nombre] = dict(conteos, tasa_aciertos=conteos['aciertos'] / total if total else None)
+                if nombre in self._esperas:
+                    resumen[nombre]['espera_ms'] = self._esperas[nombre].resumen()
+            return resumen
+
+    def reiniciar(self):
+        with self._lock:
+            self._por_url.clear()
+            self._esperas.clear()
+
+
+estadisticas = EstadisticasCache(getattr(settings, 'METRICAS_VENTANA', 1000))
+
+
+class CacheVersionadaMixin:
+    """
+    Cachea ``list`` y ``retrieve`` de vistas genéricas de DRF. ``modelos_cache``
+    son los modelos cuyos cambios invalidan la respuesta (por defecto el del
+    queryset); incluye los de los serializadores anidados.
+
+    Con ``vuelo_unico = True``, ante un fallo solo un worker (hilo o proceso)
+    reconstruye la respuesta; los demás sirven la versión anterior de la misma
+    URL si la hay, o esperan a que el primero termine.
+    """
+    modelos_cache = ()
+    timeout_cache = None
+    vuelo_unico = False
+
+    def get_modelos_cache(self):
+        return self.modelos_cache or (self.queryset.model,)
+
+    def _identidad(self, request):
+        return (request.build_absolute_uri(request.path), sorted(request.query_params.lists()))
+
+    def clave_cache(self, request):
+        versiones_actuales = versiones(self.get_modelos_cache())
+        huella = hashlib.md5(repr((self._identidad(request), versiones_actuales)).encode(), usedforsecurity=False).hexdigest()
+        return f'respuesta:{huella}'
+
+    def clave_anterior(self, request):
+        """Última respuesta generada para la URL, sin importar la versión."""
+        huella = hashlib.md5(repr(self._identidad(request)).encode(), usedforsecurity=False).hexdigest()
+        return f'anterior:{huella}'
+
+    def _desde_cache(self, request, guardada, estado):
+        datos, cabeceras = guardada
+        if cabeceras:
+            no_modificada = get_conditional_response(
+                request,
+                etag=cabeceras.get('ETag'),
+                last_modified=parse_http_date_safe(cabeceras.get('Last-Modified', '')),
+            )
+            if no_modificada is not None:
+                for cabecera, valor in cabeceras.items():
+                    no_modificada[cabecera] = valor
+                return no_modificada
+        response = Response(datos, headers=cabeceras)
+        response['X-Cache'] = estado
+        return response
+
+    def _generar(self, request, clave, nombre, generar, *args, **kwargs):
+        estadisticas.registrar(nombre, 'recalculos')
+        # Desde la principal: una réplica atrasada dejaría datos viejos
+        # guardados con la versión nueva hasta el siguiente cambio
+        with principal():
+            response = generar(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            guardada = (response.data, {c: response[c] for c in CABECERAS if c in response})
+            timeout = self.timeout_cache or getattr(settings, 'CACHE_RESPUESTAS_TIMEOUT', 3600)
+            cache().set(clave, guardada, timeout)
+            if self.vuelo_unico:
+                cache().set(self.clave_anterior(request), guardada, timeout)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def respuesta_cacheada(self, request, generar, *args, **kwargs):
+        clave = self.clave_cache(request)
+        nombre = request.resolver_match.url_name if request.resolver_match else type(self).__name__
+        guardada = cache().get(clave)
+        if guardada is not None:
+            estadisticas.registrar(nombre, 'aciertos')
+            return self._desde_cache(request, guardada, 'HIT')
+        estadisticas.registrar(nombre, 'fallos')
+        if not self.vuelo_unico:
+            return self._generar(request, clave, nombre, generar, *args, **kwargs)
+
+        with adquirir(clave) as lider:
+            if lider:
+                # Otro worker pudo terminar entre la consulta y el bloqueo
+                guardada = cache().get(clave)
+                if guardada is not None:
+                    return self._desde_cache(request, guardada, 'HIT')
+                return self._generar(request, clave, nombre, generar, *args, **kwargs)
+
+        anterior = cache().get(self.clave_anterior(request))
+        if anterior is not None:
+            estadisticas.registrar(nombre, 'obsoletas')
+            return self._desde_cache(request, anterior, 'STALE')
+
+        inicio = time.perf_counter()
+        with adquirir(clave, espera=getattr(settings, 'VUELO_UNICO_ESPERA', 10)):
+            estadisticas.registrar_espera(nombre, (time.perf_counter() - inicio) * 1000)
+            guardada = cache().get(clave)
+            if guardada is not None:
+                return self._desde_cache(request, guardada, 'HIT')
+            # El primero falló o la espera se agotó: se genera aquí
+            return self._generar(request, clave, nombre, generar, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return self.respuesta_cacheada(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.respuesta_cacheada(request, super().retrieve, *args, **kwargs)
+
+
+class CacheEstadisticasView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(estadisticas.resumen())
@@ -0,0 +1,68 @@
+"""
+Selección de campos por parámetros de la URL (``?fields=`` y ``?expand=``).
+
+- ``fields=id,estado,cliente_detalle.nombre``: solo esos campos; con punto se
+  eligen los campos de un objeto anidado.
+- ``expand=cliente_detalle,producto_devuelto_detalle.comentarios``: qué objetos
+  anidados se incluyen (a cualquier profundidad). Si el parámetro está, los
+  anidados que no aparecen se omiten; un anidado pedido en ``fields`` cuenta
+  como expandido.
+
+Sin parámetros la respuesta es la completa de siempre. Solo se aplica al
+serializador de nivel superior y nunca quita campos de escritura. Como los
+campos se podan en la instancia, ConsultaOptimizadaMixin planifica el queryset
+con ella y solo carga las relaciones que se van a serializar.
+"""
+from rest_framework import serializers
+
+
+def _arbol(valor):
+    """'a,b.c,b.d' -> {'a': {}, 'b': {'c': {}, 'd': {}}}; None si no hay parámetro."""
+    if valor is None:
+        return None
+    arbol = {}
+    for ruta in valor.split(','):
+        nodo = arbol
+        for nombre in ruta.strip().split('.'):
+            if nombre:
+                nodo = nodo.setdefault(nombre, {})
+    return arbol
+
+
+def _podar(serializer, campos, expandir):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    for nombre, field in list(serializer.fields.items()):
+        if field.write_only:
+            continue
+        if campos is not None and nombre not in campos:
+            serializer.fields.pop(nombre)
+            continue
+        if not isinstance(field, serializers.BaseSerializer):
+            continue
+        pedido_en_campos = campos is not None and nombre in campos
+        if expandir is not None and nombre not in expandir and not pedido_en_campos:
+            serializer.fields.pop(nombre)
+            continue
+        _podar(
+            field,
+            (campos or {}).get(nombre) or None,
+            expandir.get(nombre, {}) if expandir is not None else None,
+        )
+
+
+class CamposDinamicosMixin:
+    """Mixin para ModelSerializer que atiende ``?fields=`` y ``?expand=``."""
+    parametro_campos = 'fields'
+    parametro_expandir = 'expand'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return
+        params = getattr(request, 'query_params', request.GET)
+        campos = _arbol(params.get(self.parametro_campos) or None)
+        expandir = _arbol(params.get(self.parametro_expandir))
+        if campos is not None or expandir is not None:
+            _podar(self, campos, expandir)
@@ -0,0 +1,84 @@
+"""
+GET condicional (ETag / Last-Modified) para vistas genéricas de DRF.
+
+Los validadores salen de ``fecha_actualizacion``: en detalle, la del propio
+objeto; en listas, una huella barata del conjunto filtrado (fecha máxima y
+número de filas, en una sola consulta agregada). Si el cliente ya tiene esa
+versión se responde 304 sin ejecutar el serializador.
+
+Si la representación incluye datos de otros modelos (``modelos_cache`` de
+``CacheVersionadaMixin``, p. ej. el nombre de la categoría), el ETag lleva
+también sus versiones de caché y no se envía ``Last-Modified``, que solo
+refleja la fecha del modelo principal.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from car_dealership.cache_respuestas import versiones
+
+
+def _etag(*partes):
+    huella = hashlib.md5('|'.join(str(p) for p in partes).encode(), usedforsecurity=False).hexdigest()
+    # Débil: depende de versiones de caché, no de los bytes de la respuesta
+    return f'W/"{huella}"'
+
+
+class RespuestaCondicionalMixin:
+    campo_modificacion = 'fecha_actualizacion'
+
+    def modelos_relacionados(self):
+        """Modelos, además del de la vista, cuyos datos aparecen en la respuesta."""
+        modelos = self.get_modelos_cache() if hasattr(self, 'get_modelos_cache') else ()
+        return [modelo for modelo in modelos if modelo is not self.queryset.model]
+
+    def _validadores(self, ultima, *partes):
+        relacionados = self.modelos_relacionados()
+        if relacionados:
+            return _etag(*partes, *versiones(relacionados)), None
+        return _etag(*partes), ultima
+
+    def validadores_objeto(self, instance):
+        ultima = getattr(instance, self.campo_modificacion)
+        return self._validadores(ultima, instance._meta.label, instance.pk, ultima.isoformat())
+
+    def validadores_queryset(self, queryset):
+        datos = queryset.order_by().aggregate(ultima=Max(self.campo_modificacion), total=Count('pk'))
+        ultima = datos['ultima']
+        return self._validadores(ultima, queryset.model._meta.label, datos['total'], ultima.isoformat() if ultima else '')
+
+    def respuesta_no_modificada(self, request, etag, ultima):
+        """Devuelve la respuesta 304/412 si aplica, o None."""
+        respuesta = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(ultima.timestamp()) if ultima else None,
+        )
+        if respuesta is not None:
+            self.agregar_validadores(respuesta, etag, ultima)
+        return respuesta
+
+    def agregar_validadores(self, response, etag, ultima):
+        response['ETag'] = etag
+        if ultima is not None:
+            response['Last-Modified'] = http_date(ultima.timestamp())
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, ultima = self.validadores_objeto(instance)
+        respuesta = self.respuesta_no_modificada(request, etag, ultima)
+        if respuesta is not None:
+            return respuesta
+        serializer = self.get_serializer(instance)
+        return self.agregar_validadores(Response(serializer.data), etag, ultima)
+
+    def list(self, request, *args, **kwargs):
+        etag, ultima = self.validadores_queryset(self.filter_queryset(self.get_queryset()))
+        respuesta = self.respuesta_no_modificada(request, etag, ultima)
+        if respuesta is not None:
+            return respuesta
+        return self.agregar_validadores(super().list(request, *args, **kwargs), etag, ultima)
@@ -0,0 +1,223 @@
+"""
+Máquinas de estados de los modelos con ``estado`` e historial.
+
+Cada app declara su grafo de transiciones permitidas (estado -> estados a los
+que puede pasar) y crea una ``MaquinaEstados`` con él. Todos los cambios de
+estado pasan por ``transicionar_lote``: en una transacción lee los estados
+actuales, descarta las transiciones no permitidas y cambia el resto con un
+UPDATE ... WHERE estado=<anterior> por cada estado de origen (una sola
+sentencia si todas salen del mismo estado), crea las filas de historial con un
+``bulk_create`` y envía ``estado_cambiado``. Si otra petición cambió alguna
+fila entre la lectura y el UPDATE, el recuento no cuadra y se deshace todo.
+
+Como el UPDATE no dispara ``post_save``, los efectos que dependen del nuevo
+estado se conectan a ``estado_cambiado`` en lugar de a ``post_save``.
+"""
+from django.contrib import messages
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from car_dealership.cache_respuestas import invalidar
+
+# sender=modelo, ids=pks cambiados, anteriores={pk: estado anterior},
+# estado=nuevo estado, usuario. Se envía dentro de la transacción.
+estado_cambiado = Signal()
+
+# Filas por UPDATE / INSERT: por debajo del límite de variables de SQLite
+TAMANO_LOTE = 500
+
+
+class TransicionInvalida(Exception):
+    """El estado pedido no existe o no se puede alcanzar desde el actual."""
+
+
+class MaquinaEstados:
+    """
+    Grafo de estados de ``modelo``. ``historial`` es el modelo de historial y
+    ``relacion`` el nombre de su ForeignKey al modelo. ``al_entrar`` da, por
+    estado de destino, una función ``(ahora) -> dict`` con los campos extra que
+    se escriben en el mismo UPDATE (fechas de resolución, etc.).
+    """
+
+    def __init__(self, modelo, transiciones, historial=None, relacion=None, al_entrar=None, campo='estado'):
+        self.modelo = modelo
+        self.campo = campo
+        self.transiciones = {origen: frozenset(destinos) for origen, destinos in transiciones.items()}
+        self.historial = historial
+        self.relacion = relacion
+        self.al_entrar = al_entrar or {}
+        self.estados = {valor for valor, _etiqueta in modelo._meta.get_field(campo).choices}
+        desconocidos = (set(self.transiciones) | set().union(*self.transiciones.values())) - self.estados
+        if desconocidos:
+            raise ValueError(f'Estados desconocidos para {modelo.__name__}: {sorted(desconocidos)}')
+
+    def siguientes(self, estado):
+        """Estados a los que se puede pasar desde ``estado``."""
+        return self.transiciones.get(estado, frozenset())
+
+    def permitida(self, anterior, nuevo):
+        return nuevo in self.siguientes(anterior)
+
+    def transicionar_lote(self, ids, nuevo, usuario=None, notas=None, esperado=None):
+        """
+        Pasa a ``nuevo`` todas las filas de ``ids`` para las que la transición
+        está permitida (y, con ``esperado``, que estén en ese estado). Devuelve
+        ``(cambiados, rechazados)``: ``{pk: estado anterior}`` y
+        ``{pk: estado actual o None si no existe}``.
+        """
+        if not any(nuevo in destinos for destinos in self.transiciones.values()):
+            raise TransicionInvalida(f'No se puede pasar a {nuevo}')
+        ids = list(dict.fromkeys(ids))
+        with transaction.atomic():
+            actuales = {}
+            for inicio in range(0, len(ids), TAMANO_LOTE):
+                actuales.update(
+                    self.modelo.objects.select_for_update()
+                    .filter(pk__in=ids[inicio:inicio + TAMANO_LOTE])
+                    .values_list('pk', self.campo)
+                )
+            cambiados, rechazados, por_origen = {}, {}, {}
+            for pk in ids:
+                estado = actuales.get(pk)
+                if estado is None or (esperado is not None and estado != esperado) or not self.permitida(estado, nuevo):
+                    rechazados[pk] = estado
+                else:
+                    cambiados[pk] = estado
+                    por_origen.setdefault(estado, []).append(pk)
+            if not cambiados:
+                return cambiados, rechazados
+            ahora = timezone.now()
+            valores = {self.campo: nuevo, **(self.al_entrar[nuevo](ahora) if nuevo in self.al_entrar else {})}
+            for origen, pks in por_origen.items():
+                for inicio in range(0, len(pks), TAMANO_LOTE):
+                    lote = pks[inicio:inicio + TAMANO_LOTE]
+                    actualizadas = self.modelo.objects.filter(pk__in=lote, **{self.campo: origen}).update(**valores)
+                    if actualizadas != len(lote):
+                        raise TransicionInvalida('El estado cambió mientras se aplicaba la transición; inténtelo de nuevo')
+            if self.historial is not None:
+                self.historial.objects.bulk_create([
+                    self.historial(**{
+                        f'{self.relacion}_id': pk, 'estado_anterior': anterior, 'estado_nuevo': nuevo,
+                        'usuario': usuario, 'notas': notas,
+                    })
+                    for pk, anterior in cambiados.items()
+                ], batch_size=TAMANO_LOTE)
+            estado_cambiado.send(
+                sender=self.modelo, ids=list(cambiados), anteriores=cambiados, estado=nuevo, usuario=usuario,
+            )
+            invalidar(*[m for m in (self.modelo, self.historial) if m is not None])
+        return cambiados, rechazados
+
+    def transicionar(self, pk, nuevo, usuario=None, notas=None, esperado=None):
+        """Transición de una sola fila. Devuelve el estado anterior o lanza ``TransicionInvalida``."""
+        cambiados, rechazados = self.transicionar_lote([pk], nuevo, usuario, notas, esperado)
+        if pk in rechazados:
+            actual = rechazados[pk]
+            if actual is None:
+                raise TransicionInvalida(f'No existe {self.modelo._meta.verbose_name} #{pk}')
+            raise TransicionInvalida(f'No se puede pasar de {actual} a {nuevo}')
+        return cambiados[pk]
+
+
+class TransicionesAdminMixin:
+    """
+    Admin de un modelo con ``maquina``: el cambio de estado del formulario (o
+    de ``?estado=`` en los botones de la lista) pasa por la máquina, que
+    registra el historial, y cada estado de destino tiene una acción masiva.
+    """
+    maquina = None
+
+    def get_form(self, request, obj=None, **kwargs):
+        form = super().get_form(request, obj, **kwargs)
+        campo = form.base_fields.get(self.maquina.campo)
+        if obj is not None and campo is not None:
+            # Solo el estado actual y los alcanzables desde él
+            actual = getattr(obj, self.maquina.campo)
+            validos = {actual} | self.maquina.siguientes(actual)
+            campo.choices = [(valor, etiqueta) for valor, etiqueta in campo.choices if valor in validos]
+        return form
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        anterior = form.initial.get(self.maquina.campo)
+        nuevo = request.GET.get(self.maquina.campo) or getattr(obj, self.maquina.campo)
+        setattr(obj, self.maquina.campo, anterior)
+        if nuevo == anterior:
+            return super().save_model(request, obj, form, change)
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            try:
+                self.maquina.transicionar(
+                    obj.pk, nuevo, request.user, 'Cambio de estado realizado desde el panel de administración', anterior,
+                )
+            except TransicionInvalida as e:
+                self.message_user(request, str(e), messages.ERROR)
+                return
+        obj.refresh_from_db()
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        etiquetas = dict(self.model._meta.get_field(self.maquina.campo).choices)
+        destinos = sorted(set().union(*self.maquina.transiciones.values()), key=list(etiquetas).index)
+        for estado in destinos:
+            nombre = f'pasar_a_{estado.lower()}'
+            actions[nombre] = (self._accion_transicion(estado, etiquetas[estado]), nombre, f'Pasar a {etiquetas[estado]}')
+        return actions
+
+    def _accion_transicion(self, estado, etiqueta):
+        def accion(modeladmin, request, queryset):
+            cambiados, rechazados = self.maquina.transicionar_lote(
+                list(queryset.values_list('pk', flat=True)), estado, request.user,
+                'Cambio de estado masivo desde el panel de administración',
+            )
+            self.message_user(request, f'{len(cambiados)} pasaron a {etiqueta}')
+            if rechazados:
+                self.message_user(
+                    request, f'{len(rechazados)} no admiten pasar a {etiqueta} desde su estado actual', messages.WARNING,
+                )
+        return accion
+
+
+class TransicionView(APIView):
+    """
+    ``POST {"estado", "notas"}`` sobre ``<id>`` cambia el estado de una fila y
+    devuelve la fila serializada; sin ``<id>``, ``{"ids": [...], "estado",
+    "notas"}`` cambia muchas a la vez y devuelve las cambiadas y las
+    rechazadas con su estado actual.
+    """
+    permission_classes = [IsAdminUser]
+    maquina = None
+    serializer_class = None
+
+    def post(self, request, id=None):
+        nuevo = request.data.get('estado')
+        notas = request.data.get('notas')
+        if not isinstance(nuevo, str) or nuevo not in self.maquina.estados:
+            return Response({'error': 'Estado no válido'}, status=status.HTTP_400_BAD_REQUEST)
+        if id is None:
+            ids = request.data.get('ids')
+            # bool es subclase de int: true/false no son ids
+            if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+                return Response({'error': 'ids debe ser una lista de enteros'}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                cambiados, rechazados = self.maquina.transicionar_lote(ids, nuevo, request.user, notas)
+            except TransicionInvalida as e:
+                return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+            return Response({
+                'estado': nuevo,
+                'cambiados': [{'id': pk, 'estado_anterior': anterior} for pk, anterior in cambiados.items()],
+                'rechazados': [{'id': pk, 'estado': actual} for pk, actual in rechazados.items()],
+            })
+        try:
+            self.maquina.transicionar(id, nuevo, request.user, notas)
+        except TransicionInvalida as e:
+            if not self.maquina.modelo.objects.filter(pk=id).exists():
+                return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+        return Response(self.serializer_class(self.maquina.modelo.objects.get(pk=id)).data)
@@ -0,0 +1,145 @@
+"""
+Archivo del historial de estados.
+
+Las tablas de historial solo crecen. ``ArchivoHistorial.archivar()`` mueve las
+filas con más de ``HISTORIAL_ARCHIVAR_DIAS`` días a una tabla de archivo con
+las mismas columnas (y el mismo id), por lotes y cada lote en su transacción,
+así que la tabla caliente se queda con los cambios recientes. Los
+``HISTORIAL_RECIENTES`` cambios más nuevos de cada objeto no se archivan
+aunque sean antiguos, para que el detalle siempre los tenga.
+
+Los serializadores de detalle solo incluyen los ``HISTORIAL_RECIENTES``
+cambios más recientes (``RecientesListSerializer``, que el optimizador de
+consultas convierte en un prefetch limitado por fila). El historial completo
+se pide a ``HistorialCompletoView``, que une la tabla caliente y la de archivo
+en una sola consulta paginada.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BooleanField, F, Value, Window
+from django.db.models.functions import RowNumber
+from rest_framework import generics, serializers
+from rest_framework.exceptions import NotFound
+
+from car_dealership.cache_respuestas import invalidar
+
+TAMANO_LOTE = 500
+
+# Columnas comunes de las filas que devuelve ``completo()``
+CAMPOS = ('id', 'estado_anterior', 'estado_nuevo', 'fecha_cambio', 'usuario_id', 'notas')
+
+
+def antiguedad():
+    return timedelta(days=getattr(settings, 'HISTORIAL_ARCHIVAR_DIAS', 365))
+
+
+def recientes():
+    return getattr(settings, 'HISTORIAL_RECIENTES', 5)
+
+
+class ArchivoHistorial:
+    """
+    Historial ``historial`` (con ForeignKey ``relacion`` al modelo que
+    cambia de estado) y su tabla de archivo ``archivado``.
+    """
+
+    def __init__(self, historial, archivado, relacion):
+        self.historial = historial
+        self.archivado = archivado
+        self.relacion = relacion
+        self.modelo = historial._meta.get_field(relacion).related_model
+
+    def archivables(self, antes_de, conservar=None):
+        """
+        Ids, de la más antigua a la más reciente, de las filas anteriores a
+        ``antes_de`` que no están entre las ``conservar`` más recientes de su
+        objeto. La ventana solo recorre los objetos con alguna fila antigua.
+        """
+        conservar = recientes() if conservar is None else conservar
+        con_antiguas = self.historial.objects.filter(fecha_cambio__lt=antes_de).values(self.relacion)
+        numeradas = self.historial.objects.filter(**{f'{self.relacion}__in': con_antiguas}).annotate(
+            _fila=Window(
+                RowNumber(), partition_by=[F(self.relacion)],
+                order_by=[F('fecha_cambio').desc(), F('id').desc()],
+            ),
+        ).filter(_fila__gt=conservar).values('id')
+        # La fecha se filtra fuera de la ventana para numerar todas las filas del objeto
+        return list(
+            self.historial.objects.filter(fecha_cambio__lt=antes_de, id__in=numeradas)
+            .order_by('fecha_cambio', 'id').values_list('id', flat=True)
+        )
+
+    def archivar(self, antes_de, lote=TAMANO_LOTE, conservar=None):
+        """
+        Mueve al archivo las filas con ``fecha_cambio`` anterior a ``antes_de``,
+        salvo las ``conservar`` (``HISTORIAL_RECIENTES``) más recientes de cada
+        objeto. Devuelve cuántas.
+        """
+        campos = [campo.attname for campo in self.archivado._meta.concrete_fields]
+        # Se calculan una vez: las filas que se crean después solo son más recientes
+        ids = self.archivables(antes_de, conservar)
+        total = 0
+        for inicio in range(0, len(ids), lote):
+            with transaction.atomic():
+                filas = list(
+                    self.historial.objects.select_for_update()
+                    .filter(pk__in=ids[inicio:inicio + lote])
+                    .values_list(*campos)
+                )
+                if not filas:
+                    continue
+                self.archivado.objects.bulk_create([self.archivado(**dict(zip(campos, fila))) for fila in filas])
+                self.historial.objects.filter(pk__in=[fila[0] for fila in filas]).delete()
+            total += len(filas)
+        if total:
+            invalidar(self.historial, self.archivado)
+        return total
+
+    def completo(self, objeto_id):
+        """Historial completo de un objeto, caliente y archivado, del más reciente al más antiguo."""
+        calientes = (
+            self.historial.objects.filter(**{self.relacion: objeto_id}).order_by()
+            .values(*CAMPOS).annotate(archivado=Value(False, BooleanField()))
+        )
+        archivadas = (
+            self.archivado.objects.filter(**{self.relacion: objeto_id}).order_by()
+            .values(*CAMPOS).annotate(archivado=Value(True, BooleanField()))
+        )
+        return calientes.union(archivadas, all=True).order_by('-fecha_cambio', '-id')
+
+
+class RecientesListSerializer(serializers.ListSerializer):
+    """Solo los ``limite`` elementos más recientes (según el orden del modelo) de una relación."""
+
+    def __init__(self, *args, **kwargs):
+        self.limite = kwargs.pop('limite', None) or recientes()
+        super().__init__(*args, **kwargs)
+
+    def to_representation(self, data):
+        if hasattr(data, 'all'):
+            # Con prefetch recorta la lista ya cargada; sin él, LIMIT en la consulta
+            data = data.all()[:self.limite]
+        return super().to_representation(data)
+
+
+class HistorialCompletoSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    estado_anterior = serializers.CharField()
+    estado_nuevo = serializers.CharField()
+    fecha_cambio = serializers.DateTimeField()
+    usuario = serializers.IntegerField(source='usuario_id', allow_null=True)
+    notas = serializers.CharField(allow_null=True)
+    archivado = serializers.BooleanField()
+
+
+class HistorialCompletoView(generics.ListAPIView):
+    """Historial completo (caliente y archivado) del objeto ``<id>``."""
+    archivo = None
+    serializer_class = HistorialCompletoSerializer
+
+    def get_queryset(self):
+        if not self.archivo.modelo.objects.filter(pk=self.kwargs['id']).exists():
+            raise NotFound()
+        return self.archivo.completo(self.kwargs['id'])
@@ -0,0 +1,169 @@
+"""
+Variantes precalculadas de las imágenes del catálogo.
+
+Al guardar un modelo registrado se generan versiones de tamaño fijo en WebP y
+JPEG de su imagen y se guarda el mapa de rutas en ``<campo>_variantes``. Los
+archivos se nombran por el hash del original (``variantes/ab/<hash>-<variante>.<ext>``),
+así que la misma foto subida dos veces se procesa y almacena una sola vez.
+"""
+import hashlib
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.signals import post_save
+from django.utils import timezone
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+from car_dealership.cache_respuestas import invalidar
+
+logger = logging.getLogger(__name__)
+
+DIRECTORIO = 'variantes'
+
+# nombre -> caja máxima (ancho, alto); nunca se amplía el original
+VARIANTES = {
+    'miniatura': (150, 150),
+    'tarjeta': (480, 360),
+    'detalle': (1200, 900),
+}
+
+# extensión -> (formato de Pillow, opciones de guardado)
+FORMATOS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# modelo -> nombre del campo de imagen
+_registro = {}
+
+
+def _huella(archivo):
+    h = hashlib.sha256()
+    for bloque in archivo.chunks():
+        h.update(bloque)
+    return h.hexdigest()
+
+
+def _abrir(archivo):
+    imagen = Image.open(archivo)
+    # En JPEG se decodifica directamente a una escala reducida suficiente
+    imagen.draft('RGB', max(VARIANTES.values()))
+    imagen = ImageOps.exif_transpose(imagen)
+    if imagen.mode in ('RGBA', 'LA', 'P'):
+        imagen = imagen.convert('RGBA')
+        fondo = Image.new('RGB', imagen.size, 'white')
+        fondo.paste(imagen, mask=imagen.getchannel('A'))
+        return fondo
+    return imagen.convert('RGB')
+
+
+def generar_variantes(archivo):
+    """
+    Genera las variantes de ``archivo`` (un FieldFile) y devuelve el mapa
+    ``{'original': nombre, variante: {extension: ruta}}``.
+    """
+    storage = archivo.storage
+    with archivo.open('rb'):
+        huella = _huella(archivo)
+        archivo.seek(0)
+        mapa = {'original': archivo.name}
+        original = None
+        for nombre, caja in VARIANTES.items():
+            rutas = {}
+            for extension, (formato, opciones) in FORMATOS.items():
+                ruta = f'{DIRECTORIO}/{huella[:2]}/{huella}-{nombre}.{extension}'
+                if not storage.exists(ruta):
+                    if original is None:
+                        original = _abrir(archivo)
+                    copia = original.copy()
+                    copia.thumbnail(caja, Image.LANCZOS)
+                    buffer = io.BytesIO()
+                    copia.save(buffer, formato, **opciones)
+                    storage.save(ruta, ContentFile(buffer.getvalue()))
+                rutas[extension] = ruta
+            mapa[nombre] = rutas
+    return mapa
+
+
+def actualizar_variantes(instancia, campo, forzar=False):
+    """
+    Regenera las variantes si la imagen cambió desde la última vez (o si
+    ``forzar``). Devuelve True si se actualizó el mapa.
+    """
+    archivo = getattr(instancia, campo)
+    destino = f'{campo}_variantes'
+    actual = getattr(instancia, destino) or {}
+    if not archivo:
+        mapa = {}
+    elif not forzar and actual.get('original') == archivo.name:
+        return False
+    else:
+        try:
+            mapa = generar_variantes(archivo)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            # Se recuerda el original para no reintentar en cada guardado;
+            # mientras tanto se sirve la imagen original
+            logger.warning('No se pudieron generar variantes de %s: %s', archivo.name, e)
+            mapa = {'original': archivo.name}
+    if mapa == actual:
+        return False
+    valores = {destino: mapa}
+    try:
+        # update() no aplica auto_now: sin esto el ETag seguiría siendo el de antes
+        instancia._meta.get_field('fecha_actualizacion')
+        valores['fecha_actualizacion'] = timezone.now()
+    except FieldDoesNotExist:
+        pass
+    # update() no vuelve a disparar post_save
+    type(instancia)._default_manager.filter(pk=instancia.pk).update(**valores)
+    for nombre, valor in valores.items():
+        setattr(instancia, nombre, valor)
+    invalidar(type(instancia))
+    return True
+
+
+def _al_guardar(sender, instance, raw=False, update_fields=None, **kwargs):
+    campo = _registro[sender]
+    if raw or (update_fields is not None and campo not in update_fields):
+        return
+    actualizar_variantes(instance, campo)
+
+
+def registrar_variantes(modelo, campo):
+    """Genera variantes de ``modelo.<campo>`` en cada guardado. Se llama desde AppConfig.ready()."""
+    _registro[modelo] = campo
+    post_save.connect(_al_guardar, sender=modelo, dispatch_uid=f'variantes_{modelo._meta.label}')
+
+
+def modelos_con_variantes():
+    return dict(_registro)
+
+
+def url_variante(instancia, campo, variante='miniatura', extension='jpg'):
+    """URL de una variante, o la del original si aún no existe."""
+    archivo = getattr(instancia, campo)
+    if not archivo:
+        return None
+    ruta = (getattr(instancia, f'{campo}_variantes') or {}).get(variante, {}).get(extension)
+    return archivo.storage.url(ruta) if ruta else archivo.url
+
+
+class VariantesImagenField(serializers.ReadOnlyField):
+    """Expone el mapa de variantes como URLs: ``{variante: {webp: url, jpg: url}}``."""
+
+    def to_representation(self, mapa):
+        request = self.context.get('request')
+        resultado = {}
+        for nombre, rutas in (mapa or {}).items():
+            if nombre == 'original':
+                continue
+            urls = {}
+            for extension, ruta in rutas.items():
+                url = default_storage.url(ruta)
+                urls[extension] = request.build_absolute_uri(url) if request is not None else url
+            resultado[nombre] = urls
+        return resultado
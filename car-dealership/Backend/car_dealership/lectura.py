@@ -0,0 +1,175 @@
+"""
+Lectura rápida para listados: filas de ``.values()`` en lugar de instancias.
+
+A partir de un ModelSerializer se precompila, una vez por clase, qué columna
+lee cada campo y cómo se convierte, y cada fila se arma con un solo recorrido
+de esa lista. La salida es la misma que la del serializador; si tiene algún
+campo que no se puede leer así (anidados, métodos...) se usa el camino normal.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from car_dealership.imagenes import VariantesImagenField
+
+# Campos cuyo to_representation devuelve el valor de la base de datos tal cual
+_IDENTIDAD = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.JSONField,
+    serializers.PrimaryKeyRelatedField,
+    serializers.ReadOnlyField,
+)
+
+_planes = {}
+
+
+class _Campo:
+    __slots__ = ('clave', 'columna', 'guardia', 'tipo', 'field', 'storage')
+
+    def __init__(self, clave, columna, guardia, tipo, field, storage=None):
+        self.clave = clave
+        self.columna = columna
+        # Columna de la FK intermedia: si es NULL el campo se omite, como hace DRF
+        self.guardia = guardia
+        self.tipo = tipo
+        self.field = field
+        self.storage = storage
+
+
+def _analizar_campo(field, model):
+    if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField, serializers.SerializerMethodField)):
+        return None
+    atributos = field.source_attrs
+    try:
+        campo_modelo = model._meta.get_field(atributos[0])
+    except FieldDoesNotExist:
+        return None
+    if getattr(campo_modelo, 'many_to_many', False) or getattr(campo_modelo, 'one_to_many', False):
+        return None
+
+    guardia = None
+    if len(atributos) == 2 and campo_modelo.many_to_one:
+        guardia = campo_modelo.name
+        try:
+            campo_modelo = campo_modelo.related_model._meta.get_field(atributos[1])
+        except FieldDoesNotExist:
+            return None
+        if campo_modelo.is_relation:
+            return None
+    elif len(atributos) != 1:
+        return None
+    elif campo_modelo.is_relation and not isinstance(field, serializers.PrimaryKeyRelatedField):
+        return None
+    columna = '__'.join(atributos)
+
+    if isinstance(field, serializers.FileField):
+        use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+        return _Campo(field.field_name, columna, guardia, 'archivo' if use_url else 'identidad', field, campo_modelo.storage)
+    if isinstance(field, VariantesImagenField):
+        return _Campo(field.field_name, columna, guardia, 'convertir', field)
+    if isinstance(field, serializers.ChoiceField):
+        todas_str = all(isinstance(valor, str) for valor in field.choices)
+        return _Campo(field.field_name, columna, guardia, 'identidad' if todas_str else 'convertir', field)
+    if isinstance(field, _IDENTIDAD):
+        return _Campo(field.field_name, columna, guardia, 'identidad', field)
+    return _Campo(field.field_name, columna, guardia, 'convertir', field)
+
+
+def _plan(serializer):
+    clase = type(serializer)
+    if clase not in _planes:
+        model = serializer.Meta.model
+        campos = []
+        for field in serializer._readable_fields:
+            campo = _analizar_campo(field, model)
+            if campo is None:
+                campos = None
+                break
+            campos.append(campo)
+        _planes[clase] = campos
+    return _planes[clase]
+
+
+class SerializadorPlano:
+    """Representa filas de ``.values()`` igual que ``serializer`` representaría las instancias."""
+
+    def __init__(self, campos, serializer):
+        self.campos = campos
+        self.request = serializer.context.get('request')
+        # Los campos enlazados a este serializador (con su contexto)
+        for campo in campos:
+            campo.field = serializer.fields[campo.clave]
+
+    @classmethod
+    def para(cls, serializer):
+        campos = _plan(serializer)
+        if campos is None:
+            return None
+        return cls([_Campo(c.clave, c.columna, c.guardia, c.tipo, c.field, c.storage) for c in campos], serializer)
+
+    def columnas(self, extra=()):
+        columnas = dict.fromkeys(c.columna for c in self.campos)
+        columnas.update(dict.fromkeys(c.guardia for c in self.campos if c.guardia))
+        columnas.update(dict.fromkeys(extra))
+        return list(columnas)
+
+    def _convertidores(self):
+        request = self.request
+        convertidores = []
+        for campo in self.campos:
+            if campo.tipo == 'identidad':
+                convertir = None
+            elif campo.tipo == 'archivo':
+                def convertir(valor, storage=campo.storage):
+                    if not valor:
+                        return None
+                    url = storage.url(valor)
+                    return request.build_absolute_uri(url) if request is not None else url
+            else:
+                convertir = campo.field.to_representation
+            convertidores.append((campo.clave, campo.columna, campo.guardia, convertir))
+        return convertidores
+
+    def representar(self, filas):
+        convertidores = self._convertidores()
+        resultado = []
+        for fila in filas:
+            datos = {}
+            for clave, columna, guardia, convertir in convertidores:
+                if guardia is not None and fila[guardia] is None:
+                    continue
+                valor = fila[columna]
+                if valor is None or convertir is None:
+                    datos[clave] = valor
+                else:
+                    datos[clave] = convertir(valor)
+            resultado.append(datos)
+        return resultado
+
+
+class LecturaPlanaMixin:
+    """
+    En ``list`` (GET) lee con ``.values()`` y arma las filas con
+    SerializadorPlano, si el serializador lo permite. Va justo antes de la
+    vista genérica en las bases de la clase.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        plano = SerializadorPlano.para(serializer)
+        if plano is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        orden = queryset.query.order_by or queryset.model._meta.ordering
+        pk = queryset.model._meta.pk.name
+        extra = [campo.lstrip('-') for campo in orden if campo.lstrip('-') != 'pk'] + [pk]
+        filas = queryset.values(*plano.columnas(extra))
+
+        page = self.paginate_queryset(filas)
+        if page is not None:
+            return self.get_paginated_response(plano.representar(page))
+        return Response(plano.representar(filas))
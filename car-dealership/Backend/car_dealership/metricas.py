@@ -0,0 +1,204 @@
+"""
+Métricas por petición: consultas SQL, tiempo en base de datos, tiempo de la
+vista (serialización) y tamaño de la respuesta.
+
+El middleware las expone en la cabecera ``Server-Timing`` y las acumula en
+histogramas móviles por ruta (``api/carros/``, ``api/piezas/<int:id>/``...):
+a diferencia del nombre de URL, la ruta no se repite entre apps.
+"""
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+# Límites superiores de los cubos de cada histograma
+CUBOS = {
+    'consultas': (1, 2, 3, 5, 10, 20, 50, 100),
+    'db_ms': (1, 5, 10, 25, 50, 100, 250, 500, 1000),
+    'vista_ms': (1, 5, 10, 25, 50, 100, 250, 500, 1000),
+    'total_ms': (5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+    'bytes': (1024, 10240, 102400, 1048576, 10485760),
+}
+
+
+class Histograma:
+    """Histograma sobre una ventana móvil de las últimas ``ventana`` muestras."""
+
+    def __init__(self, limites, ventana):
+        self.limites = limites
+        self.muestras = deque(maxlen=ventana)
+        self.conteos = [0] * (len(limites) + 1)
+
+    def _cubo(self, valor):
+        return bisect.bisect_left(self.limites, valor)
+
+    def agregar(self, valor):
+        if len(self.muestras) == self.muestras.maxlen:
+            self.conteos[self._cubo(self.muestras[0])] -= 1
+        self.muestras.append(valor)
+        self.conteos[self._cubo(valor)] += 1
+
+    def percentil(self, p):
+        if not self.muestras:
+            return None
+        ordenadas = sorted(self.muestras)
+        return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p / 100))]
+
+    def resumen(self):
+        etiquetas = [f'<={limite}' for limite in self.limites] + [f'>{self.limites[-1]}']
+        return {
+            'muestras': len(self.muestras),
+            'p50': self.percentil(50),
+            'p95': self.percentil(95),
+            'max': max(self.muestras, default=None),
+            'cubos': dict(zip(etiquetas, self.conteos)),
+        }
+
+
+class RegistroMetricas:
+    """Histogramas por ruta, compartidos entre hilos."""
+
+    def __init__(self, ventana=1000):
+        self.ventana = ventana
+        self._lock = threading.Lock()
+        self._por_url = {}
+
+    def registrar(self, nombre, metricas):
+        with self._lock:
+            histogramas = self._por_url.get(nombre)
+            if histogramas is None:
+                histogramas = self._por_url[nombre] = {
+                    clave: Histograma(limites, self.ventana) for clave, limites in CUBOS.items()
+                }
+            for clave, histograma in histogramas.items():
+                if metricas.get(clave) is not None:
+                    histograma.agregar(metricas[clave])
+
+    def resumen(self):
+        with self._lock:
+            return {
+                nombre: {clave: h.resumen() for clave, h in histogramas.items()}
+                for nombre, histogramas in self._por_url.items()
+            }
+
+    def reiniciar(self):
+        with self._lock:
+            self._por_url.clear()
+
+
+registro = RegistroMetricas(getattr(settings, 'METRICAS_VENTANA', 1000))
+
+
+class _ContadorConsultas:
+    def __init__(self):
+        self.consultas = []
+        self.tiempo = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tiempo += time.perf_counter() - inicio
+            self.consultas.append(sql)
+
+
+def consultas_autenticacion(request):
+    """
+    Consultas que hace la autenticación de ``request`` antes de la vista: el
+    token JWT (carga el usuario) o la sesión (la sesión y el usuario).
+    """
+    margen = getattr(settings, 'PRESUPUESTO_CONSULTAS_AUTENTICACION', {})
+    if request.META.get('HTTP_AUTHORIZATION'):
+        return margen.get('token', 0)
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return margen.get('sesion', 0)
+    return 0
+
+
+def presupuesto_consultas(ruta, request=None):
+    """
+    Máximo de consultas declarado para una ruta en settings.PRESUPUESTO_CONSULTAS.
+    Con ``request`` se suman las consultas de su autenticación.
+    """
+    maximo = getattr(settings, 'PRESUPUESTO_CONSULTAS', {}).get(ruta)
+    if maximo is None or request is None:
+        return maximo
+    return maximo + consultas_autenticacion(request)
+
+
+class MetricasMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        contador = _ContadorConsultas()
+        inicio = time.perf_counter()
+        with ExitStack() as stack:
+            for conexion in connections.all():
+                stack.enter_context(conexion.execute_wrapper(contador))
+            request._metricas = {'contador': contador}
+            response = self.get_response(request)
+        total = time.perf_counter() - inicio
+
+        metricas = {
+            'consultas': len(contador.consultas),
+            'db_ms': contador.tiempo * 1000,
+            'vista_ms': request._metricas.get('vista_ms'),
+            'total_ms': total * 1000,
+            'bytes': None if response.streaming else len(response.content),
+            'sql': contador.consultas,
+        }
+        response.metricas = metricas
+
+        partes = [
+            f'db;dur={metricas["db_ms"]:.1f};desc="{metricas["consultas"]} consultas"',
+            f'total;dur={metricas["total_ms"]:.1f}',
+        ]
+        if metricas['vista_ms'] is not None:
+            partes.insert(1, f'ser;dur={metricas["vista_ms"]:.1f};desc="vista y serializacion"')
+        if metricas['bytes'] is not None:
+            partes.append(f'size;desc="{metricas["bytes"]} bytes"')
+        response['Server-Timing'] = ', '.join(partes)
+
+        match = getattr(request, 'resolver_match', None)
+        if match and match.route:
+            registro.registrar(match.route, metricas)
+            maximo = presupuesto_consultas(match.route, request)
+            if maximo is not None and metricas['consultas'] > maximo:
+                logger.warning(
+                    '%s ejecutó %d consultas (presupuesto: %d)',
+                    match.route, metricas['consultas'], maximo
+                )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        contador = request._metricas['contador']
+        request._metricas['inicio_vista'] = (time.perf_counter(), contador.tiempo)
+
+    def process_template_response(self, request, response):
+        # Las respuestas de DRF aún no están renderizadas: el tiempo hasta aquí,
+        # sin contar SQL, es el de la vista y la serialización.
+        if 'inicio_vista' not in request._metricas:
+            return response
+        inicio, db_inicio = request._metricas['inicio_vista']
+        db = request._metricas['contador'].tiempo - db_inicio
+        request._metricas['vista_ms'] = (time.perf_counter() - inicio - db) * 1000
+        return response
+
+
+class MetricasView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(registro.resumen())
@@ -0,0 +1,162 @@
+"""
+Optimizador de consultas a partir del árbol de campos de un serializador.
+
+Recorre los campos (incluyendo serializadores anidados) y aplica al queryset
+los select_related / prefetch_related / only() que el serializador va a
+necesitar, para evitar las consultas N+1 en los listados.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Prefetch, Window
+from django.db.models.functions import RowNumber
+from rest_framework import serializers
+
+from car_dealership.campos import CamposDinamicosMixin
+
+
+class _Plan:
+    """Descripción (sin querysets) de lo que hay que cargar para un modelo."""
+
+    def __init__(self, model):
+        self.model = model
+        self.select = []
+        self.only = []
+        self.prefetch = []  # (lookup, modelo, plan hijo)
+        self.limite = None  # Solo las primeras N filas por objeto (en el orden del modelo)
+        self.relacion = None  # ForeignKey al objeto padre, para recortar por objeto
+        self.completo = True  # False si algún campo no se puede resolver contra el modelo
+
+    def aplicar(self, queryset):
+        if self.select:
+            queryset = queryset.select_related(*self.select)
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*[
+                Prefetch(lookup, queryset=plan.recortar(plan.aplicar(modelo._default_manager.all())))
+                for lookup, modelo, plan in self.prefetch
+            ])
+        if self.completo and self.only:
+            queryset = queryset.only(*self.only)
+        return queryset
+
+    def recortar(self, queryset):
+        # Numera las filas de cada objeto padre y se queda con las primeras:
+        # una sola consulta para todos (el prefetch no admite querysets cortados)
+        if not self.limite:
+            return queryset
+        return queryset.annotate(_fila=Window(
+            RowNumber(), partition_by=F(self.relacion), order_by=list(self.model._meta.ordering) + ['-pk'],
+        )).filter(_fila__lte=self.limite)
+
+
+def _es_anidado(field):
+    return isinstance(field, serializers.BaseSerializer)
+
+
+def _es_multiple(field):
+    return isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField))
+
+
+def _campo(model, nombre):
+    """Busca un campo por nombre o por el nombre del accesor inverso (p. ej. 'detalle_set')."""
+    try:
+        return model._meta.get_field(nombre)
+    except FieldDoesNotExist:
+        for relacion in model._meta.related_objects:
+            if relacion.get_accessor_name() == nombre:
+                return relacion
+        raise
+
+
+def _recorrer(serializer, model, plan, prefijo=''):
+    plan.only.append(prefijo + model._meta.pk.name)
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            plan.completo = False
+            continue
+
+        attrs = field.source_attrs
+        try:
+            model_field = _campo(model, attrs[0])
+        except FieldDoesNotExist:
+            # Propiedad o método del modelo: no sabemos qué columnas usa
+            plan.completo = False
+            continue
+
+        if not model_field.is_relation:
+            plan.only.append(prefijo + model_field.name)
+            continue
+
+        relacionado = model_field.related_model
+        lookup = prefijo + attrs[0]
+
+        if model_field.one_to_many or model_field.many_to_many:
+            # Relaciones inversas y ManyToMany: una consulta extra por relación
+            hijo = _Plan(relacionado)
+            if model_field.one_to_many:
+                hijo.only.append(model_field.field.name)
+                hijo.relacion = model_field.field.name
+            if _es_multiple(field) and _es_anidado(field):
+                if hijo.relacion:
+                    hijo.limite = getattr(field, 'limite', None)
+                _recorrer(field.child, relacionado, hijo)
+            else:
+                hijo.only.append(relacionado._meta.pk.name)
+            plan.prefetch.append((lookup, relacionado, hijo))
+            continue
+
+        if _es_anidado(field):
+            # FK / OneToOne con serializador anidado: JOIN en la misma consulta
+            plan.select.append(lookup)
+            if model_field.concrete:
+                plan.only.append(lookup)
+            _recorrer(field, relacionado, plan, lookup + '__')
+        elif len(attrs) > 1:
+            # Campos como source='categoria.nombre'
+            plan.select.append(lookup)
+            if model_field.concrete:
+                plan.only.append(lookup)
+            try:
+                plan.only.append(lookup + '__' + relacionado._meta.get_field(attrs[1]).name)
+            except FieldDoesNotExist:
+                plan.completo = False
+        elif model_field.concrete:
+            # PrimaryKeyRelatedField: DRF usa directamente la columna *_id
+            plan.only.append(lookup)
+        else:
+            plan.completo = False
+
+
+_planes = {}
+
+
+def plan_para(serializer):
+    """Construye el plan de carga de un serializador (clase o instancia)."""
+    if isinstance(serializer, type):
+        if serializer not in _planes:
+            _planes[serializer] = plan_para(serializer())
+        return _planes[serializer]
+
+    if _es_multiple(serializer):
+        serializer = serializer.child
+    model = serializer.Meta.model
+    plan = _Plan(model)
+    _recorrer(serializer, model, plan)
+    return plan
+
+
+def optimizar_queryset(queryset, serializer):
+    """Aplica al queryset las cargas anticipadas que necesita el serializador."""
+    return plan_para(serializer).aplicar(queryset)
+
+
+class ConsultaOptimizadaMixin:
+    """Mixin para vistas genéricas de DRF que optimiza get_queryset()."""
+
+    def get_queryset(self):
+        serializer = self.get_serializer_class()
+        if issubclass(serializer, CamposDinamicosMixin):
+            # Los campos dependen de la petición: se planifica con la instancia
+            serializer = self.get_serializer()
+        return optimizar_queryset(super().get_queryset(), serializer)
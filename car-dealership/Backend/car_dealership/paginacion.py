@@ -0,0 +1,178 @@
+"""
+Paginación por cursor (keyset) sobre el orden del modelo.
+
+En lugar de OFFSET, cada página filtra a partir de los valores de orden de la
+última fila vista (con el id como desempate), así que la página 1000 cuesta lo
+mismo que la primera si hay un índice sobre las columnas de orden.
+
+El cursor guarda el orden con el que se generó: si la petición pide otro
+(``?ordering=`` distinto) o los valores no son del tipo de su campo, el cursor
+se rechaza con 404 en lugar de llegar a la consulta.
+"""
+import base64
+import json
+from collections import OrderedDict
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _a_json(valor):
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()
+    return str(valor)
+
+
+class PaginacionCursor(BasePagination):
+    page_size = api_settings.PAGE_SIZE or 10
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    mensaje_cursor_invalido = 'Cursor inválido'
+
+    def get_ordering(self, queryset):
+        """Orden explícito del queryset o el de Meta, con el pk como desempate."""
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        pk = queryset.model._meta.pk.name
+        if not any(campo.lstrip('-') in (pk, 'pk') for campo in ordering):
+            descendente = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append(f'-{pk}' if descendente else pk)
+        return ordering
+
+    def get_page_size(self, request):
+        try:
+            valor = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(valor, self.max_page_size))
+
+    def decode_cursor(self, request):
+        """(valores, reverso, orden) del cursor de la petición; valores None si no hay cursor."""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False, None
+        try:
+            datos = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return list(datos['v']), bool(datos.get('r')), list(datos['o'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.mensaje_cursor_invalido)
+
+    def encode_cursor(self, valores, reverso):
+        # isoformat() completo: DjangoJSONEncoder recorta los microsegundos
+        datos = json.dumps({'v': valores, 'r': int(reverso), 'o': self.ordering}, default=_a_json)
+        cursor = base64.urlsafe_b64encode(datos.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def _campo(self, modelo, nombre):
+        """Campo del modelo (siguiendo relaciones con ``__``) o None si es una anotación."""
+        campo = None
+        for parte in nombre.split('__'):
+            if modelo is None:
+                return None
+            try:
+                campo = modelo._meta.get_field(parte)
+            except FieldDoesNotExist:
+                return None
+            modelo = campo.related_model
+        if campo.is_relation:
+            campo = campo.target_field
+        return campo
+
+    def _convertir(self, modelo, valores):
+        """Valores del cursor convertidos al tipo de su campo de orden."""
+        convertidos = []
+        for campo, valor in zip(self.ordering, valores):
+            campo = self._campo(modelo, campo.lstrip('-'))
+            convertidos.append(valor if campo is None else campo.to_python(valor))
+        return convertidos
+
+    def _filtro(self, ordering, valores):
+        # (a > v1) OR (a = v1 AND b > v2) OR ...
+        condiciones = []
+        for i, campo in enumerate(ordering):
+            nombre = campo.lstrip('-')
+            operador = 'lt' if campo.startswith('-') else 'gt'
+            iguales = [Q(**{c.lstrip('-'): v}) for c, v in zip(ordering[:i], valores)]
+            condiciones.append(reduce(and_, iguales + [Q(**{f'{nombre}__{operador}': valores[i]})]))
+        return reduce(or_, condiciones)
+
+    def _valores(self, objeto):
+        valores = []
+        for campo in self.ordering:
+            nombre = campo.lstrip('-')
+            if isinstance(objeto, dict):
+                # Filas de .values() (LecturaPlanaMixin)
+                valores.append(objeto[nombre])
+                continue
+            try:
+                nombre = objeto._meta.get_field(nombre).attname
+            except FieldDoesNotExist:
+                pass
+            valores.append(getattr(objeto, nombre))
+        return valores
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        page_size = self.get_page_size(request)
+        valores, reverso, orden_cursor = self.decode_cursor(request)
+        if valores is not None and (orden_cursor != self.ordering or len(valores) != len(self.ordering)):
+            raise NotFound(self.mensaje_cursor_invalido)
+
+        ordering = self.ordering
+        if reverso:
+            ordering = [c[1:] if c.startswith('-') else f'-{c}' for c in ordering]
+        queryset = queryset.order_by(*ordering)
+        if valores is not None:
+            try:
+                queryset = queryset.filter(self._filtro(ordering, self._convertir(queryset.model, valores)))
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.mensaje_cursor_invalido)
+
+        resultados = list(queryset[:page_size + 1])
+        hay_mas = len(resultados) > page_size
+        resultados = resultados[:page_size]
+        if reverso:
+            resultados.reverse()
+
+        self.has_next = hay_mas if not reverso else True
+        self.has_previous = (valores is not None) if not reverso else hay_mas
+        self.page = resultados
+        return resultados
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._valores(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self._valores(self.page[0]), True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,36 @@
+"""
+Utilidades para pruebas.
+
+Ejemplo::
+
+    class CarroTests(PresupuestoConsultasMixin, APITestCase):
+        def test_listado(self):
+            response = self.client.get(reverse('carro-list'))
+            self.assertPresupuestoConsultas(response)
+"""
+from .metricas import presupuesto_consultas
+
+
+class PresupuestoConsultasMixin:
+    """
+    Añade a un TestCase la comprobación del presupuesto de consultas por
+    endpoint, más las consultas de la autenticación de la petición.
+    """
+
+    def assertPresupuestoConsultas(self, response, maximo=None):
+        metricas = getattr(response, 'metricas', None)
+        if metricas is None:
+            self.fail('La respuesta no tiene métricas: ¿está MetricasMiddleware en MIDDLEWARE?')
+
+        nombre = response.wsgi_request.resolver_match.route
+        if maximo is None:
+            maximo = presupuesto_consultas(nombre, response.wsgi_request)
+        if maximo is None:
+            self.fail(f'No hay presupuesto de consultas declarado para {nombre!r}')
+
+        if metricas['consultas'] > maximo:
+            detalle = '\n'.join(f'{i}. {sql}' for i, sql in enumerate(metricas['sql'], 1))
+            self.fail(
+                f'{nombre} ejecutó {metricas["consultas"]} consultas '
+                f'(presupuesto: {maximo}):\n{detalle}'
+            )
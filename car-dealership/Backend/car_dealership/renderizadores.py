@@ -0,0 +1,67 @@
+"""
+Renderer y parser JSON basados en orjson (dependencia opcional).
+
+Producen la misma salida que ``JSONRenderer`` de DRF en su configuración
+compacta: los tipos que orjson no serializa igual que DRF (``Decimal``,
+``timedelta``, fechas, cadenas traducibles perezosas...) se delegan al
+``JSONEncoder`` de DRF. Lo que orjson no admite en absoluto (claves de
+diccionario que no son cadenas, enteros de más de 64 bits) se renderiza con
+``JSONRenderer``. ``settings.py`` solo los activa si orjson está instalado.
+"""
+import dataclasses
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+def _por_defecto(obj):
+    # Mismo formato que DRF: datetime con milisegundos y 'Z', Decimal como
+    # float, timedelta en segundos, Promise como str...
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    return _encoder.default(obj)
+
+
+def disponible():
+    return orjson is not None
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        opciones = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if accepted_media_type and 'indent' in accepted_media_type:
+            # orjson solo admite sangría de 2 espacios
+            opciones |= orjson.OPT_INDENT_2
+        try:
+            ret = orjson.dumps(data, default=_por_defecto, option=opciones)
+        except orjson.JSONEncodeError:
+            return JSONRenderer().render(data, accepted_media_type, renderer_context)
+        # Como DRF: U+2028/U+2029 escapados para que el JSON sea JavaScript válido
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class ORJSONParser(BaseParser):
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read() if stream is not None else b'')
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
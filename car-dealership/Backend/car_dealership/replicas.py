@@ -0,0 +1,103 @@
+"""
+Lecturas en réplicas de la base de datos.
+
+``ReplicasMiddleware`` decide por petición: los métodos seguros (GET, HEAD,
+OPTIONS) fuera del admin leen de una de las réplicas de
+``DATABASE_REPLICAS``; el resto, y todo lo que ocurre fuera de una petición
+(comandos, shell), usa la principal. Las escrituras van siempre a la
+principal.
+
+Lectura de lo propio escrito: tras una escritura correcta, las peticiones con
+la misma credencial (cabecera Authorization o cookie de sesión) leen de la
+principal durante ``REPLICAS_VENTANA_ESCRITURA`` segundos, para no ver una
+réplica que aún no recibió el cambio. La marca se guarda en la caché
+``REPLICAS_CACHE``, que debe ser compartida si hay varios procesos.
+"""
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+METODOS_SEGUROS = ('GET', 'HEAD', 'OPTIONS')
+
+# Alias de la réplica asignada a la petición en curso (None: la principal)
+_alias_lectura = ContextVar('alias_lectura', default=None)
+
+
+def replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+@contextmanager
+def principal():
+    """Fuerza las lecturas del bloque a la base principal."""
+    token = _alias_lectura.set(None)
+    try:
+        yield
+    finally:
+        _alias_lectura.reset(token)
+
+
+def _cache():
+    return caches[getattr(settings, 'REPLICAS_CACHE', 'default')]
+
+
+def _clave_escritura(request):
+    credencial = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credencial:
+        return None
+    return 'bd_principal:' + hashlib.sha256(credencial.encode()).hexdigest()
+
+
+class EnrutadorReplicas:
+    """Router de ``DATABASE_ROUTERS``."""
+
+    def db_for_read(self, model, **hints):
+        alias = _alias_lectura.get()
+        if alias is None:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Dentro de una transacción se lee lo que la transacción ve
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # La principal y las réplicas tienen los mismos datos
+        return True
+
+
+class ReplicasMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.replicas = replicas()
+        self.rutas_principal = tuple(getattr(settings, 'REPLICAS_RUTAS_PRINCIPAL', ('/admin/',)))
+        self.ventana = getattr(settings, 'REPLICAS_VENTANA_ESCRITURA', 5)
+
+    def __call__(self, request):
+        if not self.replicas:
+            return self.get_response(request)
+
+        clave = _clave_escritura(request)
+        segura = request.method in METODOS_SEGUROS
+        alias = None
+        if segura and not request.path.startswith(self.rutas_principal):
+            if clave is None or not _cache().get(clave):
+                alias = random.choice(self.replicas)
+
+        token = _alias_lectura.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            _alias_lectura.reset(token)
+
+        if not segura and clave is not None and response.status_code < 400:
+            _cache().set(clave, True, self.ventana)
+        return response
@@ -2,6 +2,8 @@ import os
 from pathlib import Path
 from corsheaders.defaults import default_headers
 
+from car_dealership import basedatos
+
 # Configuración de seguridad para producción
 SECURE_HSTS_SECONDS = 31536000  # 1 año
 SECURE_HSTS_INCLUDE_SUBDOMAINS = True
@@ -87,6 +89,8 @@ INSTALLED_APPS = [
     'asesorias',
     'accesorios',
     'usuarios',
+    'reservas',
+    'catalogo',
 ]
 
 # Configuración de REST Framework
@@ -126,6 +130,8 @@ AUTH_USER_MODEL = 'usuarios.Usuario'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'car_dealership.metricas.MetricasMiddleware',  # Server-Timing y métricas por endpoint
+    'car_dealership.replicas.ReplicasMiddleware',  # Lecturas en réplicas (si hay DB_REPLICAS)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # Agregado para CORS
     'django.middleware.common.CommonMiddleware',
@@ -135,6 +141,76 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Máximo de consultas SQL por endpoint (ruta, que a diferencia del nombre de
+# URL no se repite entre apps) sin contar la autenticación. Se registra un
+# aviso cuando se supera y catalogo/tests.py lo comprueba.
+PRESUPUESTO_CONSULTAS = {
+    'api/carros/': 3,
+    'api/carros/<int:id>/': 1,
+    'api/piezas/': 2,
+    'api/piezas/<int:id>/': 1,
+    'api/piezas/compatibles/': 1,
+    'api/piezas/<int:id>/comentarios/': 2,
+    'api/accesorios/': 2,
+    'api/accesorios/<int:id>/': 1,
+    'api/reparaciones/servicios/': 2,
+    'api/reparaciones/': 5,
+    'api/reparaciones/<int:id>/': 4,
+    'api/devoluciones/': 5,
+    'api/devoluciones/<int:id>/': 4,
+    'api/asesorias/': 2,
+    'api/asesorias/<int:id>/': 1,
+}
+
+# Consultas que se suman al presupuesto según cómo se autentica la petición
+PRESUPUESTO_CONSULTAS_AUTENTICACION = {
+    'token': 1,   # JWT: carga del usuario
+    'sesion': 2,  # sesión y usuario
+}
+
+# Minutos que una reserva de stock se mantiene activa sin confirmarse
+RESERVAS_TTL_MINUTOS = 15
+
+# Número de peticiones recientes que se conservan por endpoint en los histogramas
+METRICAS_VENTANA = 1000
+
+# Caché de respuestas de lectura (car_dealership.cache_respuestas).
+# CACHE_BACKEND: 'memoria' (por proceso, expulsión LRU), 'archivos' o 'redis'.
+# Con varios procesos usar 'archivos' o 'redis' para compartir las versiones.
+_CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memoria')
+if _CACHE_BACKEND == 'redis':
+    _CACHE_RESPUESTAS = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('CACHE_URL', 'redis://127.0.0.1:6379/1'),
+    }
+elif _CACHE_BACKEND == 'archivos':
+    _CACHE_RESPUESTAS = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_URL', os.path.join(BASE_DIR, 'cache_respuestas')),
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    }
+else:
+    _CACHE_RESPUESTAS = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'respuestas',
+        'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRADAS', 5000))},
+    }
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'respuestas': _CACHE_RESPUESTAS,
+}
+CACHE_RESPUESTAS_ALIAS = 'respuestas'
+# Las entradas se invalidan por versión; el timeout solo libera espacio
+CACHE_RESPUESTAS_TIMEOUT = int(os.environ.get('CACHE_RESPUESTAS_TIMEOUT', 24 * 3600))
+
+# Vuelo único: segundos que un worker espera a que otro reconstruya la misma
+# respuesta y directorio de los archivos de bloqueo compartidos entre procesos
+VUELO_UNICO_ESPERA = 10
+VUELO_UNICO_DIR = os.environ.get('VUELO_UNICO_DIR')  # por defecto, en el directorio temporal
+
 ROOT_URLCONF = 'car_dealership.urls'
 
 TEMPLATES = [
@@ -156,12 +232,16 @@ TEMPLATES = [
 WSGI_APPLICATION = 'car_dealership.wsgi.application'
 
 # Database
+# PostgreSQL o SQLite según DB_ENGINE / DB_HOST (ver car_dealership/basedatos.py)
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': basedatos.configuracion(BASE_DIR),
 }
+DATABASES.update(basedatos.replicas(DATABASES['default']))
+
+# Lecturas de peticiones GET en las réplicas (DB_REPLICAS), ver car_dealership/replicas.py
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['car_dealership.replicas.EnrutadorReplicas'] if DATABASE_REPLICAS else []
+REPLICAS_VENTANA_ESCRITURA = int(os.environ.get('DB_REPLICA_VENTANA', 5))
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -185,6 +265,30 @@ TIME_ZONE = 'America/Bogota'
 USE_I18N = True
 USE_TZ = True
 
+# Planificación del taller (reparaciones/planificacion.py): horario por día de
+# la semana (0 = lunes) y cargos de Empleado que reciben reparaciones
+JORNADA_LABORAL = {
+    0: [('08:00', '12:00'), ('13:00', '17:00')],
+    1: [('08:00', '12:00'), ('13:00', '17:00')],
+    2: [('08:00', '12:00'), ('13:00', '17:00')],
+    3: [('08:00', '12:00'), ('13:00', '17:00')],
+    4: [('08:00', '12:00'), ('13:00', '17:00')],
+    5: [('08:00', '12:00')],
+}
+CARGOS_TECNICOS = ['Técnico', 'Mecánico']
+
+# Reserva de asesorías (asesorias/disponibilidad.py): cargos de Empleado que
+# atienden asesorías, separación entre franjas y días que se ofrecen
+CARGOS_ASESORES = ['Asesor']
+ASESORIAS_PASO_MINUTOS = 30
+ASESORIAS_HORIZONTE_DIAS = 30
+
+# Historial de estados (car_dealership/historial.py): días tras los que
+# archivar_historial mueve un cambio a la tabla de archivo y cambios que se
+# incluyen en el detalle de una reparación o devolución
+HISTORIAL_ARCHIVAR_DIAS = 365
+HISTORIAL_RECIENTES = 5
+
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
@@ -211,3 +315,20 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
+
+# JSON con orjson si está instalado (car_dealership.renderizadores); misma salida
+# que el JSONRenderer de DRF
+try:
+    import orjson  # noqa: F401
+except ImportError:
+    pass
+else:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'car_dealership.renderizadores.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+        'car_dealership.renderizadores.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ]
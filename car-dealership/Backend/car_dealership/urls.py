@@ -3,6 +3,8 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenVerifyView
+from car_dealership.cache_respuestas import CacheEstadisticasView
+from car_dealership.metricas import MetricasView
 from usuarios.views import (
     CustomTokenObtainPairView,
     CustomTokenRefreshView,
@@ -29,6 +31,12 @@ urlpatterns = [
     path('api/devoluciones/', include('devoluciones.urls')),
     path('api/asesorias/', include('asesorias.urls')),
     path('api/accesorios/', include('accesorios.urls')),
+    path('api/reservas/', include('reservas.urls')),
+    path('api/catalogo/', include('catalogo.urls')),
+    
+    # Métricas de rendimiento por endpoint
+    path('api/metricas/', MetricasView.as_view(), name='metricas'),
+    path('api/metricas/cache/', CacheEstadisticasView.as_view(), name='metricas-cache'),
     
     # DRF browsable API auth
     path('api-auth/', include('rest_framework.urls')),
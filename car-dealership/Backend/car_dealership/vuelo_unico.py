@@ -0,0 +1,109 @@
+"""
+Exclusión por clave entre hilos y procesos ("single-flight").
+
+Dentro de un proceso se usa un ``threading.Lock`` por clave; entre procesos,
+un ``flock`` sobre uno de ``ARCHIVOS_BLOQUEO`` archivos fijos en
+``VUELO_UNICO_DIR``, elegido por el hash de la clave. Así solo un worker
+reconstruye una respuesta mientras los demás esperan o sirven la versión
+anterior, y el directorio no crece con cada URL. Dos claves que caen en el
+mismo archivo se excluyen entre sí, lo que solo retrasa alguna reconstrucción.
+Sin ``fcntl`` (Windows) solo se coordinan los hilos.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+INTERVALO_SONDEO = 0.02
+
+# Archivos de bloqueo entre procesos; no se borran (otro proceso podría tener
+# abierto el que se borra y bloquear un archivo que ya nadie ve)
+ARCHIVOS_BLOQUEO = 256
+
+
+class _Candados:
+    """Un Lock por clave, que se descarta cuando nadie lo usa."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._por_clave = {}
+
+    @contextmanager
+    def obtener(self, clave):
+        with self._lock:
+            entrada = self._por_clave.setdefault(clave, [threading.Lock(), 0])
+            entrada[1] += 1
+        try:
+            yield entrada[0]
+        finally:
+            with self._lock:
+                entrada[1] -= 1
+                if not entrada[1]:
+                    del self._por_clave[clave]
+
+
+_candados = _Candados()
+
+
+def _directorio():
+    directorio = getattr(settings, 'VUELO_UNICO_DIR', None) or os.path.join(tempfile.gettempdir(), 'car_dealership_vuelo_unico')
+    os.makedirs(directorio, exist_ok=True)
+    return directorio
+
+
+def _bloquear_archivo(clave, espera):
+    """Devuelve el descriptor bloqueado o None si no se obtuvo dentro de ``espera``."""
+    if fcntl is None:
+        return -1
+    cubo = int(hashlib.md5(clave.encode(), usedforsecurity=False).hexdigest(), 16) % ARCHIVOS_BLOQUEO
+    fd = os.open(os.path.join(_directorio(), f'{cubo:03d}.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+    limite = time.monotonic() + espera
+    while True:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return fd
+        except BlockingIOError:
+            if time.monotonic() >= limite:
+                os.close(fd)
+                return None
+            time.sleep(INTERVALO_SONDEO)
+
+
+def _liberar_archivo(fd):
+    if fd is not None and fd >= 0:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+@contextmanager
+def adquirir(clave, espera=0):
+    """
+    Intenta obtener la exclusión sobre ``clave`` esperando como mucho
+    ``espera`` segundos (0 = no esperar). Produce True si se obtuvo.
+    """
+    inicio = time.monotonic()
+    with _candados.obtener(clave) as candado:
+        obtenido = candado.acquire(timeout=espera) if espera else candado.acquire(blocking=False)
+        if not obtenido:
+            yield False
+            return
+        try:
+            fd = _bloquear_archivo(clave, max(0, espera - (time.monotonic() - inicio)))
+            if fd is None:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                _liberar_archivo(fd)
+        finally:
+            candado.release()
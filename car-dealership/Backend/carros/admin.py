@@ -1,16 +1,18 @@
 from django.contrib import admin
+from car_dealership.imagenes import url_variante
+from catalogo.busqueda import BusquedaTextoAdminMixin
 from .models import Carro
 from django.utils.html import format_html
 
-class CarroAdmin(admin.ModelAdmin):
+class CarroAdmin(BusquedaTextoAdminMixin, admin.ModelAdmin):
     list_display = ('marca', 'modelo', 'año', 'precio', 'precio_formateado', 'estado', 'imagen_miniatura')
     list_filter = ('marca', 'año', 'transmision', 'combustible', 'estado')
-    search_fields = ('marca', 'modelo', 'descripcion')
+    search_fields = ('marca', 'modelo', 'descripcion', 'sku_proveedor')
     list_editable = ('precio', 'estado')
     readonly_fields = ('fecha_creacion', 'fecha_actualizacion', 'imagen_preview')
     fieldsets = (
         ('Información Básica', {
-            'fields': ('marca', 'modelo', 'año', 'precio', 'kilometraje', 'estado')
+            'fields': ('sku_proveedor', 'marca', 'modelo', 'año', 'precio', 'kilometraje', 'estado')
         }),
         ('Especificaciones', {
             'fields': ('transmision', 'combustible')
@@ -33,7 +35,7 @@ class CarroAdmin(admin.ModelAdmin):
         if obj.imagen_principal:
             return format_html(
                 '<img src="{}" style="max-height: 50px; max-width: 100px;" />',
-                obj.imagen_principal.url
+                url_variante(obj, 'imagen_principal')
             )
         return "Sin imagen"
     imagen_miniatura.short_description = 'Imagen'
@@ -42,7 +44,7 @@ class CarroAdmin(admin.ModelAdmin):
         if obj.imagen_principal:
             return format_html(
                 '<img src="{}" style="max-height: 300px; max-width: 100%;" />',
-                obj.imagen_principal.url
+                url_variante(obj, 'imagen_principal', 'tarjeta')
             )
         return "Sin imagen"
     imagen_preview.short_description = 'Vista previa de la imagen'
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CarrosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'carros'
+
+    def ready(self):
+        from car_dealership.cache_respuestas import invalidar_al_cambiar
+        from car_dealership.imagenes import registrar_variantes
+
+        registrar_variantes(self.get_model('Carro'), 'imagen_principal')
+        invalidar_al_cambiar(self.get_model('Carro'))
@@ -0,0 +1,112 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Count, Q
+from rest_framework import filters, serializers
+
+from .models import Carro
+
+# Límites de los rangos de precio para las facetas
+RANGOS_PRECIO = (10000, 20000, 30000, 50000, 100000)
+
+CAMPOS_FACETA = ('transmision', 'combustible', 'estado')
+
+
+def _valores(request, nombre):
+    """Admite ?estado=nuevo&estado=usado y ?estado=nuevo,usado."""
+    valores = []
+    for valor in request.query_params.getlist(nombre):
+        valores.extend(v.strip() for v in valor.split(',') if v.strip())
+    return valores
+
+
+def _numero(request, nombre, tipo):
+    valor = request.query_params.get(nombre)
+    if valor in (None, ''):
+        return None
+    try:
+        numero = tipo(valor)
+    except (ValueError, InvalidOperation):
+        numero = None
+    # Decimal acepta NaN e Infinity, que la base de datos no admite
+    if numero is None or (isinstance(numero, Decimal) and not numero.is_finite()):
+        raise serializers.ValidationError({nombre: 'Debe ser un número'})
+    return numero
+
+
+class FiltroCarros(filters.BaseFilterBackend):
+    """
+    Filtros del inventario:
+
+    - ``marca``, ``modelo``, ``transmision``, ``combustible``, ``estado``:
+      uno o varios valores exactos
+    - ``anio_min``/``anio_max``, ``precio_min``/``precio_max``,
+      ``km_min``/``km_max``: rangos inclusivos
+    """
+
+    rangos = (
+        ('anio', 'año', int),
+        ('precio', 'precio', Decimal),
+        ('km', 'kilometraje', int),
+    )
+
+    def filter_queryset(self, request, queryset, view):
+        for campo in ('marca', 'modelo') + CAMPOS_FACETA:
+            valores = _valores(request, campo)
+            if len(valores) == 1:
+                queryset = queryset.filter(**{campo: valores[0]})
+            elif valores:
+                queryset = queryset.filter(**{f'{campo}__in': valores})
+
+        for parametro, campo, tipo in self.rangos:
+            minimo = _numero(request, f'{parametro}_min', tipo)
+            maximo = _numero(request, f'{parametro}_max', tipo)
+            if minimo is not None:
+                queryset = queryset.filter(**{f'{campo}__gte': minimo})
+            if maximo is not None:
+                queryset = queryset.filter(**{f'{campo}__lte': maximo})
+        return queryset
+
+
+def _rangos_precio():
+    limites = (None,) + RANGOS_PRECIO + (None,)
+    for inferior, superior in zip(limites, limites[1:]):
+        condicion = Q()
+        if inferior is not None:
+            condicion &= Q(precio__gte=inferior)
+        if superior is not None:
+            condicion &= Q(precio__lt=superior)
+        if inferior is None:
+            etiqueta = f'<{superior}'
+        elif superior is None:
+            etiqueta = f'>={inferior}'
+        else:
+            etiqueta = f'{inferior}-{superior}'
+        yield etiqueta, condicion
+
+
+def facetas_carros(queryset):
+    """
+    Conteos por valor de cada campo con choices y por rango de precio, sobre
+    el queryset ya filtrado, en una sola consulta con agregados condicionales.
+    """
+    agregados = {}
+    for campo in CAMPOS_FACETA:
+        for valor, _etiqueta in Carro._meta.get_field(campo).choices:
+            agregados[f'{campo}__{valor}'] = Count('pk', filter=Q(**{campo: valor}))
+    rangos = list(_rangos_precio())
+    for i, (_etiqueta, condicion) in enumerate(rangos):
+        agregados[f'precio__{i}'] = Count('pk', filter=condicion)
+    agregados['total'] = Count('pk')
+
+    conteos = queryset.order_by().aggregate(**agregados)
+
+    facetas = {'total': conteos['total']}
+    for campo in CAMPOS_FACETA:
+        facetas[campo] = {
+            valor: conteos[f'{campo}__{valor}']
+            for valor, _etiqueta in Carro._meta.get_field(campo).choices
+        }
+    facetas['precio'] = {
+        etiqueta: conteos[f'precio__{i}'] for i, (etiqueta, _condicion) in enumerate(rangos)
+    }
+    return facetas
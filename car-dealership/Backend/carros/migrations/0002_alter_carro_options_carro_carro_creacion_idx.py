@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('carros', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='carro',
+            options={'ordering': ['-fecha_creacion']},
+        ),
+        migrations.AddIndex(
+            model_name='carro',
+            index=models.Index(fields=['fecha_creacion', 'id'], name='carro_creacion_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('carros', '0002_alter_carro_options_carro_carro_creacion_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='carro',
+            index=models.Index(fields=['marca', 'modelo', 'año'], name='carro_marca_modelo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carro',
+            index=models.Index(fields=['estado', 'precio'], name='carro_estado_precio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carro',
+            index=models.Index(fields=['combustible', 'transmision', 'precio'], name='carro_comb_trans_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carro',
+            index=models.Index(fields=['precio', 'id'], name='carro_precio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carro',
+            index=models.Index(fields=['año', 'id'], name='carro_anio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carro',
+            index=models.Index(fields=['kilometraje', 'id'], name='carro_km_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('carros', '0003_carro_carro_marca_modelo_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carro',
+            name='sku_proveedor',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('carros', '0004_sku_proveedor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carro',
+            name='imagen_principal_variantes',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
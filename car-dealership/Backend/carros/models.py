@@ -3,6 +3,7 @@ from django.db import models
 # Create your models here.
 
 class Carro(models.Model):
+    sku_proveedor = models.CharField(max_length=64, unique=True, null=True, blank=True)
     marca = models.CharField(max_length=100)
     modelo = models.CharField(max_length=100)
     año = models.IntegerField()
@@ -26,8 +27,24 @@ class Carro(models.Model):
     ])
     descripcion = models.TextField()
     imagen_principal = models.ImageField(upload_to='carros/')
+    imagen_principal_variantes = models.JSONField(default=dict, blank=True, editable=False)
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_actualizacion = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        ordering = ['-fecha_creacion']
+        indexes = [
+            # Paginación por cursor sobre (fecha_creacion, id)
+            models.Index(fields=['fecha_creacion', 'id'], name='carro_creacion_idx'),
+            # Filtros y facetas del inventario
+            models.Index(fields=['marca', 'modelo', 'año'], name='carro_marca_modelo_idx'),
+            models.Index(fields=['estado', 'precio'], name='carro_estado_precio_idx'),
+            models.Index(fields=['combustible', 'transmision', 'precio'], name='carro_comb_trans_idx'),
+            # Orden por precio / año / kilometraje con el id como desempate
+            models.Index(fields=['precio', 'id'], name='carro_precio_idx'),
+            models.Index(fields=['año', 'id'], name='carro_anio_idx'),
+            models.Index(fields=['kilometraje', 'id'], name='carro_km_idx'),
+        ]
+
     def __str__(self):
         return f"{self.marca} {self.modelo} {self.año}"
@@ -1,11 +1,15 @@
 from rest_framework import serializers
+from car_dealership.imagenes import VariantesImagenField
 from .models import Carro
 
 class CarroSerializer(serializers.ModelSerializer):
+    imagen_principal_variantes = VariantesImagenField()
+
     class Meta:
         model = Carro
         fields = [
             'id',
+            'sku_proveedor',
             'marca',
             'modelo',
             'año',
@@ -16,6 +20,7 @@ class CarroSerializer(serializers.ModelSerializer):
             'estado',
             'descripcion',
             'imagen_principal',
+            'imagen_principal_variantes',
             'fecha_creacion',
             'fecha_actualizacion'
         ]
@@ -1,3 +1,33 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from rest_framework.test import APITestCase
+
+from usuarios.models import Usuario
+from .models import Carro
+
+
+class FiltroCarrosTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = Usuario.objects.create_user(email='filtros@ejemplo.com', username='filtros', password='clave')
+        for i, precio in enumerate(('15000', '25000')):
+            Carro.objects.create(
+                marca='Toyota', modelo='Corolla', año=2015 + i, precio=Decimal(precio), kilometraje=1000,
+                transmision='manual', combustible='gasolina', estado='usado', descripcion='d',
+                imagen_principal='carros/x.png',
+            )
+
+    def setUp(self):
+        self.client.force_authenticate(self.usuario)
+
+    def test_rango_de_precio(self):
+        response = self.client.get('/api/carros/?precio_min=20000', secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([carro['año'] for carro in response.json()['results']], [2016])
+
+    def test_numero_no_valido(self):
+        for valor in ('abc', 'NaN', 'Infinity', '-Infinity', 'sNaN'):
+            with self.subTest(valor):
+                response = self.client.get(f'/api/carros/?precio_min={valor}', secure=True)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'precio_min': 'Debe ser un número'})
@@ -1,12 +1,28 @@
-from rest_framework import generics
+from rest_framework import filters, generics
+from car_dealership.cache_respuestas import CacheVersionadaMixin
+from car_dealership.condicional import RespuestaCondicionalMixin
+from car_dealership.lectura import LecturaPlanaMixin
+from car_dealership.paginacion import PaginacionCursor
+from .filtros import FiltroCarros, facetas_carros
 from .models import Carro
 from .serializers import CarroSerializer
 
-class CarroList(generics.ListAPIView):
+class CarroList(CacheVersionadaMixin, RespuestaCondicionalMixin, LecturaPlanaMixin, generics.ListAPIView):
     queryset = Carro.objects.all()
     serializer_class = CarroSerializer
+    pagination_class = PaginacionCursor
+    filter_backends = [FiltroCarros, filters.OrderingFilter]
+    ordering_fields = ['precio', 'año', 'kilometraje', 'fecha_creacion']
+    vuelo_unico = True
 
-class CarroDetail(generics.RetrieveAPIView):
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        # Las facetas no cambian entre páginas: solo se calculan en la primera
+        if self.paginator.cursor_query_param not in self.request.query_params:
+            response.data['facetas'] = facetas_carros(self.filter_queryset(self.get_queryset()))
+        return response
+
+class CarroDetail(CacheVersionadaMixin, RespuestaCondicionalMixin, generics.RetrieveAPIView):
     queryset = Carro.objects.all()
     serializer_class = CarroSerializer
     lookup_field = 'id'
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class CatalogoConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'catalogo'
+
+    def ready(self):
+        from . import busqueda
+        busqueda.registrar()
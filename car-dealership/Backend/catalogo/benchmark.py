@@ -0,0 +1,266 @@
+"""
+Banco de pruebas de la API: mide cada URL GET de ``ROOT_URLCONF``.
+
+Por cada escala se crea una base de datos de pruebas, se llena con
+``GeneradorDatos`` (misma semilla = mismos datos) y se piden todas las URL a
+través de la pila completa de middleware con el cliente de pruebas de DRF.
+De cada URL se guardan los percentiles de latencia, las consultas SQL (de
+``MetricasMiddleware``), los bytes de la respuesta y el pico de memoria de
+Python, para poder comparar resultados entre commits.
+"""
+import logging
+import platform
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone as dt_timezone
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import URLResolver, get_resolver
+from django.urls.resolvers import RoutePattern
+from rest_framework.test import APIClient
+
+from car_dealership.cache_respuestas import cache
+from car_dealership.metricas import presupuesto_consultas
+from devoluciones.models import Devolucion
+from piezas.models import Pieza
+from reparaciones.models import Reparacion
+from usuarios.models import Usuario
+from .sinteticos import GeneradorDatos
+
+VERSION_FORMATO = 1
+
+# Prefijos que no son API
+EXCLUIDOS = ('admin/', 'api-auth/')
+
+# Valor fijo de los parámetros de ruta que no son un id de la vista
+PARAMETROS = {
+    'modelo': 'carros',
+}
+
+# Vistas cuyo <id> es el de otro modelo (el padre) y no el de su queryset
+MODELOS_ID = {
+    'pieza-comentario-list': Pieza,
+    'reparacion-historial': Reparacion,
+    'devolucion-historial': Devolucion,
+}
+
+# Parámetros de consulta sin los que la vista responde 400
+CONSULTAS_REQUERIDAS = {
+    'pieza-compatible-list': '?marca=Toyota&modelo=Corolla&anio=2015',
+    'catalogo-buscar': '?q=freno',
+    'asesoria-disponibilidad': '?tipo=1',
+}
+
+# URL adicionales con parámetros de consulta representativos
+VARIANTES = [
+    ('carro-list', '?page_size=100'),
+    ('carro-list', '?marca=Toyota&ordering=-precio'),
+    ('pieza-list', '?page_size=100'),
+    ('devolucion-list', '?fields=id,estado'),
+    ('reparacion-list', '?expand='),
+]
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _rutas(patrones, prefijo=''):
+    for patron in patrones:
+        if isinstance(patron, URLResolver):
+            yield from _rutas(patron.url_patterns, prefijo + str(patron.pattern))
+        elif isinstance(patron.pattern, RoutePattern):
+            yield prefijo + str(patron.pattern), patron
+
+
+def _valor_parametro(nombre, vista, url_name=None):
+    """Valor determinista para un parámetro de ruta, o None si no se puede obtener."""
+    if nombre in PARAMETROS:
+        return PARAMETROS[nombre]
+    queryset = getattr(vista, 'queryset', None)
+    modelo = MODELOS_ID.get(url_name) or (queryset.model if queryset is not None else None)
+    if modelo is None or nombre not in ('id', 'pk', getattr(vista, 'lookup_field', 'pk')):
+        return None
+    ids = modelo._default_manager.order_by('pk').values_list('pk', flat=True)
+    total = ids.count()
+    return ids[total // 2] if total else None
+
+
+def endpoints():
+    """
+    (nombre, url_name, url) de cada vista con GET; el nombre es la ruta, que a
+    diferencia del url_name es única. Las que no se pueden construir se
+    listan aparte.
+    """
+    resultado, omitidas = [], []
+    for ruta, patron in _rutas(get_resolver().url_patterns):
+        vista = getattr(patron.callback, 'view_class', None)
+        if ruta.startswith(EXCLUIDOS) or vista is None or not hasattr(vista, 'get'):
+            continue
+        url = '/' + ruta
+        for parametro in patron.pattern.converters:
+            valor = _valor_parametro(parametro, vista, patron.name)
+            if valor is None:
+                omitidas.append((ruta, f'sin valor para <{parametro}>'))
+                break
+            url = re.sub(rf'<(\w+:)?{parametro}>', str(valor), url)
+        else:
+            resultado.append((ruta + CONSULTAS_REQUERIDAS.get(patron.name, ''), patron.name, url + CONSULTAS_REQUERIDAS.get(patron.name, '')))
+    por_url_name = {url_name: (ruta, url) for ruta, url_name, url in resultado}
+    resultado += [
+        (por_url_name[url_name][0] + consulta, url_name, por_url_name[url_name][1] + consulta)
+        for url_name, consulta in VARIANTES if url_name in por_url_name
+    ]
+    return resultado, omitidas
+
+
+class Benchmark:
+    def __init__(self, repeticiones=20, calentamiento=2, cache_fria=True, semilla=1, lote=5000, filtro=None, progreso=None):
+        self.repeticiones = repeticiones
+        self.calentamiento = calentamiento
+        self.cache_fria = cache_fria
+        self.semilla = semilla
+        self.lote = lote
+        self.filtro = filtro
+        self.progreso = progreso or (lambda mensaje: None)
+
+    def _cliente(self):
+        usuario = Usuario.objects.filter(username='benchmark').first() or Usuario.objects.create_superuser(
+            email='benchmark@ejemplo.com', username='benchmark', password=None,
+        )
+        cliente = APIClient()
+        cliente.force_authenticate(usuario)
+        return cliente
+
+    def _pedir(self, cliente, url):
+        if self.cache_fria:
+            cache().clear()
+        inicio = time.perf_counter()
+        response = cliente.get(url, secure=True)
+        if response.streaming:
+            tamano = sum(len(parte) for parte in response.streaming_content)
+        else:
+            tamano = len(response.content)
+        return (time.perf_counter() - inicio) * 1000, response, tamano
+
+    def medir(self, cliente, nombre, url_name, url):
+        for _ in range(self.calentamiento):
+            self._pedir(cliente, url)
+        tiempos, db = [], []
+        for _ in range(self.repeticiones):
+            ms, response, tamano = self._pedir(cliente, url)
+            tiempos.append(ms)
+            metricas = getattr(response, 'metricas', {})
+            db.append(metricas.get('db_ms', 0))
+
+        tracemalloc.start()
+        try:
+            self._pedir(cliente, url)
+            pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'nombre': nombre,
+            'url_name': url_name,
+            'url': url,
+            'estado': response.status_code,
+            'p50_ms': round(_percentil(tiempos, 50), 3),
+            'p95_ms': round(_percentil(tiempos, 95), 3),
+            'media_ms': round(sum(tiempos) / len(tiempos), 3),
+            'min_ms': round(min(tiempos), 3),
+            'max_ms': round(max(tiempos), 3),
+            'db_p50_ms': round(_percentil(db, 50), 3),
+            'consultas': metricas.get('consultas'),
+            'presupuesto': presupuesto_consultas(nombre.split('?')[0]),
+            'bytes': tamano,
+            'memoria_pico_kb': round(pico / 1024, 1),
+        }
+
+    def _escala(self, escala):
+        inicio = time.perf_counter()
+        filas = GeneradorDatos(escala, self.semilla, self.lote, self.progreso).generar()
+        generacion = time.perf_counter() - inicio
+        cliente = self._cliente()
+        urls, omitidas = endpoints()
+        resultados = []
+        for nombre, url_name, url in urls:
+            if self.filtro and not any(parte in nombre or parte in (url_name or '') for parte in self.filtro):
+                continue
+            self.progreso(f'  {nombre} {url}')
+            resultados.append(self.medir(cliente, nombre, url_name, url))
+        return {
+            'escala': escala,
+            'filas': filas,
+            'generacion_s': round(generacion, 2),
+            'endpoints': resultados,
+            'omitidos': [{'nombre': nombre, 'motivo': motivo} for nombre, motivo in omitidas],
+        }
+
+    def ejecutar(self, escalas):
+        resultado = {
+            'version': VERSION_FORMATO,
+            'commit': _commit(),
+            'fecha': datetime.now(dt_timezone.utc).isoformat(),
+            'python': sys.version.split()[0],
+            'django': django.get_version(),
+            'plataforma': platform.platform(),
+            'motor': connection.vendor,
+            'semilla': self.semilla,
+            'repeticiones': self.repeticiones,
+            'calentamiento': self.calentamiento,
+            'cache': 'fria' if self.cache_fria else 'caliente',
+            'escalas': [],
+        }
+        # Los avisos de presupuesto se registran en el resultado, no en el log
+        logger = logging.getLogger('car_dealership.metricas')
+        nivel = logger.level
+        logger.setLevel(logging.ERROR)
+        setup_test_environment()
+        try:
+            for escala in escalas:
+                self.progreso(f'Escala {escala}')
+                configuracion = setup_databases(verbosity=0, interactive=False)
+                try:
+                    cache().clear()
+                    resultado['escalas'].append(self._escala(escala))
+                finally:
+                    teardown_databases(configuracion, verbosity=0)
+        finally:
+            teardown_test_environment()
+            logger.setLevel(nivel)
+        return resultado
+
+
+def comparar(anterior, actual):
+    """Filas (escala, nombre, p50 anterior, p50 actual, variación %) de los endpoints comunes."""
+    previos = {
+        (escala['escala'], endpoint['nombre']): endpoint
+        for escala in anterior['escalas'] for endpoint in escala['endpoints']
+    }
+    filas = []
+    for escala in actual['escalas']:
+        for endpoint in escala['endpoints']:
+            previo = previos.get((escala['escala'], endpoint['nombre']))
+            if previo is None:
+                continue
+            variacion = (endpoint['p50_ms'] - previo['p50_ms']) / previo['p50_ms'] * 100 if previo['p50_ms'] else 0
+            filas.append((escala['escala'], endpoint['nombre'], previo['p50_ms'], endpoint['p50_ms'], variacion,
+                          previo['consultas'], endpoint['consultas']))
+    return filas
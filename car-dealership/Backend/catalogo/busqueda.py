@@ -0,0 +1,342 @@
+"""
+Búsqueda de texto completo en el catálogo (carros, piezas y accesorios).
+
+Cada registro tiene una fila en ``catalogo_busqueda`` con tres columnas de
+peso decreciente: título (marca/modelo o nombre), secundario (categoría,
+compatibilidad) y cuerpo (descripción). La fila se identifica por
+``clave = id * 8 + código del tipo``, así que actualizarla o borrarla es un
+acceso por clave primaria.
+
+- SQLite: tabla virtual FTS5 ordenada con ``bm25``. FTS5 no trae
+  lematizador para español, así que el texto se indexa y se consulta ya
+  normalizado (sin tildes, minúsculas) y pasado por ``raiz()``.
+- PostgreSQL: columna ``tsvector`` con índice GIN, configuración ``spanish``
+  y ``ts_rank_cd``. El texto se normaliza igual antes de ``to_tsvector``, lo
+  que quita las tildes sin necesitar la extensión ``unaccent``.
+
+El índice se mantiene con señales (ver ``registrar()``); las escrituras
+masivas (importación, datos sintéticos) llaman a ``indexar()``.
+"""
+import re
+from functools import lru_cache
+
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from accesorios.models import Accesorio, Categoria
+from carros.models import Carro
+from piezas.compatibilidad import normalizar
+from piezas.models import CategoriaPieza, Pieza
+
+TABLA = 'catalogo_busqueda'
+PESOS = (10.0, 4.0, 1.0)
+TAMANO_LOTE = 1000
+PALABRA = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=50_000)
+def raiz(palabra):
+    """
+    Lematizador ligero para español (Savoy): quita plurales y género.
+    ``palabra`` ya viene normalizada.
+    """
+    if len(palabra) < 5:
+        return palabra
+    if palabra[-1] in 'oae':
+        return palabra[:-1]
+    if palabra[-1] == 's':
+        if palabra.endswith('eses'):
+            return palabra[:-2]
+        if palabra.endswith('ces'):
+            return palabra[:-3] + 'z'
+        if palabra[-2] in 'oae':
+            return palabra[:-2]
+    return palabra
+
+
+def palabras(texto):
+    # normalizar() recorre el texto carácter a carácter; sin tildes basta lower()
+    return PALABRA.findall(texto.lower() if texto.isascii() else normalizar(texto))
+
+
+# Tipos indexados: código (parte baja de la clave), modelo y cómo se arma cada columna
+
+def _documento_carro(carro):
+    return f'{carro.marca} {carro.modelo} {carro.año}', f'{carro.combustible} {carro.transmision} {carro.estado}', carro.descripcion
+
+
+def _documento_pieza(pieza):
+    categoria = pieza.categoria.nombre if pieza.categoria_id else ''
+    return pieza.nombre, f'{categoria} {pieza.compatibilidad or ""}', pieza.descripcion
+
+
+def _documento_accesorio(accesorio):
+    return accesorio.nombre, accesorio.categoria.nombre, accesorio.descripcion
+
+
+TIPOS = {
+    'carros': (1, Carro, _documento_carro, ()),
+    'piezas': (2, Pieza, _documento_pieza, ('categoria',)),
+    'accesorios': (3, Accesorio, _documento_accesorio, ('categoria',)),
+}
+# Campos de los que sale el documento: un save(update_fields=...) que no toca
+# ninguno (calificaciones, stock...) no reescribe el índice
+CAMPOS_INDEXADOS = {
+    Carro: frozenset({'marca', 'modelo', 'año', 'combustible', 'transmision', 'estado', 'descripcion'}),
+    Pieza: frozenset({'nombre', 'categoria', 'categoria_id', 'compatibilidad', 'descripcion'}),
+    Accesorio: frozenset({'nombre', 'categoria', 'categoria_id', 'descripcion'}),
+}
+# Por etiqueta y no por clase, para aceptar también los modelos históricos de las migraciones
+_POR_ETIQUETA = {modelo._meta.label_lower: (nombre, codigo) for nombre, (codigo, modelo, _doc, _rel) in TIPOS.items()}
+
+
+class _SQLite:
+    def crear(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA} USING fts5("
+            f"titulo, secundario, cuerpo, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+
+    def borrar_tabla(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {TABLA}')
+
+    def _texto(self, texto):
+        return ' '.join(raiz(palabra) for palabra in palabras(texto))
+
+    def vaciar(self, cursor, codigo):
+        cursor.execute(f'DELETE FROM {TABLA} WHERE rowid %% 8 = %s', [codigo])
+
+    def guardar(self, cursor, filas, nuevas=False):
+        if not nuevas:
+            cursor.executemany(f'DELETE FROM {TABLA} WHERE rowid = %s', [(clave,) for clave, *_ in filas])
+        cursor.executemany(
+            f'INSERT INTO {TABLA} (rowid, titulo, secundario, cuerpo) VALUES (%s, %s, %s, %s)',
+            [(clave, *(self._texto(columna) for columna in columnas)) for clave, *columnas in filas],
+        )
+
+    def borrar(self, cursor, claves):
+        cursor.executemany(f'DELETE FROM {TABLA} WHERE rowid = %s', [(clave,) for clave in claves])
+
+    def consulta(self, texto):
+        terminos = [raiz(palabra) for palabra in palabras(texto)]
+        if not terminos:
+            return None
+        # Todas las palabras; la última como prefijo (búsqueda mientras se escribe)
+        return ' '.join(f'"{t}"' for t in terminos[:-1]) + f' "{terminos[-1]}"*'
+
+    def sql_buscar(self, codigo):
+        filtro = ' AND rowid %% 8 = %s' if codigo else ''
+        return (
+            f'SELECT rowid, bm25({TABLA}, {", ".join(map(str, PESOS))}) AS rango FROM {TABLA} '
+            f'WHERE {TABLA} MATCH %s{filtro} ORDER BY rango LIMIT %s OFFSET %s'
+        )
+
+    def sql_ids(self):
+        return f'SELECT rowid / 8 FROM {TABLA} WHERE {TABLA} MATCH %s AND rowid %% 8 = %s'
+
+
+class _PostgreSQL:
+    def crear(self, cursor):
+        cursor.execute(f'CREATE TABLE IF NOT EXISTS {TABLA} (clave bigint PRIMARY KEY, documento tsvector NOT NULL)')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {TABLA}_documento_idx ON {TABLA} USING GIN (documento)')
+
+    def borrar_tabla(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {TABLA}')
+
+    def vaciar(self, cursor, codigo):
+        cursor.execute(f'DELETE FROM {TABLA} WHERE clave %% 8 = %s', [codigo])
+
+    def guardar(self, cursor, filas, nuevas=False):
+        cursor.executemany(
+            f"INSERT INTO {TABLA} (clave, documento) VALUES (%s, "
+            f"setweight(to_tsvector('spanish', %s), 'A') || setweight(to_tsvector('spanish', %s), 'B') || "
+            f"setweight(to_tsvector('spanish', %s), 'C')) "
+            f"ON CONFLICT (clave) DO UPDATE SET documento = EXCLUDED.documento",
+            [(clave, *(' '.join(palabras(columna)) for columna in columnas)) for clave, *columnas in filas],
+        )
+
+    def borrar(self, cursor, claves):
+        cursor.execute(f'DELETE FROM {TABLA} WHERE clave = ANY(%s)', [list(claves)])
+
+    def consulta(self, texto):
+        terminos = palabras(texto)
+        if not terminos:
+            return None
+        return ' & '.join(terminos[:-1] + [f'{terminos[-1]}:*'])
+
+    def sql_buscar(self, codigo):
+        filtro = ' AND clave %% 8 = %s' if codigo else ''
+        pesos = ', '.join(map(str, (0.1, *reversed(PESOS))))
+        return (
+            f"SELECT clave, ts_rank_cd('{{{pesos}}}', documento, q) AS rango "
+            f"FROM {TABLA}, to_tsquery('spanish', %s) q WHERE documento @@ q{filtro} "
+            f"ORDER BY rango DESC LIMIT %s OFFSET %s"
+        )
+
+    def sql_ids(self):
+        return f"SELECT clave / 8 FROM {TABLA} WHERE documento @@ to_tsquery('spanish', %s) AND clave %% 8 = %s"
+
+
+MOTORES = {'sqlite': _SQLite(), 'postgresql': _PostgreSQL()}
+
+
+def motor(using='default'):
+    """Implementación para la base de datos ``using``, o None si no hay búsqueda de texto."""
+    return MOTORES.get(connections[using].vendor)
+
+
+def _filas(codigo, documento, objetos):
+    return [(objeto.pk * 8 + codigo, *(columna or '' for columna in documento(objeto))) for objeto in objetos]
+
+
+def indexar(queryset, using=None, vaciar=False):
+    """
+    (Re)indexa los registros de ``queryset`` (Carro, Pieza o Accesorio). Con
+    ``vaciar`` se borran antes todas las filas del tipo, lo que ahorra borrar
+    fila a fila en una reconstrucción completa.
+    """
+    nombre, codigo = _POR_ETIQUETA[queryset.model._meta.label_lower]
+    _codigo, _modelo, documento, relaciones = TIPOS[nombre]
+    using = using or router.db_for_write(queryset.model)
+    implementacion = motor(using)
+    if implementacion is None:
+        return 0
+    total = 0
+    lote = []
+    with transaction.atomic(using), connections[using].cursor() as cursor:
+        if vaciar:
+            implementacion.vaciar(cursor, codigo)
+        for objeto in queryset.select_related(*relaciones).iterator(chunk_size=TAMANO_LOTE):
+            lote.append(objeto)
+            if len(lote) >= TAMANO_LOTE:
+                implementacion.guardar(cursor, _filas(codigo, documento, lote), vaciar)
+                total += len(lote)
+                lote = []
+        if lote:
+            implementacion.guardar(cursor, _filas(codigo, documento, lote), vaciar)
+            total += len(lote)
+    return total
+
+
+def desindexar(modelo, pks, using=None):
+    _nombre, codigo = _POR_ETIQUETA[modelo._meta.label_lower]
+    using = using or router.db_for_write(modelo)
+    implementacion = motor(using)
+    if implementacion is not None:
+        with connections[using].cursor() as cursor:
+            implementacion.borrar(cursor, [pk * 8 + codigo for pk in pks])
+
+
+def reconstruir(tipos=None, using='default', apps=None):
+    """
+    Reindexa por completo los tipos dados (todos por defecto). ``apps`` es el
+    registro de modelos históricos cuando se llama desde una migración.
+    """
+    resultado = {}
+    for nombre in tipos or TIPOS:
+        modelo = TIPOS[nombre][1]
+        if apps is not None:
+            modelo = apps.get_model(modelo._meta.label)
+        resultado[nombre] = indexar(modelo._default_manager.using(using).all(), using, vaciar=True)
+    return resultado
+
+
+def buscar(texto, tipo=None, limite=20, desplazamiento=0, using=None):
+    """Lista de (tipo, id, rango) ordenada por relevancia."""
+    using = using or router.db_for_read(Carro) or 'default'
+    implementacion = motor(using)
+    consulta = implementacion.consulta(texto) if implementacion else None
+    if consulta is None:
+        return []
+    codigo = TIPOS[tipo][0] if tipo else None
+    parametros = [consulta] + ([codigo] if codigo else []) + [limite, desplazamiento]
+    por_codigo = {codigo: nombre for nombre, (codigo, *_resto) in TIPOS.items()}
+    with connections[using].cursor() as cursor:
+        cursor.execute(implementacion.sql_buscar(codigo), parametros)
+        return [(por_codigo[clave % 8], clave // 8, rango) for clave, rango in cursor.fetchall()]
+
+
+def condicion(modelo, texto, using='default'):
+    """
+    Condición ``Q`` para filtrar un queryset de ``modelo`` por texto con el
+    índice, o None si la base de datos no tiene búsqueda de texto.
+    """
+    implementacion = motor(using)
+    if implementacion is None:
+        return None
+    consulta = implementacion.consulta(texto)
+    if consulta is None:
+        return Q(pk__in=[])
+    return Q(pk__in=RawSQL(implementacion.sql_ids(), [consulta, _POR_ETIQUETA[modelo._meta.label_lower][1]]))
+
+
+class BusquedaTextoAdminMixin:
+    """
+    Para ``ModelAdmin`` de Carro, Pieza y Accesorio: la caja de búsqueda usa
+    el índice (más una coincidencia exacta de ``sku_proveedor``) en lugar de
+    ``icontains`` sobre cada campo de ``search_fields``.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        filtro = condicion(queryset.model, search_term, queryset.db) if search_term.strip() else None
+        if filtro is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(filtro | Q(sku_proveedor=search_term.strip())), False
+
+
+# Sincronización con señales
+
+def _al_guardar(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not CAMPOS_INDEXADOS[sender] & update_fields):
+        return
+    indexar(sender._default_manager.filter(pk=instance.pk), using)
+
+
+def _al_borrar(sender, instance, using=None, **kwargs):
+    desindexar(sender, [instance.pk], using)
+
+
+# Modelo indexado que incluye el nombre de cada modelo de categoría
+_POR_CATEGORIA = {CategoriaPieza: Pieza, Categoria: Accesorio}
+
+
+def _antes_de_guardar_categoria(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Nombre guardado hasta ahora, para reindexar solo si cambia
+    if raw or instance.pk is None or (update_fields is not None and 'nombre' not in update_fields):
+        instance._nombre_indexado = instance.nombre
+    else:
+        instance._nombre_indexado = sender._default_manager.filter(pk=instance.pk).values_list('nombre', flat=True).first()
+
+
+def _al_guardar_categoria(sender, instance, created=False, raw=False, using=None, **kwargs):
+    if raw or created or getattr(instance, '_nombre_indexado', None) == instance.nombre:
+        return
+    indexar(_POR_CATEGORIA[sender]._default_manager.filter(categoria=instance), using)
+
+
+def _antes_de_borrar_categoria_pieza(sender, instance, **kwargs):
+    # SET_NULL deja las piezas sin categoría con un UPDATE que no envía post_save
+    instance._piezas_indexadas = list(Pieza._default_manager.filter(categoria=instance).values_list('pk', flat=True))
+
+
+def _al_borrar_categoria_pieza(sender, instance, using=None, **kwargs):
+    ids = getattr(instance, '_piezas_indexadas', [])
+    for inicio in range(0, len(ids), TAMANO_LOTE):
+        indexar(Pieza._default_manager.filter(pk__in=ids[inicio:inicio + TAMANO_LOTE]), using)
+
+
+def registrar():
+    """Conecta las señales que mantienen el índice. Se llama desde CatalogoConfig.ready()."""
+    for _codigo, modelo, _documento, _relaciones in TIPOS.values():
+        post_save.connect(_al_guardar, sender=modelo, dispatch_uid=f'busqueda_save_{modelo._meta.label}')
+        post_delete.connect(_al_borrar, sender=modelo, dispatch_uid=f'busqueda_delete_{modelo._meta.label}')
+    # El nombre de la categoría forma parte del documento
+    for categoria, sufijo in ((CategoriaPieza, 'pieza'), (Categoria, 'accesorio')):
+        pre_save.connect(_antes_de_guardar_categoria, sender=categoria, dispatch_uid=f'busqueda_categoria_{sufijo}_pre')
+        post_save.connect(_al_guardar_categoria, sender=categoria, dispatch_uid=f'busqueda_categoria_{sufijo}')
+    # Al borrar una categoría de accesorios, la cascada borra los accesorios y
+    # cada uno pasa por _al_borrar; las piezas solo pierden la categoría
+    pre_delete.connect(_antes_de_borrar_categoria_pieza, sender=CategoriaPieza, dispatch_uid='busqueda_categoria_pieza_pre_borrar')
+    post_delete.connect(_al_borrar_categoria_pieza, sender=CategoriaPieza, dispatch_uid='busqueda_categoria_pieza_borrar')
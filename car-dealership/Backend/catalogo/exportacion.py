@@ -0,0 +1,78 @@
+"""
+Exportación completa de catálogo en CSV, JSONL o NDJSON.
+
+Las filas se leen con ``.iterator(chunk_size=...)`` y se serializan y escriben
+una a una dentro de un ``StreamingHttpResponse``, así que la memoria del
+worker no crece con el tamaño de la tabla. Cada fila tiene la misma forma que
+en la API (se usa el serializador del endpoint de lista).
+"""
+import csv
+import json
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from accesorios.models import Accesorio
+from accesorios.serializers import AccesorioSerializer
+from car_dealership.optimizacion import optimizar_queryset
+from carros.models import Carro
+from carros.serializers import CarroSerializer
+from piezas.models import Pieza
+from piezas.serializers import PiezaSerializer
+from reparaciones.models import Reparacion
+from reparaciones.serializers import ReparacionSerializer
+
+# formato -> content type
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/jsonl; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+EXPORTABLES = {
+    'carros': (Carro, CarroSerializer),
+    'piezas': (Pieza, PiezaSerializer),
+    'accesorios': (Accesorio, AccesorioSerializer),
+    'reparaciones': (Reparacion, ReparacionSerializer),
+}
+
+
+class _Eco:
+    """Pseudo-archivo para csv.writer: devuelve la línea en vez de guardarla."""
+
+    def write(self, valor):
+        return valor
+
+
+def _a_json(valor):
+    return json.dumps(valor, cls=JSONEncoder, ensure_ascii=False)
+
+
+def _celda(valor):
+    # Los campos anidados (listas, objetos) van como JSON en una sola celda
+    if isinstance(valor, (dict, list)):
+        return _a_json(valor)
+    return '' if valor is None else valor
+
+
+def registros(modelo, serializer_class, context=None, chunk_size=2000):
+    """Genera la representación de cada registro, en orden de pk."""
+    serializer = serializer_class(context=context or {})
+    queryset = optimizar_queryset(modelo.objects.order_by('pk'), serializer_class)
+    for objeto in queryset.iterator(chunk_size=chunk_size):
+        yield serializer.to_representation(objeto)
+
+
+def lineas(nombre, formato, context=None, chunk_size=2000):
+    """Genera el archivo exportado línea a línea."""
+    modelo, serializer_class = EXPORTABLES[nombre]
+    filas = registros(modelo, serializer_class, context, chunk_size)
+    if formato == 'csv':
+        escritor = csv.writer(_Eco())
+        # Los campos de solo escritura no aparecen en la representación
+        columnas = [nombre for nombre, campo in serializer_class().fields.items() if not campo.write_only]
+        yield '\ufeff' + escritor.writerow(columnas)
+        for fila in filas:
+            yield escritor.writerow([_celda(fila.get(c)) for c in columnas])
+    else:
+        for fila in filas:
+            yield _a_json(fila) + '\n'
@@ -0,0 +1,278 @@
+"""
+Importación masiva de catálogo (Carro, Pieza, Accesorio) desde CSV o JSONL.
+
+El archivo se lee fila a fila, así que la memoria no depende de su tamaño.
+Cada fila se valida con los mismos campos y métodos ``validate_<campo>`` del
+serializador del modelo, y las filas válidas se escriben por lotes con un
+upsert (``bulk_create(update_conflicts=True)``) sobre ``sku_proveedor``.
+"""
+import csv
+import io
+import json
+
+from django.db import DatabaseError, transaction
+from rest_framework import serializers
+
+from accesorios.models import Accesorio, Categoria
+from accesorios.serializers import AccesorioSerializer
+from car_dealership.cache_respuestas import invalidar
+from carros.models import Carro
+from carros.serializers import CarroSerializer
+from piezas.compatibilidad import reindexar
+from piezas.models import CategoriaPieza, Pieza
+from piezas.serializers import PiezaSerializer
+from . import busqueda
+
+FORMATOS = ('csv', 'jsonl')
+CLAVE = 'sku_proveedor'
+
+
+class ErrorImportacion(Exception):
+    """Error que impide procesar el archivo completo (formato, columnas...)."""
+
+
+def leer_filas(archivo, formato):
+    """Genera (número de fila, dict) a partir de un archivo binario."""
+    texto = io.TextIOWrapper(archivo, encoding='utf-8-sig', newline='')
+    if formato == 'csv':
+        # La fila 1 es la cabecera
+        for numero, fila in enumerate(csv.DictReader(texto), start=2):
+            yield numero, fila
+    elif formato == 'jsonl':
+        for numero, linea in enumerate(texto, start=1):
+            if not linea.strip():
+                continue
+            try:
+                fila = json.loads(linea)
+            except ValueError:
+                fila = None
+            if not isinstance(fila, dict):
+                yield numero, {'__error__': 'La línea no es un objeto JSON válido'}
+            else:
+                yield numero, fila
+    else:
+        raise ErrorImportacion(f'Formato no soportado: {formato}')
+
+
+class Importador:
+    modelo = None
+    serializer_class = None
+    # Campo FK -> modelo relacionado; se admite el id o '<campo>_nombre'
+    relaciones = {}
+
+    def __init__(self, lote=1000, max_errores=1000, al_error=None):
+        self.lote = lote
+        self.max_errores = max_errores
+        self.al_error = al_error
+        self.serializer = self.serializer_class()
+        self.resultado = {'procesadas': 0, 'creadas': 0, 'actualizadas': 0, 'con_error': 0, 'errores': []}
+
+    # Columnas
+
+    def campos_escribibles(self):
+        campos = {}
+        for nombre, field in self.serializer.fields.items():
+            if field.read_only or nombre in self.relaciones:
+                continue
+            campos[nombre] = field
+        return campos
+
+    def preparar_columnas(self, columnas):
+        escribibles = self.campos_escribibles()
+        columnas = set(columnas)
+        if CLAVE not in columnas:
+            raise ErrorImportacion(f'Falta la columna {CLAVE}')
+
+        self.columnas = [c for c in escribibles if c in columnas]
+        self.columnas_relacion = {}
+        for campo, modelo in self.relaciones.items():
+            if campo in columnas:
+                self.columnas_relacion[campo] = campo
+            elif f'{campo}_nombre' in columnas:
+                self.columnas_relacion[campo] = f'{campo}_nombre'
+
+        faltan = [
+            nombre for nombre, field in escribibles.items()
+            if field.required and nombre not in columnas and not isinstance(field, serializers.FileField)
+        ]
+        faltan += [
+            campo for campo in self.relaciones
+            if campo not in self.columnas_relacion and not self.modelo._meta.get_field(campo).null
+        ]
+        if faltan:
+            raise ErrorImportacion(f'Faltan columnas obligatorias: {", ".join(sorted(faltan))}')
+
+        # Caché de ids y nombres de cada relación (tablas pequeñas de categorías)
+        self.cache_relaciones = {}
+        for campo, columna in self.columnas_relacion.items():
+            relacionado = self.relaciones[campo]
+            if columna == campo:
+                self.cache_relaciones[campo] = {str(pk): pk for pk in relacionado.objects.values_list('pk', flat=True)}
+            else:
+                self.cache_relaciones[campo] = dict(relacionado.objects.values_list('nombre', 'pk'))
+
+    # Validación
+
+    def validar_fila(self, fila):
+        datos = {}
+        errores = {}
+        if '__error__' in fila:
+            return None, {'fila': [fila['__error__']]}
+
+        sku = str(fila.get(CLAVE) or '').strip()
+        if not sku:
+            errores[CLAVE] = ['Este campo es requerido.']
+        elif len(sku) > self.modelo._meta.get_field(CLAVE).max_length:
+            errores[CLAVE] = ['SKU demasiado largo.']
+        datos[CLAVE] = sku
+
+        for campo in self.columnas:
+            if campo == CLAVE:
+                continue
+            if campo not in fila:
+                errores[campo] = ['Falta el campo.']
+                continue
+            valor = fila[campo]
+            field = self.serializer.fields[campo]
+            if isinstance(field, serializers.FileField):
+                # Ruta ya existente dentro de MEDIA_ROOT
+                datos[campo] = valor or ''
+                continue
+            if valor == '' and getattr(field, 'allow_null', False) and not isinstance(field, serializers.CharField):
+                valor = None
+            try:
+                valor = field.run_validation(valor)
+                validador = getattr(self.serializer, f'validate_{campo}', None)
+                if validador is not None:
+                    valor = validador(valor)
+            except serializers.ValidationError as e:
+                errores[campo] = e.detail
+                continue
+            datos[campo] = valor
+
+        for campo, columna in self.columnas_relacion.items():
+            valor = fila.get(columna)
+            valor = '' if valor is None else str(valor).strip()
+            if not valor:
+                if self.modelo._meta.get_field(campo).null:
+                    datos[f'{campo}_id'] = None
+                else:
+                    errores[columna] = ['Este campo es requerido.']
+            elif valor in self.cache_relaciones[campo]:
+                datos[f'{campo}_id'] = self.cache_relaciones[campo][valor]
+            else:
+                errores[columna] = [f'No existe: {valor}']
+
+        return datos, errores
+
+    def registrar_error(self, numero, sku, errores):
+        self.resultado['con_error'] += 1
+        if len(self.resultado['errores']) < self.max_errores:
+            self.resultado['errores'].append({'fila': numero, 'sku': sku, 'errores': errores})
+        if self.al_error:
+            self.al_error(numero, sku, errores)
+
+    # Escritura
+
+    def campos_actualizables(self):
+        campos = [c for c in self.columnas if c != CLAVE]
+        campos += [f'{campo}_id' for campo in self.columnas_relacion]
+        campos = [self.modelo._meta.get_field(c).name for c in campos]
+        if any(f.name == 'fecha_actualizacion' for f in self.modelo._meta.fields):
+            campos.append('fecha_actualizacion')
+        return campos
+
+    def guardar_lote(self, lote):
+        """``lote``: dict sku -> (número de fila, datos). El último gana si hay SKUs repetidos."""
+        skus = list(lote)
+        existentes = set(self.modelo.objects.filter(**{f'{CLAVE}__in': skus}).values_list(CLAVE, flat=True))
+        objetos = [self.modelo(**datos) for _numero, datos in lote.values()]
+        try:
+            with transaction.atomic():
+                self.modelo.objects.bulk_create(
+                    objetos,
+                    update_conflicts=True,
+                    unique_fields=[CLAVE],
+                    update_fields=self.campos_actualizables(),
+                )
+                self.despues_de_guardar(skus)
+        except DatabaseError:
+            # Algún registro viola una restricción: se reintenta fila a fila
+            # para poder informar exactamente cuál
+            for sku, (numero, datos) in lote.items():
+                try:
+                    with transaction.atomic():
+                        self.modelo.objects.bulk_create(
+                            [self.modelo(**datos)],
+                            update_conflicts=True,
+                            unique_fields=[CLAVE],
+                            update_fields=self.campos_actualizables(),
+                        )
+                        self.despues_de_guardar([sku])
+                except DatabaseError as e:
+                    existentes.discard(sku)
+                    self.registrar_error(numero, sku, {'base_de_datos': [str(e)]})
+                    continue
+                self._contar(sku in existentes)
+        else:
+            for sku in skus:
+                self._contar(sku in existentes)
+        # bulk_create no dispara post_save
+        busqueda.indexar(self.modelo.objects.filter(**{f'{CLAVE}__in': skus}))
+        invalidar(self.modelo)
+
+    def _contar(self, existia):
+        self.resultado['procesadas'] += 1
+        self.resultado['actualizadas' if existia else 'creadas'] += 1
+
+    def despues_de_guardar(self, skus):
+        """Gancho para mantener datos derivados que bulk_create no dispara."""
+
+    def importar(self, archivo, formato):
+        filas = leer_filas(archivo, formato)
+        lote = {}
+        preparado = False
+        for numero, fila in filas:
+            if not preparado:
+                self.preparar_columnas([c for c in fila if c != '__error__'] or [CLAVE])
+                preparado = True
+            datos, errores = self.validar_fila(fila)
+            if errores:
+                self.registrar_error(numero, (datos or {}).get(CLAVE), errores)
+                continue
+            lote.pop(datos[CLAVE], None)
+            lote[datos[CLAVE]] = (numero, datos)
+            if len(lote) >= self.lote:
+                self.guardar_lote(lote)
+                lote = {}
+        if lote:
+            self.guardar_lote(lote)
+        return self.resultado
+
+
+class ImportadorCarros(Importador):
+    modelo = Carro
+    serializer_class = CarroSerializer
+
+
+class ImportadorPiezas(Importador):
+    modelo = Pieza
+    serializer_class = PiezaSerializer
+    relaciones = {'categoria': CategoriaPieza}
+
+    def despues_de_guardar(self, skus):
+        if 'compatibilidad' in self.columnas:
+            reindexar(Pieza.objects.filter(**{f'{CLAVE}__in': skus}).only('id', 'compatibilidad'))
+
+
+class ImportadorAccesorios(Importador):
+    modelo = Accesorio
+    serializer_class = AccesorioSerializer
+    relaciones = {'categoria': Categoria}
+
+
+IMPORTADORES = {
+    'carros': ImportadorCarros,
+    'piezas': ImportadorPiezas,
+    'accesorios': ImportadorAccesorios,
+}
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from car_dealership.historial import TAMANO_LOTE, antiguedad
+from devoluciones.estados import archivo as archivo_devoluciones
+from reparaciones.estados import archivo as archivo_reparaciones
+
+ARCHIVOS = {
+    'reparaciones': archivo_reparaciones,
+    'devoluciones': archivo_devoluciones,
+}
+
+
+class Command(BaseCommand):
+    help = 'Mueve el historial de estados antiguo de reparaciones y devoluciones a sus tablas de archivo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, help='Antigüedad mínima en días (por defecto HISTORIAL_ARCHIVAR_DIAS)')
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help='Filas por transacción')
+        parser.add_argument('--solo', choices=sorted(ARCHIVOS), help='Archivar solo este historial')
+
+    def handle(self, *args, **options):
+        if options['dias'] is not None and options['dias'] < 0:
+            raise CommandError('--dias no puede ser negativo')
+        if options['lote'] < 1:
+            raise CommandError('--lote debe ser al menos 1')
+        antes_de = timezone.now() - (
+            antiguedad() if options['dias'] is None else timedelta(days=options['dias'])
+        )
+        for nombre, archivo in ARCHIVOS.items():
+            if options['solo'] and nombre != options['solo']:
+                continue
+            movidas = archivo.archivar(antes_de, options['lote'])
+            self.stdout.write(f'{nombre}: {movidas} cambios anteriores a {antes_de:%Y-%m-%d} archivados')
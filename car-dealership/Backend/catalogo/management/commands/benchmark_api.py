@@ -0,0 +1,65 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalogo.benchmark import Benchmark, comparar
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide latencia (p50/p95), consultas y memoria de cada URL GET de la API sobre '
+        'datos sintéticos a varias escalas y guarda el resultado en JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escalas', default='0.001,0.01', help='Escalas separadas por comas (ver generar_datos)')
+        parser.add_argument('--repeticiones', type=int, default=20)
+        parser.add_argument('--calentamiento', type=int, default=2)
+        parser.add_argument('--semilla', type=int, default=1)
+        parser.add_argument('--lote', type=int, default=5000)
+        parser.add_argument('--cache', choices=['fria', 'caliente'], default='fria',
+                            help='fria: se vacía la caché de respuestas antes de cada petición')
+        parser.add_argument('--solo', action='append', help='Medir solo las URL cuyo nombre contiene este texto')
+        parser.add_argument('--salida', default='benchmark.json')
+        parser.add_argument('--comparar', help='Resultado anterior (JSON) contra el que comparar el p50')
+
+    def handle(self, *args, **options):
+        try:
+            escalas = [float(valor) for valor in options['escalas'].split(',') if valor.strip()]
+        except ValueError:
+            raise CommandError('--escalas debe ser una lista de números separados por comas')
+        anterior = None
+        if options['comparar']:
+            with open(options['comparar'], encoding='utf-8') as archivo:
+                anterior = json.load(archivo)
+
+        progreso = self.stdout.write if options['verbosity'] > 1 else None
+        benchmark = Benchmark(
+            repeticiones=options['repeticiones'], calentamiento=options['calentamiento'],
+            cache_fria=options['cache'] == 'fria', semilla=options['semilla'], lote=options['lote'],
+            filtro=options['solo'], progreso=progreso,
+        )
+        resultado = benchmark.ejecutar(escalas)
+        with open(options['salida'], 'w', encoding='utf-8') as archivo:
+            json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+
+        for escala in resultado['escalas']:
+            self.stdout.write(f"Escala {escala['escala']} (datos generados en {escala['generacion_s']} s)")
+            for endpoint in escala['endpoints']:
+                exceso = ' !' if endpoint['presupuesto'] is not None and endpoint['consultas'] > endpoint['presupuesto'] else ''
+                self.stdout.write(
+                    f"  {endpoint['nombre']:<60} {endpoint['estado']}  p50 {endpoint['p50_ms']:8.2f} ms  "
+                    f"p95 {endpoint['p95_ms']:8.2f} ms  {endpoint['consultas']:>3} consultas{exceso}  "
+                    f"{endpoint['memoria_pico_kb']:>9.1f} KB"
+                )
+            for omitido in escala['omitidos']:
+                self.stdout.write(f"  {omitido['nombre']:<60} omitida: {omitido['motivo']}")
+
+        if anterior is not None:
+            self.stdout.write(f"Comparación con {anterior.get('commit') or options['comparar']}:")
+            for escala, nombre, antes, ahora, variacion, consultas_antes, consultas_ahora in comparar(anterior, resultado):
+                self.stdout.write(
+                    f'  {escala:<8} {nombre:<60} {antes:8.2f} -> {ahora:8.2f} ms ({variacion:+6.1f} %)  '
+                    f'consultas {consultas_antes} -> {consultas_ahora}'
+                )
+        self.stdout.write(self.style.SUCCESS(f"Resultados en {options['salida']}"))
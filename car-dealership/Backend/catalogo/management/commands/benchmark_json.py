@@ -0,0 +1,67 @@
+import io
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from car_dealership import renderizadores
+from car_dealership.optimizacion import optimizar_queryset
+from asesorias.models import Asesoria
+from asesorias.serializers import AsesoriaSerializer
+from devoluciones.models import Devolucion
+from devoluciones.serializers import DevolucionSerializer
+from reparaciones.models import Reparacion
+from reparaciones.serializers import ReparacionSerializer
+
+CARGAS = {
+    'devoluciones': (Devolucion, DevolucionSerializer),
+    'reparaciones': (Reparacion, ReparacionSerializer),
+    'asesorias': (Asesoria, AsesoriaSerializer),
+}
+
+
+def _medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return min(tiempos), statistics.median(tiempos)
+
+
+class Command(BaseCommand):
+    help = 'Compara el tiempo de render/parse JSON de DRF y de orjson sobre respuestas reales'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--carga', choices=sorted(CARGAS), default='devoluciones')
+        parser.add_argument('--filas', type=int, default=1000, help='Filas del payload (se repiten las existentes)')
+        parser.add_argument('--repeticiones', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if not renderizadores.disponible():
+            raise CommandError('orjson no está instalado')
+        modelo, serializer_class = CARGAS[options['carga']]
+        queryset = optimizar_queryset(modelo.objects.order_by('pk'), serializer_class)[:options['filas']]
+        filas = list(serializer_class(queryset, many=True).data)
+        if not filas:
+            raise CommandError(f'No hay {options["carga"]} en la base de datos')
+        datos = [filas[i % len(filas)] for i in range(options['filas'])]
+
+        drf = JSONRenderer()
+        rapido = renderizadores.ORJSONRenderer()
+        contenido = drf.render(datos)
+        if rapido.render(datos) != contenido:
+            self.stderr.write(self.style.WARNING('La salida de orjson difiere de la de DRF'))
+
+        megas = len(contenido) / 1024 / 1024
+        self.stdout.write(f'{options["carga"]}: {len(datos)} filas, {megas:.2f} MB, {options["repeticiones"]} repeticiones')
+        resultados = [
+            ('render DRF', _medir(lambda: drf.render(datos), options['repeticiones'])),
+            ('render orjson', _medir(lambda: rapido.render(datos), options['repeticiones'])),
+            ('parse DRF', _medir(lambda: JSONParser().parse(io.BytesIO(contenido)), options['repeticiones'])),
+            ('parse orjson', _medir(lambda: renderizadores.ORJSONParser().parse(io.BytesIO(contenido)), options['repeticiones'])),
+        ]
+        for nombre, (minimo, mediana) in resultados:
+            self.stdout.write(f'  {nombre:<14} min {minimo:8.2f} ms   mediana {mediana:8.2f} ms   {megas / (mediana / 1000):8.1f} MB/s')
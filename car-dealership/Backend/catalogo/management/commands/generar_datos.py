@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from catalogo.sinteticos import VOLUMENES, GeneradorDatos
+
+
+class Command(BaseCommand):
+    help = 'Genera datos sintéticos reproducibles (carros, piezas, reparaciones...) para pruebas de carga'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--escala', type=float, default=0.01,
+            help='Fracción de los volúmenes de referencia (1 = %s carros, %s piezas)' % (
+                f"{VOLUMENES['carros']:,}", f"{VOLUMENES['piezas']:,}"),
+        )
+        parser.add_argument('--semilla', type=int, default=1)
+        parser.add_argument('--lote', type=int, default=5000, help='Filas por INSERT')
+
+    def handle(self, *args, **options):
+        progreso = self.stdout.write if options['verbosity'] > 1 else None
+        generador = GeneradorDatos(options['escala'], options['semilla'], options['lote'], progreso)
+        creados = generador.generar()
+        for modelo, cantidad in creados.items():
+            self.stdout.write(f'  {modelo:<40} {cantidad:>10}')
+        self.stdout.write(self.style.SUCCESS(f'{sum(creados.values())} filas generadas'))
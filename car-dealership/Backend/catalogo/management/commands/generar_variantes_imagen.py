@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from car_dealership.imagenes import actualizar_variantes, modelos_con_variantes
+
+
+class Command(BaseCommand):
+    help = 'Genera las variantes de imagen que falten (p. ej. tras una importación masiva)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--forzar', action='store_true', help='Regenera también las que ya existen')
+        parser.add_argument('--lote', type=int, default=500, help='Registros leídos por consulta')
+
+    def handle(self, *args, **options):
+        for modelo, campo in modelos_con_variantes().items():
+            actualizados = 0
+            queryset = modelo._default_manager.exclude(**{campo: ''}).exclude(**{f'{campo}__isnull': True})
+            queryset = queryset.only('pk', campo, f'{campo}_variantes').order_by('pk')
+            for instancia in queryset.iterator(chunk_size=options['lote']):
+                if actualizar_variantes(instancia, campo, forzar=options['forzar']):
+                    actualizados += 1
+            self.stdout.write(f'{modelo._meta.label}: {actualizados} actualizados')
+        self.stdout.write(self.style.SUCCESS('Variantes al día'))
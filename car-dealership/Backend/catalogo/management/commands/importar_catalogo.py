@@ -0,0 +1,49 @@
+import csv
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalogo.importacion import FORMATOS, IMPORTADORES, ErrorImportacion
+
+
+class Command(BaseCommand):
+    help = 'Importa un catálogo (CSV o JSONL) haciendo upsert por sku_proveedor'
+
+    def add_arguments(self, parser):
+        parser.add_argument('modelo', choices=sorted(IMPORTADORES))
+        parser.add_argument('archivo')
+        parser.add_argument('--formato', choices=FORMATOS, help='Por defecto se deduce de la extensión')
+        parser.add_argument('--lote', type=int, default=1000, help='Filas por transacción')
+        parser.add_argument('--reporte', help='CSV donde escribir las filas rechazadas')
+
+    def handle(self, *args, **options):
+        ruta = Path(options['archivo'])
+        formato = options['formato'] or ruta.suffix.lstrip('.').lower().replace('ndjson', 'jsonl')
+        if formato not in FORMATOS:
+            raise CommandError(f'No se puede deducir el formato de {ruta.name}; use --formato')
+
+        reporte = escritor = None
+        if options['reporte']:
+            reporte = open(options['reporte'], 'w', newline='', encoding='utf-8')
+            escritor = csv.writer(reporte)
+            escritor.writerow(['fila', 'sku_proveedor', 'errores'])
+
+        def al_error(numero, sku, errores):
+            if escritor:
+                escritor.writerow([numero, sku or '', json.dumps(errores, ensure_ascii=False)])
+
+        importador = IMPORTADORES[options['modelo']](lote=options['lote'], max_errores=0, al_error=al_error)
+        try:
+            with open(ruta, 'rb') as archivo:
+                resultado = importador.importar(archivo, formato)
+        except (OSError, ErrorImportacion) as e:
+            raise CommandError(str(e))
+        finally:
+            if reporte:
+                reporte.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{resultado["creadas"]} creados, {resultado["actualizadas"]} actualizados, '
+            f'{resultado["con_error"]} filas con error'
+        ))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from catalogo import busqueda
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda de texto del catálogo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('modelos', nargs='*', choices=list(busqueda.TIPOS), help='Por defecto, todos')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        if busqueda.motor(options['database']) is None:
+            raise CommandError('La base de datos no admite búsqueda de texto (se necesita SQLite o PostgreSQL)')
+        for modelo, cantidad in busqueda.reconstruir(options['modelos'], options['database']).items():
+            self.stdout.write(f'  {modelo:<12} {cantidad:>10}')
+        self.stdout.write(self.style.SUCCESS('Índice reconstruido'))
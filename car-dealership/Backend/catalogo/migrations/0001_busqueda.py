@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+def crear_indice(apps, schema_editor):
+    from catalogo import busqueda
+
+    implementacion = busqueda.MOTORES.get(schema_editor.connection.vendor)
+    if implementacion is None:
+        return
+    with schema_editor.connection.cursor() as cursor:
+        implementacion.crear(cursor)
+    busqueda.reconstruir(using=schema_editor.connection.alias, apps=apps)
+
+
+def borrar_indice(apps, schema_editor):
+    from catalogo import busqueda
+
+    implementacion = busqueda.MOTORES.get(schema_editor.connection.vendor)
+    if implementacion is not None:
+        with schema_editor.connection.cursor() as cursor:
+            implementacion.borrar_tabla(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accesorios', '0004_variantes_imagen'),
+        ('carros', '0005_variantes_imagen'),
+        ('piezas', '0007_variantes_imagen'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+    ]
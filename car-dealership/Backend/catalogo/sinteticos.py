@@ -0,0 +1,391 @@
+"""
+Generador de datos sintéticos reproducibles para pruebas de carga.
+
+Con ``escala=1`` genera los volúmenes de ``VOLUMENES`` (100k carros, 1M
+piezas...). Cada tabla usa su propio generador aleatorio derivado de la
+semilla, así que la misma semilla y escala producen los mismos datos. Las
+filas se insertan con ``bulk_create`` por lotes, sin señales: los agregados
+que normalmente mantienen las señales (calificaciones de piezas, índice de
+compatibilidad) se calculan aquí.
+"""
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from accesorios.models import Accesorio, Categoria
+from asesorias.models import Asesoria, TipoAsesoria
+from car_dealership.cache_respuestas import invalidar
+from carros.models import Carro
+from devoluciones.models import Devolucion, HistorialEstadoDevolucion
+from piezas.compatibilidad import interpretar
+from piezas.models import CALIFICACION_MAXIMA, CategoriaPieza, ComentarioPieza, CompatibilidadPieza, Pieza
+from reparaciones.models import DetalleReparacion, HistorialEstadoReparacion, Reparacion, Servicio
+from usuarios.models import Cliente, Empleado, Usuario
+from . import busqueda
+
+VOLUMENES = {
+    'usuarios': 50_000,
+    'empleados': 500,
+    'carros': 100_000,
+    'categorias_piezas': 60,
+    'piezas': 1_000_000,
+    'comentarios_por_pieza': 2,
+    'categorias_accesorios': 25,
+    'accesorios': 50_000,
+    'servicios': 80,
+    'reparaciones': 500_000,
+    'devoluciones': 50_000,
+    'tipos_asesoria': 12,
+    'asesorias': 100_000,
+}
+# Tablas de referencia: no dependen de la escala
+FIJOS = ('categorias_piezas', 'categorias_accesorios', 'servicios', 'tipos_asesoria', 'comentarios_por_pieza')
+MINIMOS = {'empleados': 10}
+
+# Fecha de referencia fija: las fechas generadas no dependen del día en que se corre
+ORIGEN = datetime(2022, 1, 1, tzinfo=dt_timezone.utc)
+PERIODO = timedelta(days=3 * 365)
+
+MARCAS = {
+    'Toyota': ['Corolla', 'Hilux', 'RAV4', 'Yaris'],
+    'Ford': ['Focus', 'Ranger', 'Fiesta', 'Explorer'],
+    'Chevrolet': ['Aveo', 'Spark', 'Tracker', 'Silverado'],
+    'Nissan': ['Sentra', 'Versa', 'Frontier', 'Kicks'],
+    'Hyundai': ['Accent', 'Elantra', 'Tucson', 'Creta'],
+    'Kia': ['Rio', 'Sportage', 'Picanto', 'Seltos'],
+    'Volkswagen': ['Gol', 'Jetta', 'Amarok', 'Polo'],
+    'Mazda': ['2', '3', 'CX-5', 'BT-50'],
+}
+PIEZAS = ['Pastilla de freno', 'Filtro de aceite', 'Amortiguador', 'Bujía', 'Correa de distribución',
+          'Radiador', 'Alternador', 'Batería', 'Embrague', 'Faro delantero', 'Sensor de oxígeno', 'Bomba de agua']
+ACCESORIOS = ['Alfombra', 'Funda de asiento', 'Portaequipaje', 'Cámara de reversa', 'Sensor de parqueo',
+              'Cargador USB', 'Cubre volante', 'Parasol', 'Organizador de maletero', 'Luz LED interior']
+SERVICIOS = ['Cambio de aceite', 'Alineación', 'Balanceo', 'Frenos', 'Diagnóstico', 'Suspensión',
+             'Aire acondicionado', 'Sistema eléctrico', 'Transmisión', 'Pintura']
+# Especialidad de técnico de cada servicio (las de Empleado.especialidad); vacía: cualquiera
+ESPECIALIDADES_SERVICIO = {
+    'Cambio de aceite': 'motor', 'Alineación': 'suspensión', 'Balanceo': 'suspensión', 'Frenos': 'frenos',
+    'Diagnóstico': '', 'Suspensión': 'suspensión', 'Aire acondicionado': 'electricidad',
+    'Sistema eléctrico': 'electricidad', 'Transmisión': 'motor', 'Pintura': 'pintura',
+}
+PALABRAS = ('excelente calidad buen precio llegó rápido funciona perfecto instalación sencilla recomendado '
+            'original resistente duradero ruido vibración cliente revisar motor frenos garantía').split()
+
+
+def _rng(semilla, nombre):
+    return random.Random(f'{semilla}:{nombre}')
+
+
+def _fecha(rng):
+    return ORIGEN + timedelta(seconds=rng.randrange(int(PERIODO.total_seconds())))
+
+
+def _texto(rng, palabras=12):
+    return ' '.join(rng.choice(PALABRAS) for _ in range(palabras)).capitalize() + '.'
+
+
+def _precio(rng, minimo, maximo):
+    return Decimal(rng.randrange(minimo * 100, maximo * 100)) / 100
+
+
+@contextmanager
+def _fechas_manuales(*modelos):
+    """Desactiva auto_now/auto_now_add para poder fijar las fechas generadas."""
+    cambiados = []
+    for modelo in modelos:
+        for field in modelo._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                cambiados.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in cambiados:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class GeneradorDatos:
+    def __init__(self, escala=0.01, semilla=1, lote=5000, progreso=None):
+        self.semilla = semilla
+        self.lote = lote
+        self.progreso = progreso or (lambda mensaje: None)
+        self.cantidades = {
+            nombre: valor if nombre in FIJOS else max(MINIMOS.get(nombre, 1), round(valor * escala))
+            for nombre, valor in VOLUMENES.items()
+        }
+        # Al menos un cliente además de los empleados
+        self.cantidades['usuarios'] = max(self.cantidades['usuarios'], self.cantidades['empleados'] + 1)
+        self.creados = {}
+
+    def _insertar(self, modelo, filas):
+        """Inserta un iterable de instancias por lotes y devuelve sus ids."""
+        ids = []
+        lote = []
+        for fila in filas:
+            lote.append(fila)
+            if len(lote) >= self.lote:
+                ids.extend(self._guardar(modelo, lote))
+                lote = []
+        if lote:
+            ids.extend(self._guardar(modelo, lote))
+        self.creados[modelo._meta.label] = self.creados.get(modelo._meta.label, 0) + len(ids)
+        self.progreso(f'{modelo._meta.label}: {self.creados[modelo._meta.label]}')
+        return ids
+
+    def _guardar(self, modelo, lote):
+        with transaction.atomic():
+            creados = modelo.objects.bulk_create(lote)
+        return [objeto.pk for objeto in creados]
+
+    def generar(self):
+        modelos = (Usuario, Carro, Pieza, ComentarioPieza, Accesorio, Servicio, Reparacion,
+                   HistorialEstadoReparacion, Devolucion, HistorialEstadoDevolucion, Asesoria)
+        with _fechas_manuales(*modelos):
+            usuarios, clientes, empleados = self.usuarios()
+            carros = self.carros()
+            piezas = self.piezas(usuarios)
+            self.accesorios()
+            self.reparaciones(clientes, empleados, carros, usuarios)
+            self.devoluciones(clientes, piezas, carros, usuarios)
+            self.asesorias(clientes, empleados)
+        busqueda.reconstruir()
+        invalidar(Usuario, Carro, CategoriaPieza, Pieza, ComentarioPieza, CompatibilidadPieza,
+                  Categoria, Accesorio, Servicio, TipoAsesoria)
+        return self.creados
+
+    def usuarios(self):
+        rng = _rng(self.semilla, 'usuarios')
+        # Un solo hash para todos: calcularlo por usuario tomaría horas
+        clave = make_password(f'sintetico-{self.semilla}')
+        prefijo = f's{self.semilla}'
+        usuarios = self._insertar(Usuario, (
+            Usuario(
+                username=f'{prefijo}_usuario_{i}', email=f'{prefijo}_usuario_{i}@ejemplo.com', password=clave,
+                first_name=rng.choice(['Ana', 'Luis', 'María', 'Carlos', 'Sofía', 'Jorge', 'Lucía', 'Pedro']),
+                last_name=rng.choice(['García', 'Pérez', 'López', 'Martínez', 'Rodríguez', 'Gómez']),
+                telefono=f'+57 3{rng.randrange(10 ** 9):09d}', date_joined=_fecha(rng),
+                es_empleado=i < self.cantidades['empleados'], es_cliente=i >= self.cantidades['empleados'],
+            )
+            for i in range(self.cantidades['usuarios'])
+        ))
+        empleados_usuarios = usuarios[:self.cantidades['empleados']]
+        clientes = self._insertar(Cliente, (
+            Cliente(usuario_id=usuario_id, puntos_fidelidad=rng.randrange(500))
+            for usuario_id in usuarios[len(empleados_usuarios):]
+        ))
+        empleados = self._insertar(Empleado, (
+            Empleado(
+                usuario_id=usuario_id, cargo=rng.choice(['Técnico', 'Asesor', 'Vendedor']),
+                fecha_contratacion=(ORIGEN - timedelta(days=rng.randrange(3000))).date(),
+                especialidad=rng.choice(['motor', 'frenos', 'electricidad', 'suspensión', 'pintura']),
+            )
+            for usuario_id in empleados_usuarios
+        ))
+        return usuarios, clientes, empleados
+
+    def carros(self):
+        rng = _rng(self.semilla, 'carros')
+        marcas = sorted(MARCAS)
+
+        def fila():
+            marca = rng.choice(marcas)
+            fecha = _fecha(rng)
+            return Carro(
+                marca=marca, modelo=rng.choice(MARCAS[marca]), año=rng.randrange(2005, 2025),
+                precio=_precio(rng, 8000, 90000), kilometraje=rng.randrange(0, 250000, 100),
+                transmision=rng.choice(['manual', 'automatica', 'semiautomatica']),
+                combustible=rng.choice(['gasolina', 'gasolina', 'diesel', 'hibrido', 'electrico']),
+                estado=rng.choice(['nuevo', 'usado', 'usado', 'recondicionado']),
+                descripcion=_texto(rng, 20), imagen_principal='carros/sintetico.jpg',
+                fecha_creacion=fecha, fecha_actualizacion=fecha,
+            )
+        return self._insertar(Carro, (fila() for _ in range(self.cantidades['carros'])))
+
+    def piezas(self, usuarios):
+        rng = _rng(self.semilla, 'piezas')
+        categorias = self._insertar(CategoriaPieza, (
+            CategoriaPieza(nombre=f'{PIEZAS[i % len(PIEZAS)]} {i // len(PIEZAS) + 1}', descripcion=_texto(rng))
+            for i in range(self.cantidades['categorias_piezas'])
+        ))
+        marcas = sorted(MARCAS)
+        ids = []
+        por_lote = max(1, self.lote // (self.cantidades['comentarios_por_pieza'] + 1))
+        restantes = self.cantidades['piezas']
+        while restantes:
+            # Las piezas de un lote junto con sus comentarios y su compatibilidad
+            piezas, comentarios = [], []
+            for _ in range(min(por_lote, restantes)):
+                marca = rng.choice(marcas)
+                desde = rng.randrange(2005, 2020)
+                calificaciones = [rng.randint(1, CALIFICACION_MAXIMA) for _ in range(rng.randint(0, 2 * self.cantidades['comentarios_por_pieza']))]
+                histograma = [0] * (CALIFICACION_MAXIMA + 1)
+                for calificacion in calificaciones:
+                    histograma[calificacion] += 1
+                fecha = _fecha(rng)
+                piezas.append(Pieza(
+                    nombre=f'{rng.choice(PIEZAS)} {marca} {rng.randrange(1000, 9999)}', descripcion=_texto(rng),
+                    precio=_precio(rng, 5, 800), stock=rng.randrange(0, 200), imagen='piezas/sintetico.jpg',
+                    categoria_id=rng.choice(categorias) if rng.random() > 0.02 else None,
+                    compatibilidad=f'{marca} {rng.choice(MARCAS[marca])} {desde}-{desde + rng.randrange(1, 8)}',
+                    garantia=rng.choice([0, 3, 6, 12, 24]), fecha_creacion=fecha, fecha_actualizacion=fecha,
+                    total_calificaciones=len(calificaciones), histograma_calificaciones=histograma,
+                    calificacion_promedio=(Decimal(sum(calificaciones)) / len(calificaciones)).quantize(Decimal('0.01'))
+                    if calificaciones else Decimal('0'),
+                ))
+                comentarios.append(calificaciones)
+            nuevos = self._guardar(Pieza, piezas)
+            ids.extend(nuevos)
+            self.creados[Pieza._meta.label] = len(ids)
+            compatibles = [
+                CompatibilidadPieza(pieza_id=pieza_id, marca=m, modelo=mo, anio_desde=d, anio_hasta=h)
+                for pieza_id, pieza in zip(nuevos, piezas)
+                for m, mo, d, h in interpretar(pieza.compatibilidad)
+            ]
+            self._insertar(CompatibilidadPieza, compatibles)
+            self._insertar(ComentarioPieza, (
+                ComentarioPieza(
+                    pieza_id=pieza_id, usuario_id=rng.choice(usuarios), contenido=_texto(rng, 10),
+                    calificacion=calificacion, fecha_creacion=_fecha(rng),
+                )
+                for pieza_id, calificaciones in zip(nuevos, comentarios)
+                for calificacion in calificaciones
+            ))
+            restantes -= len(piezas)
+        self.progreso(f'{Pieza._meta.label}: {len(ids)}')
+        return ids
+
+    def accesorios(self):
+        rng = _rng(self.semilla, 'accesorios')
+        categorias = self._insertar(Categoria, (
+            Categoria(nombre=f'{ACCESORIOS[i % len(ACCESORIOS)]} {i // len(ACCESORIOS) + 1}', descripcion=_texto(rng))
+            for i in range(self.cantidades['categorias_accesorios'])
+        ))
+
+        def fila():
+            fecha = _fecha(rng)
+            return Accesorio(
+                categoria_id=rng.choice(categorias), nombre=f'{rng.choice(ACCESORIOS)} {rng.randrange(100, 999)}',
+                descripcion=_texto(rng), precio=_precio(rng, 5, 400), stock=rng.randrange(0, 100),
+                imagen='accesorios/sintetico.jpg', fecha_creacion=fecha, fecha_actualizacion=fecha,
+            )
+        return self._insertar(Accesorio, (fila() for _ in range(self.cantidades['accesorios'])))
+
+    def reparaciones(self, clientes, empleados, carros, usuarios):
+        rng = _rng(self.semilla, 'reparaciones')
+        servicios = self._insertar(Servicio, (
+            Servicio(
+                nombre=f'{SERVICIOS[i % len(SERVICIOS)]} {i // len(SERVICIOS) + 1}', descripcion=_texto(rng),
+                precio=_precio(rng, 20, 600), duracion_estimada=timedelta(minutes=rng.choice([30, 60, 90, 120, 240])),
+                especialidad=ESPECIALIDADES_SERVICIO[SERVICIOS[i % len(SERVICIOS)]],
+                fecha_creacion=_fecha(rng),
+            )
+            for i in range(self.cantidades['servicios'])
+        ))
+        precios = dict(Servicio.objects.filter(pk__in=servicios).values_list('pk', 'precio'))
+        recorridos = {
+            'PENDIENTE': [],
+            'EN_PROCESO': ['EN_PROCESO'],
+            'COMPLETADO': ['EN_PROCESO', 'COMPLETADO'],
+            'CANCELADO': ['CANCELADO'],
+        }
+        estados = sorted(recorridos)
+        por_lote = max(1, self.lote // 6)
+        restantes = self.cantidades['reparaciones']
+        while restantes:
+            reparaciones, extras = [], []
+            for _ in range(min(por_lote, restantes)):
+                estado = rng.choice(estados)
+                ingreso = _fecha(rng)
+                elegidos = rng.sample(servicios, min(len(servicios), rng.randint(1, 4)))
+                costos = [precios[s] for s in elegidos]
+                reparaciones.append(Reparacion(
+                    cliente_id=rng.choice(clientes), vehiculo_id=rng.choice(carros),
+                    tecnico_asignado_id=rng.choice(empleados) if estado != 'PENDIENTE' else None,
+                    fecha_ingreso=ingreso, estado=estado, descripcion_problema=_texto(rng),
+                    fecha_entrega=ingreso + timedelta(days=rng.randint(1, 10)) if estado == 'COMPLETADO' else None,
+                    descripcion_solucion=_texto(rng) if estado == 'COMPLETADO' else None,
+                ))
+                extras.append((ingreso, list(zip(elegidos, costos)), recorridos[estado]))
+            nuevos = self._guardar(Reparacion, reparaciones)
+            self.creados[Reparacion._meta.label] = self.creados.get(Reparacion._meta.label, 0) + len(nuevos)
+            detalles, historial = [], []
+            for reparacion_id, (ingreso, elegidos, recorrido) in zip(nuevos, extras):
+                for servicio_id, costo in elegidos:
+                    detalles.append(DetalleReparacion(
+                        reparacion_id=reparacion_id, servicio_id=servicio_id, costo=costo,
+                        fecha_ejecucion=ingreso + timedelta(hours=rng.randint(1, 72)) if recorrido else None,
+                    ))
+                anterior, fecha = 'PENDIENTE', ingreso
+                for nuevo in recorrido:
+                    fecha += timedelta(hours=rng.randint(1, 48))
+                    historial.append(HistorialEstadoReparacion(
+                        reparacion_id=reparacion_id, estado_anterior=anterior, estado_nuevo=nuevo,
+                        fecha_cambio=fecha, usuario_id=rng.choice(usuarios),
+                    ))
+                    anterior = nuevo
+            self._insertar(DetalleReparacion, detalles)
+            self._insertar(HistorialEstadoReparacion, historial)
+            restantes -= len(reparaciones)
+
+    def devoluciones(self, clientes, piezas, carros, usuarios):
+        rng = _rng(self.semilla, 'devoluciones')
+        estados = ['PENDIENTE', 'APROBADA', 'RECHAZADA', 'EN_PROCESO', 'COMPLETADA']
+        por_lote = max(1, self.lote // 2)
+        restantes = self.cantidades['devoluciones']
+        while restantes:
+            devoluciones = []
+            for _ in range(min(por_lote, restantes)):
+                tipo = rng.choice(['PRODUCTO', 'PRODUCTO', 'VEHICULO', 'SERVICIO'])
+                solicitud = _fecha(rng)
+                estado = rng.choice(estados)
+                devoluciones.append(Devolucion(
+                    cliente_id=rng.choice(clientes), tipo=tipo, motivo=_texto(rng), estado=estado,
+                    fecha_solicitud=solicitud,
+                    fecha_resolucion=solicitud + timedelta(days=rng.randint(1, 20)) if estado in ('RECHAZADA', 'COMPLETADA') else None,
+                    monto=_precio(rng, 10, 5000) if estado != 'RECHAZADA' else None,
+                    producto_devuelto_id=rng.choice(piezas) if tipo == 'PRODUCTO' else None,
+                    vehiculo_devuelto_id=rng.choice(carros) if tipo == 'VEHICULO' else None,
+                ))
+            nuevos = self._guardar(Devolucion, devoluciones)
+            self.creados[Devolucion._meta.label] = self.creados.get(Devolucion._meta.label, 0) + len(nuevos)
+            self._insertar(HistorialEstadoDevolucion, (
+                HistorialEstadoDevolucion(
+                    devolucion_id=devolucion_id, estado_anterior='PENDIENTE', estado_nuevo=devolucion.estado,
+                    fecha_cambio=devolucion.fecha_solicitud + timedelta(hours=rng.randint(1, 96)),
+                    usuario_id=rng.choice(usuarios),
+                )
+                for devolucion_id, devolucion in zip(nuevos, devoluciones)
+                if devolucion.estado != 'PENDIENTE'
+            ))
+            restantes -= len(devoluciones)
+
+    def asesorias(self, clientes, empleados):
+        rng = _rng(self.semilla, 'asesorias')
+        tipos = self._insertar(TipoAsesoria, (
+            TipoAsesoria(
+                nombre=f'Asesoría {i + 1}', descripcion=_texto(rng),
+                duracion_estimada=timedelta(minutes=rng.choice([30, 45, 60, 90])), precio=_precio(rng, 0, 100) or None,
+            )
+            for i in range(self.cantidades['tipos_asesoria'])
+        ))
+
+        def fila():
+            estado = rng.choice(['PENDIENTE', 'PROGRAMADA', 'EN_PROCESO', 'COMPLETADA', 'CANCELADA'])
+            solicitud = _fecha(rng)
+            programada = solicitud + timedelta(days=rng.randint(1, 15), hours=rng.randint(8, 17)) if estado != 'PENDIENTE' else None
+            completada = estado == 'COMPLETADA'
+            duracion = timedelta(minutes=rng.randint(20, 120)) if completada else None
+            return Asesoria(
+                cliente_id=rng.choice(clientes), tipo_asesoria_id=rng.choice(tipos),
+                asesor_id=rng.choice(empleados) if estado != 'PENDIENTE' else None, estado=estado,
+                fecha_solicitud=solicitud, fecha_programada=programada,
+                fecha_inicio=programada if completada else None,
+                fecha_fin=programada + duracion if completada else None, duracion_real=duracion,
+                descripcion=_texto(rng), resultado=_texto(rng) if completada else None,
+                calificacion=rng.randint(1, 5) if completada else None,
+            )
+        return self._insertar(Asesoria, (fila() for _ in range(self.cantidades['asesorias'])))
@@ -0,0 +1,95 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from car_dealership.cache_respuestas import cache
+from car_dealership.pruebas import PresupuestoConsultasMixin
+from accesorios.models import Accesorio, Categoria
+from piezas.models import CategoriaPieza, Pieza
+from usuarios.models import Usuario
+from . import busqueda
+from .benchmark import endpoints
+from .sinteticos import GeneradorDatos
+
+
+class PresupuestoConsultasTests(PresupuestoConsultasMixin, APITestCase):
+    """Cada endpoint con presupuesto lo cumple con datos sintéticos y cualquier autenticación."""
+
+    @classmethod
+    def setUpTestData(cls):
+        GeneradorDatos(escala=0.001).generar()
+        cls.admin = Usuario.objects.create_superuser(
+            email='presupuesto@ejemplo.com', username='presupuesto', password='clave-de-pruebas',
+        )
+
+    def _comprobar(self, **extra):
+        urls = [(nombre, url) for nombre, _url_name, url in endpoints()[0]
+                if nombre.split('?')[0] in settings.PRESUPUESTO_CONSULTAS]
+        self.assertTrue(urls)
+        for nombre, url in urls:
+            with self.subTest(nombre):
+                cache().clear()
+                response = self.client.get(url, secure=True, **extra)
+                self.assertEqual(response.status_code, 200)
+                self.assertPresupuestoConsultas(response)
+
+    def test_forzada(self):
+        self.client.force_authenticate(self.admin)
+        self._comprobar()
+
+    def test_sesion(self):
+        self.client.force_login(self.admin)
+        self._comprobar()
+
+    def test_token(self):
+        self._comprobar(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.admin)}')
+
+
+class IndiceCategoriasTests(TestCase):
+    """El nombre de la categoría forma parte del documento de piezas y accesorios."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.categoria = CategoriaPieza.objects.create(nombre='Suspension')
+        cls.piezas = [
+            Pieza.objects.create(
+                nombre=f'Repuesto {i}', descripcion='d', precio=Decimal('10'), stock=1,
+                imagen='piezas/p.png', categoria=cls.categoria, garantia=6,
+            )
+            for i in range(3)
+        ]
+        cls.categoria_accesorios = Categoria.objects.create(nombre='Exterior')
+        Accesorio.objects.create(
+            categoria=cls.categoria_accesorios, nombre='Spoiler', descripcion='d', precio=Decimal('10'),
+            stock=1, imagen='accesorios/a.png',
+        )
+
+    def _encontrados(self, texto, tipo):
+        return sorted(pk for _tipo, pk, _rango in busqueda.buscar(texto, tipo))
+
+    def test_renombrar_categoria(self):
+        self.categoria.nombre = 'Amortiguacion'
+        self.categoria.save()
+        self.assertEqual(self._encontrados('amortiguacion', 'piezas'), [p.pk for p in self.piezas])
+        self.assertEqual(self._encontrados('suspension', 'piezas'), [])
+
+    def test_guardar_sin_cambiar_nombre_no_reindexa(self):
+        with mock.patch.object(busqueda, 'indexar') as indexar:
+            self.categoria.descripcion = 'Otra descripción'
+            self.categoria.save()
+            self.categoria.save(update_fields=['descripcion'])
+        indexar.assert_not_called()
+
+    def test_borrar_categoria_de_piezas(self):
+        self.assertEqual(len(self._encontrados('suspension', 'piezas')), 3)
+        self.categoria.delete()
+        self.assertEqual(self._encontrados('suspension', 'piezas'), [])
+        self.assertEqual(len(self._encontrados('repuesto', 'piezas')), 3)
+
+    def test_borrar_categoria_de_accesorios(self):
+        self.categoria_accesorios.delete()
+        self.assertEqual(self._encontrados('exterior', 'accesorios'), [])
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import BuscarCatalogoView, ExportarCatalogoView, ImportarCatalogoView
+
+urlpatterns = [
+    path('buscar/', BuscarCatalogoView.as_view(), name='catalogo-buscar'),
+    path('<str:modelo>/importar/', ImportarCatalogoView.as_view(), name='catalogo-importar'),
+    path('<str:modelo>/exportar/', ExportarCatalogoView.as_view(), name='catalogo-exportar'),
+]
@@ -0,0 +1,125 @@
+from pathlib import Path
+
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+from accesorios.serializers import AccesorioSerializer
+from carros.serializers import CarroSerializer
+from piezas.serializers import PiezaSerializer
+from . import busqueda, exportacion
+from .importacion import FORMATOS, IMPORTADORES, ErrorImportacion
+
+class ImportarCatalogoView(APIView):
+    """
+    Sube un CSV o JSONL (campo ``archivo``) y hace upsert por sku_proveedor.
+    Devuelve los conteos y las primeras filas rechazadas.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+    max_errores = 100
+
+    def post(self, request, modelo):
+        if modelo not in IMPORTADORES:
+            return Response({'error': f'Modelo no soportado: {modelo}'}, status=status.HTTP_404_NOT_FOUND)
+        archivo = request.FILES.get('archivo')
+        if archivo is None:
+            return Response({'archivo': ['Este campo es requerido.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        formato = request.data.get('formato') or Path(archivo.name).suffix.lstrip('.').lower().replace('ndjson', 'jsonl')
+        if formato not in FORMATOS:
+            return Response({'formato': [f'Use uno de: {", ".join(FORMATOS)}']}, status=status.HTTP_400_BAD_REQUEST)
+
+        importador = IMPORTADORES[modelo](max_errores=self.max_errores)
+        try:
+            archivo.open('rb')
+            resultado = importador.importar(archivo.file, formato)
+        except ErrorImportacion as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(resultado)
+
+class ExportarCatalogoView(APIView):
+    """
+    Descarga la tabla completa en ``?formato=csv|jsonl|ndjson`` como stream,
+    sin paginar y sin cargarla entera en memoria.
+    """
+    permission_classes = [IsAdminUser]
+    chunk_size = 2000
+
+    def get(self, request, modelo):
+        if modelo not in exportacion.EXPORTABLES:
+            return Response({'error': f'Modelo no soportado: {modelo}'}, status=status.HTTP_404_NOT_FOUND)
+        formato = request.query_params.get('formato', 'csv')
+        if formato not in exportacion.FORMATOS:
+            return Response({'formato': [f'Use uno de: {", ".join(exportacion.FORMATOS)}']}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            exportacion.lineas(modelo, formato, {'request': request}, self.chunk_size),
+            content_type=exportacion.FORMATOS[formato],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{modelo}.{formato}"'
+        return response
+
+class BuscarCatalogoView(APIView):
+    """
+    Búsqueda de texto en carros, piezas y accesorios ordenada por relevancia.
+    ``?q=`` (la última palabra cuenta como prefijo), ``?tipo=carros|piezas|accesorios``
+    y ``?page=``. Sin ``count``: contar todas las coincidencias costaría más que la página.
+    """
+    page_size = 20
+    max_page = 50
+    serializers = {
+        'carros': CarroSerializer,
+        'piezas': PiezaSerializer,
+        'accesorios': AccesorioSerializer,
+    }
+
+    def get(self, request):
+        texto = request.query_params.get('q', '').strip()
+        if not texto:
+            return Response({'q': ['Este parámetro es requerido.']}, status=status.HTTP_400_BAD_REQUEST)
+        tipo = request.query_params.get('tipo') or None
+        if tipo is not None and tipo not in busqueda.TIPOS:
+            return Response({'tipo': [f'Use uno de: {", ".join(busqueda.TIPOS)}']}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            pagina = max(1, int(request.query_params.get('page', 1)))
+        except ValueError:
+            pagina = 1
+        if pagina > self.max_page:
+            return Response({'page': [f'Máximo {self.max_page}; refine la búsqueda.']}, status=status.HTTP_400_BAD_REQUEST)
+        if busqueda.motor() is None:
+            return Response({'error': 'Búsqueda no disponible en esta base de datos'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+        # Una fila de más para saber si hay página siguiente
+        coincidencias = busqueda.buscar(texto, tipo, self.page_size + 1, (pagina - 1) * self.page_size)
+        siguiente = len(coincidencias) > self.page_size
+        coincidencias = coincidencias[:self.page_size]
+
+        ids = {}
+        for nombre, id, _rango in coincidencias:
+            ids.setdefault(nombre, []).append(id)
+        objetos = {}
+        for nombre, pks in ids.items():
+            _codigo, modelo, _documento, relaciones = busqueda.TIPOS[nombre]
+            for objeto in modelo.objects.select_related(*relaciones).filter(pk__in=pks):
+                objetos[nombre, objeto.pk] = objeto
+
+        contexto = {'request': request, 'view': self}
+        resultados = [
+            {
+                'tipo': nombre,
+                'rango': rango,
+                'objeto': self.serializers[nombre](objetos[nombre, id], context=contexto).data,
+            }
+            # Una fila borrada entre la búsqueda y la carga simplemente se omite
+            for nombre, id, rango in coincidencias if (nombre, id) in objetos
+        ]
+        url = request.build_absolute_uri()
+        return Response({
+            'next': replace_query_param(url, 'page', pagina + 1) if siguiente else None,
+            'previous': replace_query_param(url, 'page', pagina - 1) if pagina > 1 else None,
+            'results': resultados,
+        })
@@ -4,6 +4,8 @@ from django.utils import timezone
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
+from car_dealership.estados import TransicionesAdminMixin
+from . import estados
 from .models import Devolucion, HistorialEstadoDevolucion, DocumentoDevolucion
 
 class DocumentoDevolucionInline(admin.TabularInline):
@@ -39,7 +41,8 @@ class HistorialEstadoDevolucionInline(admin.TabularInline):
         return False
 
 @admin.register(Devolucion)
-class DevolucionAdmin(admin.ModelAdmin):
+class DevolucionAdmin(TransicionesAdminMixin, admin.ModelAdmin):
+    maquina = estados.maquina
     list_display = (
         'id', 'cliente', 'tipo', 'estado_badge', 'monto_formateado',
         'fecha_solicitud_formateada', 'acciones'
@@ -181,24 +184,6 @@ class DevolucionAdmin(admin.ModelAdmin):
         return ""
     acciones.short_description = 'Acciones'
     acciones.allow_tags = True
-    
-    def save_model(self, request, obj, form, change):
-        if change and 'estado' in request.GET:
-            nuevo_estado = request.GET['estado']
-            if nuevo_estado != obj.estado:
-                # Registrar el cambio de estado en el historial
-                HistorialEstadoDevolucion.objects.create(
-                    devolucion=obj,
-                    estado_anterior=obj.estado,
-                    estado_nuevo=nuevo_estado,
-                    usuario=request.user,
-                    notas=f'Cambio de estado realizado desde el panel de administración'
-                )
-                obj.estado = nuevo_estado
-                if nuevo_estado in ['APROBADA', 'RECHAZADA', 'COMPLETADA']:
-                    obj.fecha_resolucion = timezone.now()
-        
-        super().save_model(request, obj, form, change)
 
 @admin.register(DocumentoDevolucion)
 class DocumentoDevolucionAdmin(admin.ModelAdmin):
@@ -0,0 +1,22 @@
+"""Estados de una devolución, lo que se escribe al entrar en ellos y el archivo de su historial."""
+from car_dealership.estados import MaquinaEstados
+from car_dealership.historial import ArchivoHistorial
+from .models import Devolucion, HistorialEstadoDevolucion, HistorialEstadoDevolucionArchivado
+
+TRANSICIONES = {
+    'PENDIENTE': ('APROBADA', 'RECHAZADA'),
+    'APROBADA': ('EN_PROCESO', 'RECHAZADA'),
+    'EN_PROCESO': ('COMPLETADA',),
+}
+
+
+def _resuelta(ahora):
+    return {'fecha_resolucion': ahora}
+
+
+maquina = MaquinaEstados(
+    Devolucion, TRANSICIONES, HistorialEstadoDevolucion, 'devolucion',
+    al_entrar={'APROBADA': _resuelta, 'RECHAZADA': _resuelta, 'COMPLETADA': _resuelta},
+)
+
+archivo = ArchivoHistorial(HistorialEstadoDevolucion, HistorialEstadoDevolucionArchivado, 'devolucion')
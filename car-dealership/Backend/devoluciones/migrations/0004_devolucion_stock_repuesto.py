@@ -0,0 +1,26 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:03
+
+from django.db import migrations, models
+
+
+def marcar_completadas(apps, schema_editor):
+    # Las devoluciones ya completadas no se repusieron automáticamente: no
+    # deben reponerse ahora al volver a guardarse
+    Devolucion = apps.get_model('devoluciones', 'Devolucion')
+    Devolucion.objects.filter(estado='COMPLETADA').update(stock_repuesto=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devoluciones', '0003_historialestadodevolucion_hist_devolucion_cambio_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devolucion',
+            name='stock_repuesto',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Stock Repuesto'),
+        ),
+        migrations.RunPython(marcar_completadas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devoluciones', '0004_devolucion_stock_repuesto'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistorialEstadoDevolucionArchivado',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('estado_anterior', models.CharField(max_length=20, verbose_name='Estado Anterior')),
+                ('estado_nuevo', models.CharField(max_length=20, verbose_name='Estado Nuevo')),
+                ('fecha_cambio', models.DateTimeField(verbose_name='Fecha de Cambio')),
+                ('notas', models.TextField(blank=True, null=True, verbose_name='Notas')),
+                ('devolucion', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='historial_archivado', to='devoluciones.devolucion')),
+                ('usuario', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Historial Archivado de Devolución',
+                'verbose_name_plural': 'Historial Archivado de Devoluciones',
+                'ordering': ['-fecha_cambio'],
+                'indexes': [models.Index(fields=['devolucion', 'fecha_cambio'], name='hist_dev_archivado_idx')],
+            },
+        ),
+    ]
@@ -45,6 +45,8 @@ class Devolucion(models.Model):
         verbose_name=_('Vehículo Devuelto')
     )
     comentario = models.TextField(_('Comentario'), blank=True, null=True)
+    # Evita reponer dos veces el stock del producto devuelto
+    stock_repuesto = models.BooleanField(_('Stock Repuesto'), default=False, editable=False)
 
     class Meta:
         verbose_name = _('Devolución')
@@ -75,10 +77,44 @@ class HistorialEstadoDevolucion(models.Model):
         verbose_name = _('Historial de Estado de Devolución')
         verbose_name_plural = _('Historial de Estados de Devoluciones')
         ordering = ['-fecha_cambio']
+        indexes = [
+            models.Index(fields=['fecha_cambio', 'id'], name='hist_devolucion_cambio_idx'),
+        ]
 
     def __str__(self):
         return f'Cambio de estado en {self.devolucion} el {self.fecha_cambio}'
 
+class HistorialEstadoDevolucionArchivado(models.Model):
+    # Filas de HistorialEstadoDevolucion movidas por archivar_historial; conservan su id
+    id = models.BigIntegerField(primary_key=True)
+    devolucion = models.ForeignKey(
+        Devolucion,
+        on_delete=models.CASCADE,
+        related_name='historial_archivado',
+        db_index=False
+    )
+    estado_anterior = models.CharField(_('Estado Anterior'), max_length=20)
+    estado_nuevo = models.CharField(_('Estado Nuevo'), max_length=20)
+    fecha_cambio = models.DateTimeField(_('Fecha de Cambio'))
+    usuario = models.ForeignKey(
+        'usuarios.Usuario',
+        on_delete=models.SET_NULL,
+        null=True,
+        verbose_name=_('Usuario')
+    )
+    notas = models.TextField(_('Notas'), blank=True, null=True)
+
+    class Meta:
+        verbose_name = _('Historial Archivado de Devolución')
+        verbose_name_plural = _('Historial Archivado de Devoluciones')
+        ordering = ['-fecha_cambio']
+        indexes = [
+            models.Index(fields=['devolucion', 'fecha_cambio'], name='hist_dev_archivado_idx'),
+        ]
+
+    def __str__(self):
+        return f'Cambio de estado archivado en {self.devolucion_id} el {self.fecha_cambio}'
+
 class DocumentoDevolucion(models.Model):
     devolucion = models.ForeignKey(
         Devolucion,
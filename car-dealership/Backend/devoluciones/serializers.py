@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from car_dealership.campos import CamposDinamicosMixin
+from car_dealership.historial import RecientesListSerializer
 from .models import Devolucion, HistorialEstadoDevolucion, DocumentoDevolucion
 from usuarios.models import Cliente, Usuario
 from piezas.models import Pieza
@@ -38,7 +40,7 @@ class HistorialEstadoDevolucionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'fecha_cambio']
 
-class DevolucionSerializer(serializers.ModelSerializer):
+class DevolucionSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     cliente_detalle = ClienteSerializer(read_only=True, source='cliente')
     cliente_id = serializers.PrimaryKeyRelatedField(
         queryset=Cliente.objects.all(),
@@ -60,7 +62,8 @@ class DevolucionSerializer(serializers.ModelSerializer):
         required=False
     )
     documentos = DocumentoDevolucionSerializer(many=True, read_only=True)
-    historial_estados = HistorialEstadoDevolucionSerializer(many=True, read_only=True)
+    # Solo los cambios más recientes; el historial completo está en <id>/historial/
+    historial_estados = RecientesListSerializer(child=HistorialEstadoDevolucionSerializer(), read_only=True)
 
     class Meta:
         model = Devolucion
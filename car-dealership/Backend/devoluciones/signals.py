@@ -0,0 +1,35 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from car_dealership.estados import estado_cambiado
+from reservas.servicios import reponer
+from .models import Devolucion
+
+
+def _reponer(devolucion_id, producto_id):
+    # UPDATE condicional: aunque se complete dos veces a la vez, solo uno repone
+    if Devolucion.objects.filter(pk=devolucion_id, stock_repuesto=False).update(stock_repuesto=True):
+        reponer('pieza', producto_id, 1)
+
+
+@receiver(post_save, sender=Devolucion)
+def reponer_stock_devolucion(sender, instance, raw=False, **kwargs):
+    """Al completarse la devolución de un producto, la pieza vuelve al stock."""
+    if raw or instance.stock_repuesto:
+        return
+    if instance.estado != 'COMPLETADA' or instance.tipo != 'PRODUCTO' or not instance.producto_devuelto_id:
+        return
+    _reponer(instance.pk, instance.producto_devuelto_id)
+    instance.stock_repuesto = True
+
+
+@receiver(estado_cambiado, sender=Devolucion)
+def reponer_stock_completadas(sender, ids, estado, **kwargs):
+    """Lo mismo para las devoluciones completadas con la máquina de estados."""
+    if estado != 'COMPLETADA':
+        return
+    pendientes = Devolucion.objects.filter(
+        pk__in=ids, tipo='PRODUCTO', producto_devuelto__isnull=False, stock_repuesto=False,
+    ).values_list('pk', 'producto_devuelto_id')
+    for devolucion_id, producto_id in pendientes:
+        _reponer(devolucion_id, producto_id)
@@ -1,6 +1,6 @@
 from django.urls import path
 from .views import (
-    DevolucionList, DevolucionDetail,
+    DevolucionList, DevolucionDetail, TransicionDevolucionView, HistorialDevolucionView,
     HistorialEstadoDevolucionList, HistorialEstadoDevolucionDetail,
     DocumentoDevolucionList, DocumentoDevolucionDetail
 )
@@ -9,6 +9,9 @@ urlpatterns = [
     # Devoluciones
     path('', DevolucionList.as_view(), name='devolucion-list'),
     path('<int:id>/', DevolucionDetail.as_view(), name='devolucion-detail'),
+    path('<int:id>/estado/', TransicionDevolucionView.as_view(), name='devolucion-estado'),
+    path('estado/', TransicionDevolucionView.as_view(), name='devolucion-estado-lote'),
+    path('<int:id>/historial/', HistorialDevolucionView.as_view(), name='devolucion-historial'),
     
     # Historial de Estados
     path('historial/', HistorialEstadoDevolucionList.as_view(), name='historial-list'),
@@ -1,33 +1,46 @@
 from rest_framework import generics
+from car_dealership.estados import TransicionView
+from car_dealership.historial import HistorialCompletoView
+from car_dealership.paginacion import PaginacionCursor
+from car_dealership.optimizacion import ConsultaOptimizadaMixin
+from . import estados
 from .models import Devolucion, HistorialEstadoDevolucion, DocumentoDevolucion
 from .serializers import (
     DevolucionSerializer, HistorialEstadoDevolucionSerializer,
     DocumentoDevolucionSerializer
 )
 
-class DevolucionList(generics.ListAPIView):
+class DevolucionList(ConsultaOptimizadaMixin, generics.ListAPIView):
     queryset = Devolucion.objects.all()
     serializer_class = DevolucionSerializer
 
-class DevolucionDetail(generics.RetrieveAPIView):
+class DevolucionDetail(ConsultaOptimizadaMixin, generics.RetrieveAPIView):
     queryset = Devolucion.objects.all()
     serializer_class = DevolucionSerializer
     lookup_field = 'id'
 
-class HistorialEstadoDevolucionList(generics.ListAPIView):
+class HistorialDevolucionView(HistorialCompletoView):
+    archivo = estados.archivo
+
+class TransicionDevolucionView(TransicionView):
+    maquina = estados.maquina
+    serializer_class = DevolucionSerializer
+
+class HistorialEstadoDevolucionList(ConsultaOptimizadaMixin, generics.ListAPIView):
     queryset = HistorialEstadoDevolucion.objects.all()
     serializer_class = HistorialEstadoDevolucionSerializer
+    pagination_class = PaginacionCursor
 
-class HistorialEstadoDevolucionDetail(generics.RetrieveAPIView):
+class HistorialEstadoDevolucionDetail(ConsultaOptimizadaMixin, generics.RetrieveAPIView):
     queryset = HistorialEstadoDevolucion.objects.all()
     serializer_class = HistorialEstadoDevolucionSerializer
     lookup_field = 'id'
 
-class DocumentoDevolucionList(generics.ListAPIView):
+class DocumentoDevolucionList(ConsultaOptimizadaMixin, generics.ListAPIView):
     queryset = DocumentoDevolucion.objects.all()
     serializer_class = DocumentoDevolucionSerializer
 
-class DocumentoDevolucionDetail(generics.RetrieveAPIView):
+class DocumentoDevolucionDetail(ConsultaOptimizadaMixin, generics.RetrieveAPIView):
     queryset = DocumentoDevolucion.objects.all()
     serializer_class = DocumentoDevolucionSerializer
     lookup_field = 'id'
@@ -1,7 +1,9 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
-from .models import CategoriaPieza, Pieza, ComentarioPieza
+from car_dealership.imagenes import url_variante
+from catalogo.busqueda import BusquedaTextoAdminMixin
+from .models import CategoriaPieza, Pieza, ComentarioPieza, CompatibilidadPieza
 
 @admin.register(CategoriaPieza)
 class CategoriaPiezaAdmin(admin.ModelAdmin):
@@ -15,14 +17,14 @@ class CategoriaPiezaAdmin(admin.ModelAdmin):
     
     def imagen_miniatura(self, obj):
         if obj.imagen:
-            return format_html('<img src="{}" style="max-height: 50px;" />', obj.imagen.url)
+            return format_html('<img src="{}" style="max-height: 50px;" />', url_variante(obj, 'imagen'))
         return "Sin imagen"
     imagen_miniatura.short_description = 'Imagen'
     imagen_miniatura.allow_tags = True
     
     def imagen_preview(self, obj):
         if obj.imagen:
-            return format_html('<img src="{}" style="max-width: 300px; max-height: 300px;" />', obj.imagen.url)
+            return format_html('<img src="{}" style="max-width: 300px; max-height: 300px;" />', url_variante(obj, 'imagen', 'tarjeta'))
         return "Sin imagen"
     imagen_preview.short_description = 'Vista previa de la imagen'
     imagen_preview.allow_tags = True
@@ -36,18 +38,28 @@ class ComentarioPiezaInline(admin.TabularInline):
     def has_add_permission(self, request, obj=None):
         return False
 
+class CompatibilidadPiezaInline(admin.TabularInline):
+    model = CompatibilidadPieza
+    extra = 0
+    readonly_fields = ('marca', 'modelo', 'anio_desde', 'anio_hasta')
+    can_delete = False
+    verbose_name_plural = 'Compatibilidad interpretada'
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+
 @admin.register(Pieza)
-class PiezaAdmin(admin.ModelAdmin):
-    list_display = ('nombre', 'categoria', 'precio_formateado', 'stock', 'disponible', 'imagen_miniatura')
+class PiezaAdmin(BusquedaTextoAdminMixin, admin.ModelAdmin):
+    list_display = ('nombre', 'categoria', 'precio_formateado', 'stock', 'disponible', 'calificacion_promedio', 'imagen_miniatura')
     list_filter = ('categoria', 'fecha_creacion')
-    search_fields = ('nombre', 'descripcion', 'compatibilidad', 'categoria__nombre')
+    search_fields = ('nombre', 'descripcion', 'compatibilidad', 'categoria__nombre', 'sku_proveedor')
     list_editable = ('stock',)
     readonly_fields = ('fecha_creacion', 'fecha_actualizacion', 'imagen_preview')
-    inlines = [ComentarioPiezaInline]
+    inlines = [CompatibilidadPiezaInline, ComentarioPiezaInline]
     
     fieldsets = (
         ('Información Básica', {
-            'fields': ('nombre', 'categoria', 'descripcion')
+            'fields': ('sku_proveedor', 'nombre', 'categoria', 'descripcion')
         }),
         ('Precio y Stock', {
             'fields': ('precio', 'stock', 'garantia')
@@ -79,7 +91,7 @@ class PiezaAdmin(admin.ModelAdmin):
         if obj.imagen:
             return format_html(
                 '<img src="{}" style="max-height: 50px; max-width: 50px; object-fit: cover;" />', 
-                obj.imagen.url
+                url_variante(obj, 'imagen')
             )
         return "Sin imagen"
     imagen_miniatura.short_description = 'Imagen'
@@ -89,7 +101,7 @@ class PiezaAdmin(admin.ModelAdmin):
         if obj.imagen:
             return format_html(
                 '<img src="{}" style="max-width: 300px; max-height: 300px;" />', 
-                obj.imagen.url
+                url_variante(obj, 'imagen', 'tarjeta')
             )
         return "Sin imagen"
     imagen_preview.short_description = 'Vista previa de la imagen'
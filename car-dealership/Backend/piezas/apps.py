@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class PiezasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'piezas'
+
+    def ready(self):
+        from car_dealership.cache_respuestas import invalidar_al_cambiar
+        from car_dealership.imagenes import registrar_variantes
+        from . import signals  # noqa: F401
+
+        registrar_variantes(self.get_model('CategoriaPieza'), 'imagen')
+        registrar_variantes(self.get_model('Pieza'), 'imagen')
+        for modelo in ('CategoriaPieza', 'Pieza', 'ComentarioPieza'):
+            invalidar_al_cambiar(self.get_model(modelo))
@@ -0,0 +1,124 @@
+"""
+Interpretación del texto libre de Pieza.compatibilidad.
+
+Cada entrada va separada por comas, punto y coma o saltos de línea y tiene la
+forma ``Marca [Modelo...] [años]``, por ejemplo::
+
+    Toyota Corolla 2010-2015, Ford Focus 2012; Chevrolet 2018+
+
+Los años admiten ``2010-2015``, ``2010 a 2015``, ``2012`` y ``2018+``. Sin
+modelo la entrada aplica a toda la marca y sin años a cualquier año.
+
+La marca es la primera palabra, salvo que la entrada empiece por una marca
+conocida de varias palabras (``Land Rover Defender``): las de
+``MARCAS_COMPUESTAS`` y las de los carros registrados. Si se registra un carro
+de una marca compuesta nueva, ``reindexar_compatibilidad`` vuelve a separar
+las entradas existentes.
+"""
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Q
+
+from car_dealership.cache_respuestas import invalidar
+from .models import CompatibilidadPieza
+
+SEPARADORES = re.compile(r'[,;\n]+')
+RANGO = re.compile(r'\b(\d{4})\s*(?:-|–|a|al|hasta)\s*(\d{4})\b')
+DESDE = re.compile(r'\b(\d{4})\s*(?:\+|en adelante)')
+ANIO = re.compile(r'\b(\d{4})\b')
+
+# Marcas de más de una palabra, ya normalizadas
+MARCAS_COMPUESTAS = frozenset({
+    'alfa romeo', 'aston martin', 'great wall', 'land rover', 'mercedes benz', 'rolls royce',
+})
+
+
+def normalizar(texto):
+    """Minúsculas, sin tildes y con espacios simples."""
+    texto = unicodedata.normalize('NFKD', texto or '')
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.lower().split())
+
+
+def marcas_conocidas():
+    """Marcas compuestas normalizadas: las fijas y las de los carros registrados."""
+    from carros.models import Carro
+
+    registradas = (normalizar(marca) for marca in Carro.objects.values_list('marca', flat=True).distinct())
+    return MARCAS_COMPUESTAS | {marca for marca in registradas if ' ' in marca}
+
+
+def _separar_marca(palabras, marcas):
+    """Número de palabras de la marca: el prefijo más largo que es una marca compuesta, o 1."""
+    for n in range(min(len(palabras), max((m.count(' ') + 1 for m in marcas), default=1)), 1, -1):
+        if ' '.join(palabras[:n]) in marcas:
+            return n
+    return 1
+
+
+def interpretar(texto, marcas=MARCAS_COMPUESTAS):
+    """
+    Devuelve una lista de tuplas (marca, modelo, anio_desde, anio_hasta).
+    ``marcas`` son las marcas compuestas (normalizadas) que se reconocen.
+    """
+    filas = []
+    for entrada in SEPARADORES.split(texto or ''):
+        entrada = normalizar(entrada)
+        desde = hasta = None
+        if match := RANGO.search(entrada):
+            desde, hasta = sorted((int(match.group(1)), int(match.group(2))))
+        elif match := DESDE.search(entrada):
+            desde = int(match.group(1))
+        elif match := ANIO.search(entrada):
+            desde = hasta = int(match.group(1))
+        if match:
+            entrada = entrada[:match.start()] + entrada[match.end():]
+
+        palabras = [p for p in entrada.split() if p.strip('-')]
+        if not palabras:
+            continue
+        n = _separar_marca(palabras, marcas)
+        fila = (' '.join(palabras[:n]), ' '.join(palabras[n:]), desde, hasta)
+        if fila not in filas:
+            filas.append(fila)
+    return filas
+
+
+def filas_compatibilidad(pieza, marcas=MARCAS_COMPUESTAS):
+    return [
+        CompatibilidadPieza(pieza=pieza, marca=marca, modelo=modelo, anio_desde=desde, anio_hasta=hasta)
+        for marca, modelo, desde, hasta in interpretar(pieza.compatibilidad, marcas)
+    ]
+
+
+@transaction.atomic
+def reindexar(piezas):
+    """Reconstruye las filas de compatibilidad de las piezas dadas."""
+    piezas = list(piezas)
+    CompatibilidadPieza.objects.filter(pieza__in=piezas).delete()
+    marcas = marcas_conocidas()
+    filas = []
+    for pieza in piezas:
+        filas.extend(filas_compatibilidad(pieza, marcas))
+    CompatibilidadPieza.objects.bulk_create(filas)
+    invalidar(CompatibilidadPieza)
+    return len(filas)
+
+
+def filtro_compatibles(marca, modelo=None, anio=None):
+    """Condición sobre CompatibilidadPieza para un vehículo concreto."""
+    condicion = Q(marca=normalizar(marca))
+    if modelo:
+        condicion &= Q(modelo__in=[normalizar(modelo), ''])
+    if anio is not None:
+        condicion &= Q(anio_desde__isnull=True) | Q(anio_desde__lte=anio)
+        condicion &= Q(anio_hasta__isnull=True) | Q(anio_hasta__gte=anio)
+    return condicion
+
+
+def piezas_compatibles(queryset, marca, modelo=None, anio=None):
+    """Filtra un queryset de Pieza con una subconsulta sobre el índice de compatibilidad."""
+    ids = CompatibilidadPieza.objects.filter(filtro_compatibles(marca, modelo, anio)).values('pieza_id')
+    return queryset.filter(pk__in=ids)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from piezas.compatibilidad import reindexar
+from piezas.models import Pieza
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de compatibilidad a partir de Pieza.compatibilidad'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000, help='Piezas por transacción')
+
+    def handle(self, *args, **options):
+        lote = []
+        piezas = filas = 0
+        queryset = Pieza.objects.only('id', 'compatibilidad').order_by('pk')
+        for pieza in queryset.iterator(chunk_size=options['lote']):
+            lote.append(pieza)
+            if len(lote) >= options['lote']:
+                filas += reindexar(lote)
+                piezas += len(lote)
+                lote = []
+        if lote:
+            filas += reindexar(lote)
+            piezas += len(lote)
+        self.stdout.write(self.style.SUCCESS(f'{piezas} piezas reindexadas ({filas} filas de compatibilidad)'))
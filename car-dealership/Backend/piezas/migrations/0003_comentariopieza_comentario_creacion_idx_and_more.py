@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('piezas', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comentariopieza',
+            index=models.Index(fields=['fecha_creacion', 'id'], name='comentario_creacion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pieza',
+            index=models.Index(fields=['fecha_creacion', 'id'], name='pieza_creacion_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('piezas', '0003_comentariopieza_comentario_creacion_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompatibilidadPieza',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('marca', models.CharField(max_length=100, verbose_name='Marca')),
+                ('modelo', models.CharField(blank=True, default='', max_length=100, verbose_name='Modelo')),
+                ('anio_desde', models.PositiveIntegerField(blank=True, null=True, verbose_name='Desde el año')),
+                ('anio_hasta', models.PositiveIntegerField(blank=True, null=True, verbose_name='Hasta el año')),
+                ('pieza', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='compatibles', to='piezas.pieza')),
+            ],
+            options={
+                'verbose_name': 'Compatibilidad de Pieza',
+                'verbose_name_plural': 'Compatibilidades de Piezas',
+                'indexes': [models.Index(fields=['marca', 'modelo', 'anio_desde', 'anio_hasta'], name='compat_marca_modelo_idx')],
+            },
+        ),
+    ]
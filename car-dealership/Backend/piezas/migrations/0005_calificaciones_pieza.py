@@ -0,0 +1,62 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:02
+
+import piezas.models
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def calcular_calificaciones(apps, schema_editor):
+    Pieza = apps.get_model('piezas', 'Pieza')
+    ComentarioPieza = apps.get_model('piezas', 'ComentarioPieza')
+
+    histogramas = {}
+    conteos = ComentarioPieza.objects.values_list('pieza_id', 'calificacion').annotate(n=Count('id')).order_by()
+    for pieza_id, calificacion, n in conteos:
+        histograma = histogramas.setdefault(pieza_id, [0] * 6)
+        histograma[min(calificacion, 5)] += n
+
+    piezas = list(Pieza.objects.filter(pk__in=histogramas).only('id'))
+    for pieza in piezas:
+        histograma = histogramas[pieza.pk]
+        total = sum(histograma)
+        suma = sum(i * n for i, n in enumerate(histograma))
+        pieza.histograma_calificaciones = histograma
+        pieza.total_calificaciones = total
+        pieza.calificacion_promedio = (Decimal(suma) / total).quantize(Decimal('0.01'))
+    Pieza.objects.bulk_update(
+        piezas, ['histograma_calificaciones', 'total_calificaciones', 'calificacion_promedio'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('piezas', '0004_compatibilidadpieza'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pieza',
+            name='calificacion_promedio',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=3, verbose_name='Calificación Promedio'),
+        ),
+        migrations.AddField(
+            model_name='pieza',
+            name='histograma_calificaciones',
+            field=models.JSONField(default=piezas.models.histograma_vacio, editable=False, verbose_name='Histograma de Calificaciones'),
+        ),
+        migrations.AddField(
+            model_name='pieza',
+            name='total_calificaciones',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Total de Calificaciones'),
+        ),
+        migrations.AddIndex(
+            model_name='comentariopieza',
+            index=models.Index(fields=['pieza', 'fecha_creacion', 'id'], name='comentario_pieza_idx'),
+        ),
+        migrations.RunPython(calcular_calificaciones, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('piezas', '0006_sku_proveedor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='categoriapieza',
+            name='imagen_variantes',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Variantes de imagen'),
+        ),
+        migrations.AddField(
+            model_name='pieza',
+            name='imagen_variantes',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Variantes de imagen'),
+        ),
+    ]
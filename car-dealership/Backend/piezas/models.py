@@ -1,10 +1,18 @@
-from django.db import models
+from decimal import Decimal
+
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
+CALIFICACION_MAXIMA = 5
+
+def histograma_vacio():
+    return [0] * (CALIFICACION_MAXIMA + 1)
+
 class CategoriaPieza(models.Model):
     nombre = models.CharField(_('Nombre'), max_length=100)
     descripcion = models.TextField(_('Descripción'), blank=True, null=True)
     imagen = models.ImageField(_('Imagen'), upload_to='categorias_piezas/', blank=True, null=True)
+    imagen_variantes = models.JSONField(_('Variantes de imagen'), default=dict, blank=True, editable=False)
 
     class Meta:
         verbose_name = _('Categoría de Pieza')
@@ -14,11 +22,13 @@ class CategoriaPieza(models.Model):
         return self.nombre
 
 class Pieza(models.Model):
+    sku_proveedor = models.CharField(_('SKU del Proveedor'), max_length=64, unique=True, null=True, blank=True)
     nombre = models.CharField(_('Nombre'), max_length=200)
     descripcion = models.TextField(_('Descripción'))
     precio = models.DecimalField(_('Precio'), max_digits=10, decimal_places=2)
     stock = models.PositiveIntegerField(_('Stock'))
     imagen = models.ImageField(_('Imagen'), upload_to='piezas/')
+    imagen_variantes = models.JSONField(_('Variantes de imagen'), default=dict, blank=True, editable=False)
     categoria = models.ForeignKey(
         CategoriaPieza,
         on_delete=models.SET_NULL,
@@ -29,15 +39,54 @@ class Pieza(models.Model):
     garantia = models.IntegerField(_('Garantía (meses)'))
     fecha_creacion = models.DateTimeField(_('Fecha de Creación'), auto_now_add=True)
     fecha_actualizacion = models.DateTimeField(_('Fecha de Actualización'), auto_now=True)
+    # Agregados de ComentarioPieza, mantenidos por ComentarioPieza.save() y la señal post_delete
+    total_calificaciones = models.PositiveIntegerField(_('Total de Calificaciones'), default=0, editable=False)
+    calificacion_promedio = models.DecimalField(
+        _('Calificación Promedio'), max_digits=3, decimal_places=2, default=0, editable=False
+    )
+    histograma_calificaciones = models.JSONField(
+        _('Histograma de Calificaciones'), default=histograma_vacio, editable=False
+    )
 
     class Meta:
         verbose_name = _('Pieza')
         verbose_name_plural = _('Piezas')
         ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['fecha_creacion', 'id'], name='pieza_creacion_idx'),
+        ]
 
     def __str__(self):
         return self.nombre
 
+    @classmethod
+    def registrar_calificaciones(cls, pieza_id, cambios):
+        """
+        Aplica al histograma una lista de (calificacion, +1/-1) y recalcula el
+        total y el promedio. Se llama dentro de una transacción y bloquea la fila.
+        """
+        pieza = (
+            cls.objects.select_for_update()
+            .only('id', 'histograma_calificaciones')
+            .filter(pk=pieza_id)
+            .first()
+        )
+        if pieza is None:
+            return
+        histograma = list(pieza.histograma_calificaciones or histograma_vacio())
+        for calificacion, delta in cambios:
+            indice = min(calificacion, CALIFICACION_MAXIMA)
+            histograma[indice] = max(0, histograma[indice] + delta)
+
+        total = sum(histograma)
+        suma = sum(calificacion * cantidad for calificacion, cantidad in enumerate(histograma))
+        pieza.histograma_calificaciones = histograma
+        pieza.total_calificaciones = total
+        pieza.calificacion_promedio = (Decimal(suma) / total).quantize(Decimal('0.01')) if total else Decimal('0')
+        pieza.save(update_fields=[
+            'histograma_calificaciones', 'total_calificaciones', 'calificacion_promedio', 'fecha_actualizacion'
+        ])
+
 class ComentarioPieza(models.Model):
     pieza = models.ForeignKey(
         Pieza,
@@ -57,6 +106,57 @@ class ComentarioPieza(models.Model):
         verbose_name = _('Comentario de Pieza')
         verbose_name_plural = _('Comentarios de Piezas')
         ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['fecha_creacion', 'id'], name='comentario_creacion_idx'),
+            # Comentarios de una pieza, paginados por cursor
+            models.Index(fields=['pieza', 'fecha_creacion', 'id'], name='comentario_pieza_idx'),
+        ]
 
     def __str__(self):
         return f"Comentario de {self.usuario.username} sobre {self.pieza.nombre}"
+
+    def save(self, *args, **kwargs):
+        # El comentario y los agregados de la pieza se guardan en la misma transacción
+        with transaction.atomic():
+            anterior = None
+            if self.pk:
+                anterior = (
+                    ComentarioPieza.objects.filter(pk=self.pk)
+                    .values_list('pieza_id', 'calificacion')
+                    .first()
+                )
+            super().save(*args, **kwargs)
+
+            if anterior == (self.pieza_id, self.calificacion):
+                return
+            if anterior and anterior[0] != self.pieza_id:
+                Pieza.registrar_calificaciones(anterior[0], [(anterior[1], -1)])
+                anterior = None
+            cambios = [(self.calificacion, 1)]
+            if anterior:
+                cambios.append((anterior[1], -1))
+            Pieza.registrar_calificaciones(self.pieza_id, cambios)
+
+class CompatibilidadPieza(models.Model):
+    """Fila normalizada de Pieza.compatibilidad (ver piezas.compatibilidad)."""
+    pieza = models.ForeignKey(
+        Pieza,
+        on_delete=models.CASCADE,
+        related_name='compatibles'
+    )
+    marca = models.CharField(_('Marca'), max_length=100)
+    # Vacío = cualquier modelo de la marca
+    modelo = models.CharField(_('Modelo'), max_length=100, blank=True, default='')
+    # Nulos = sin límite inferior / superior
+    anio_desde = models.PositiveIntegerField(_('Desde el año'), null=True, blank=True)
+    anio_hasta = models.PositiveIntegerField(_('Hasta el año'), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('Compatibilidad de Pieza')
+        verbose_name_plural = _('Compatibilidades de Piezas')
+        indexes = [
+            models.Index(fields=['marca', 'modelo', 'anio_desde', 'anio_hasta'], name='compat_marca_modelo_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.pieza} - {self.marca} {self.modelo} {self.anio_desde or ""}-{self.anio_hasta or ""}'
@@ -1,12 +1,15 @@
 from rest_framework import serializers
+from car_dealership.imagenes import VariantesImagenField
 from .models import CategoriaPieza, Pieza, ComentarioPieza
 from usuarios.models import Usuario
 from usuarios.serializers import UsuarioSerializer
 
 class CategoriaPiezaSerializer(serializers.ModelSerializer):
+    imagen_variantes = VariantesImagenField()
+
     class Meta:
         model = CategoriaPieza
-        fields = ['id', 'nombre', 'descripcion', 'imagen']
+        fields = ['id', 'nombre', 'descripcion', 'imagen', 'imagen_variantes']
         read_only_fields = ['id']
 
 class ComentarioPiezaSerializer(serializers.ModelSerializer):
@@ -37,26 +40,37 @@ class ComentarioPiezaSerializer(serializers.ModelSerializer):
 
 class PiezaSerializer(serializers.ModelSerializer):
     categoria_nombre = serializers.CharField(source='categoria.nombre', read_only=True)
-    comentarios = ComentarioPiezaSerializer(many=True, read_only=True)
+    imagen_variantes = VariantesImagenField()
 
     class Meta:
         model = Pieza
         fields = [
             'id',
+            'sku_proveedor',
             'nombre',
             'descripcion',
             'precio',
             'stock',
             'imagen',
+            'imagen_variantes',
             'categoria',
             'categoria_nombre',
             'compatibilidad',
             'garantia',
-            'comentarios',
+            'total_calificaciones',
+            'calificacion_promedio',
+            'histograma_calificaciones',
+            'fecha_creacion',
+            'fecha_actualizacion'
+        ]
+        read_only_fields = [
+            'id',
+            'total_calificaciones',
+            'calificacion_promedio',
+            'histograma_calificaciones',
             'fecha_creacion',
             'fecha_actualizacion'
         ]
-        read_only_fields = ['id', 'fecha_creacion', 'fecha_actualizacion']
 
     def validate_precio(self, value):
         if value <= 0:
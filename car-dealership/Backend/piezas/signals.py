@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .compatibilidad import reindexar
+from .models import ComentarioPieza, Pieza
+
+
+@receiver(post_save, sender=Pieza)
+def actualizar_compatibilidad(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and 'compatibilidad' not in update_fields:
+        return
+    reindexar([instance])
+
+
+@receiver(post_delete, sender=ComentarioPieza)
+def descontar_calificacion(sender, instance, **kwargs):
+    # Collector.delete() ya envía post_delete dentro de una transacción
+    Pieza.registrar_calificaciones(instance.pieza_id, [(instance.calificacion, -1)])
@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (
     CategoriaPiezaList, CategoriaPiezaDetail,
-    PiezaList, PiezaDetail,
+    PiezaList, PiezaDetail, PiezaCompatibleList, PiezaComentarioList,
     ComentarioPiezaList, ComentarioPiezaDetail
 )
 
@@ -13,6 +13,8 @@ urlpatterns = [
     # Piezas
     path('', PiezaList.as_view(), name='pieza-list'),
     path('<int:id>/', PiezaDetail.as_view(), name='pieza-detail'),
+    path('<int:id>/comentarios/', PiezaComentarioList.as_view(), name='pieza-comentario-list'),
+    path('compatibles/', PiezaCompatibleList.as_view(), name='pieza-compatible-list'),
     
     # Comentarios
     path('comentarios/', ComentarioPiezaList.as_view(), name='comentario-list'),
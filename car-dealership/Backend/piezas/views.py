@@ -1,30 +1,82 @@
-from rest_framework import generics
-from .models import CategoriaPieza, Pieza, ComentarioPieza
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, serializers
+from rest_framework.exceptions import NotFound
+from car_dealership.cache_respuestas import CacheVersionadaMixin
+from car_dealership.condicional import RespuestaCondicionalMixin
+from car_dealership.lectura import LecturaPlanaMixin
+from car_dealership.optimizacion import ConsultaOptimizadaMixin, optimizar_queryset
+from car_dealership.paginacion import PaginacionCursor
+from carros.models import Carro
+from .compatibilidad import piezas_compatibles
+from usuarios.models import Usuario
+from .models import CategoriaPieza, Pieza, ComentarioPieza, CompatibilidadPieza
 from .serializers import CategoriaPiezaSerializer, PiezaSerializer, ComentarioPiezaSerializer
 
-class CategoriaPiezaList(generics.ListAPIView):
+class CategoriaPiezaList(CacheVersionadaMixin, generics.ListAPIView):
     queryset = CategoriaPieza.objects.all()
     serializer_class = CategoriaPiezaSerializer
+    pagination_class = PaginacionCursor
 
-class CategoriaPiezaDetail(generics.RetrieveAPIView):
+class CategoriaPiezaDetail(CacheVersionadaMixin, generics.RetrieveAPIView):
     queryset = CategoriaPieza.objects.all()
     serializer_class = CategoriaPiezaSerializer
     lookup_field = 'id'
 
-class PiezaList(generics.ListAPIView):
+class PiezaList(CacheVersionadaMixin, RespuestaCondicionalMixin, ConsultaOptimizadaMixin, LecturaPlanaMixin, generics.ListAPIView):
+    modelos_cache = (Pieza, CategoriaPieza)
     queryset = Pieza.objects.all()
     serializer_class = PiezaSerializer
+    pagination_class = PaginacionCursor
+    vuelo_unico = True
 
-class PiezaDetail(generics.RetrieveAPIView):
+class PiezaDetail(CacheVersionadaMixin, RespuestaCondicionalMixin, ConsultaOptimizadaMixin, generics.RetrieveAPIView):
+    modelos_cache = (Pieza, CategoriaPieza)
     queryset = Pieza.objects.all()
     serializer_class = PiezaSerializer
     lookup_field = 'id'
 
-class ComentarioPiezaList(generics.ListAPIView):
+class PiezaCompatibleList(CacheVersionadaMixin, LecturaPlanaMixin, generics.ListAPIView):
+    """Piezas compatibles con ?carro=<id> o con ?marca=&modelo=&anio=."""
+    modelos_cache = (Pieza, CategoriaPieza, CompatibilidadPieza, Carro)
+    serializer_class = PiezaSerializer
+    pagination_class = PaginacionCursor
+
+    def get_queryset(self):
+        params = self.request.query_params
+        if 'carro' in params:
+            try:
+                carro = get_object_or_404(Carro.objects.only('marca', 'modelo', 'año'), pk=int(params['carro']))
+            except ValueError:
+                raise serializers.ValidationError({'carro': 'Debe ser un número'})
+            marca, modelo, anio = carro.marca, carro.modelo, carro.año
+        elif params.get('marca'):
+            marca, modelo = params['marca'], params.get('modelo')
+            try:
+                anio = int(params['anio']) if params.get('anio') else None
+            except ValueError:
+                raise serializers.ValidationError({'anio': 'Debe ser un número'})
+        else:
+            raise serializers.ValidationError('Indique ?carro=<id> o ?marca=&modelo=&anio=')
+        return optimizar_queryset(piezas_compatibles(Pieza.objects.all(), marca, modelo, anio), self.serializer_class)
+
+class PiezaComentarioList(CacheVersionadaMixin, ConsultaOptimizadaMixin, generics.ListAPIView):
+    """Comentarios de una pieza, paginados."""
+    modelos_cache = (ComentarioPieza, Usuario, Pieza)
+    queryset = ComentarioPieza.objects.all()
+    serializer_class = ComentarioPiezaSerializer
+    pagination_class = PaginacionCursor
+
+    def get_queryset(self):
+        if not Pieza.objects.filter(pk=self.kwargs['id']).exists():
+            raise NotFound()
+        return super().get_queryset().filter(pieza_id=self.kwargs['id'])
+
+class ComentarioPiezaList(ConsultaOptimizadaMixin, generics.ListAPIView):
     queryset = ComentarioPieza.objects.all()
     serializer_class = ComentarioPiezaSerializer
+    pagination_class = PaginacionCursor
 
-class ComentarioPiezaDetail(generics.RetrieveAPIView):
+class ComentarioPiezaDetail(ConsultaOptimizadaMixin, generics.RetrieveAPIView):
     queryset = ComentarioPieza.objects.all()
     serializer_class = ComentarioPiezaSerializer
     lookup_field = 'id'
@@ -3,24 +3,27 @@ from django.utils.html import format_html
 from django.utils import timezone
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from car_dealership.estados import TransicionesAdminMixin
+from car_dealership.imagenes import url_variante
+from . import estados, planificacion
 from .models import Servicio, Reparacion, DetalleReparacion, HistorialEstadoReparacion
 
 @admin.register(Servicio)
 class ServicioAdmin(admin.ModelAdmin):
-    list_display = ('nombre', 'precio', 'duracion_estimada', 'imagen_miniatura')
-    list_filter = ('precio',)
+    list_display = ('nombre', 'precio', 'duracion_estimada', 'especialidad', 'imagen_miniatura')
+    list_filter = ('precio', 'especialidad')
     search_fields = ('nombre', 'descripcion')
     readonly_fields = ('fecha_creacion', 'imagen_preview')
     
     def imagen_miniatura(self, obj):
         if obj.imagen:
-            return format_html('<img src="{}" style="max-height: 50px;" />', obj.imagen.url)
+            return format_html('<img src="{}" style="max-height: 50px;" />', url_variante(obj, 'imagen'))
         return "Sin imagen"
     imagen_miniatura.short_description = 'Imagen'
     
     def imagen_preview(self, obj):
         if obj.imagen:
-            return format_html('<img src="{}" style="max-width: 300px; max-height: 300px;" />', obj.imagen.url)
+            return format_html('<img src="{}" style="max-width: 300px; max-height: 300px;" />', url_variante(obj, 'imagen', 'tarjeta'))
         return "Sin imagen"
     imagen_preview.short_description = 'Vista previa'
 
@@ -46,12 +49,14 @@ class HistorialEstadoReparacionInline(admin.TabularInline):
         return False
 
 @admin.register(Reparacion)
-class ReparacionAdmin(admin.ModelAdmin):
+class ReparacionAdmin(TransicionesAdminMixin, admin.ModelAdmin):
+    maquina = estados.maquina
     list_display = ('id', 'cliente', 'vehiculo', 'estado', 'fecha_ingreso', 'costo_total_formateado')
     list_filter = ('estado', 'fecha_ingreso', 'tecnico_asignado')
     search_fields = ('cliente__usuario__username', 'vehiculo__marca', 'vehiculo__modelo', 'descripcion_problema')
     readonly_fields = ('fecha_ingreso', 'costo_total', 'historial_estados')
     inlines = [DetalleReparacionInline, HistorialEstadoReparacionInline]
+    actions = ['asignar_tecnicos']
     
     fieldsets = (
         ('Información General', {
@@ -61,7 +66,7 @@ class ReparacionAdmin(admin.ModelAdmin):
             'fields': ('descripcion_problema', 'descripcion_solucion', 'costo_total')
         }),
         ('Fechas', {
-            'fields': ('fecha_ingreso', 'fecha_entrega'),
+            'fields': ('fecha_ingreso', 'fecha_entrega', 'inicio_programado', 'fin_programado'),
             'classes': ('collapse',)
         }),
     )
@@ -72,17 +77,11 @@ class ReparacionAdmin(admin.ModelAdmin):
         return "Pendiente"
     costo_total_formateado.short_description = 'Costo Total'
     
-    def save_model(self, request, obj, form, change):
-        if change and 'estado' in form.changed_data:
-            # Registrar el cambio de estado en el historial
-            HistorialEstadoReparacion.objects.create(
-                reparacion=obj,
-                estado_anterior=form.initial.get('estado', 'N/A'),
-                estado_nuevo=obj.estado,
-                usuario=request.user,
-                notas=f'Cambio de estado realizado desde el panel de administración'
-            )
-        super().save_model(request, obj, form, change)
+    def asignar_tecnicos(self, request, queryset):
+        ids = list(queryset.order_by('fecha_ingreso', 'pk').values_list('pk', flat=True))
+        propuestas = planificacion.asignar(ids)
+        self.message_user(request, f'{len(propuestas)} reparaciones asignadas automáticamente')
+    asignar_tecnicos.short_description = 'Asignar técnico y franja automáticamente'
     
     def historial_estados(self, obj):
         historial = obj.historial_estados.all().order_by('-fecha_cambio')
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class ReparacionesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reparaciones'
+
+    def ready(self):
+        from car_dealership.cache_respuestas import invalidar_al_cambiar
+        from car_dealership.imagenes import registrar_variantes
+        from . import signals  # noqa: F401
+
+        registrar_variantes(self.get_model('Servicio'), 'imagen')
+        invalidar_al_cambiar(self.get_model('Servicio'))
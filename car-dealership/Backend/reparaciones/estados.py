@@ -0,0 +1,22 @@
+"""Estados de una reparación, lo que se escribe al entrar en ellos y el archivo de su historial."""
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+from car_dealership.estados import MaquinaEstados
+from car_dealership.historial import ArchivoHistorial
+from .models import HistorialEstadoReparacion, HistorialEstadoReparacionArchivado, Reparacion
+
+TRANSICIONES = {
+    'PENDIENTE': ('EN_PROCESO', 'CANCELADO'),
+    'EN_PROCESO': ('PENDIENTE', 'COMPLETADO', 'CANCELADO'),
+}
+
+maquina = MaquinaEstados(
+    Reparacion, TRANSICIONES, HistorialEstadoReparacion, 'reparacion',
+    al_entrar={
+        # Se respeta la fecha de entrega que ya se hubiera acordado
+        'COMPLETADO': lambda ahora: {'fecha_entrega': Coalesce(F('fecha_entrega'), ahora)},
+    },
+)
+
+archivo = ArchivoHistorial(HistorialEstadoReparacion, HistorialEstadoReparacionArchivado, 'reparacion')
@@ -0,0 +1,39 @@
+import time
+from collections import Counter
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from reparaciones.planificacion import rebalancear
+
+
+class Command(BaseCommand):
+    help = 'Reparte de nuevo las reparaciones pendientes entre los técnicos según especialidad y carga'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', help='Fecha/hora ISO desde la que planificar (por defecto, ahora)')
+        parser.add_argument('--simular', action='store_true', help='Muestra el reparto sin guardarlo')
+
+    def handle(self, *args, **options):
+        desde = None
+        if options['desde']:
+            try:
+                desde = datetime.fromisoformat(options['desde'])
+            except ValueError:
+                raise CommandError('--desde debe ser una fecha ISO (AAAA-MM-DD o AAAA-MM-DDTHH:MM)')
+            if timezone.is_naive(desde):
+                desde = timezone.make_aware(desde)
+
+        inicio = time.perf_counter()
+        propuestas = rebalancear(desde, options['simular'])
+        duracion = (time.perf_counter() - inicio) * 1000
+
+        por_tecnico = Counter(propuesta.empleado_id for propuesta in propuestas)
+        for empleado_id, cantidad in sorted(por_tecnico.items()):
+            self.stdout.write(f'  empleado {empleado_id:<8} {cantidad:>6} reparaciones')
+        if propuestas:
+            ultima = max(propuesta.fin for propuesta in propuestas)
+            self.stdout.write(f'  la última termina el {timezone.localtime(ultima):%Y-%m-%d %H:%M}')
+        accion = 'planificadas (simulación)' if options['simular'] else 'reasignadas'
+        self.stdout.write(self.style.SUCCESS(f'{len(propuestas)} reparaciones {accion} en {duracion:.0f} ms'))
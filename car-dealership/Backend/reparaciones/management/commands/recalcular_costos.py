@@ -0,0 +1,64 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Round
+
+from reparaciones.models import DetalleReparacion, Reparacion
+
+
+def costo_calculado():
+    """
+    Suma de los detalles de la reparación de la fila exterior, 0 si no tiene:
+    lo mismo que deja ``Reparacion.sumar_costos`` al borrar todos los detalles.
+    """
+    campo = DecimalField(max_digits=10, decimal_places=2)
+    return Coalesce(
+        Subquery(
+            DetalleReparacion.objects.filter(reparacion=OuterRef('pk'))
+            .order_by().values('reparacion').annotate(total=Sum('costo')).values('total'),
+            output_field=campo,
+        ),
+        Value(Decimal('0')),
+        output_field=campo,
+    )
+
+
+class Command(BaseCommand):
+    help = 'Recalcula Reparacion.costo_total a partir de los detalles con un solo UPDATE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', type=date.fromisoformat, help='Fecha de ingreso inicial (AAAA-MM-DD)')
+        parser.add_argument('--hasta', type=date.fromisoformat, help='Fecha de ingreso final, incluida')
+        parser.add_argument('--verificar', action='store_true', help='Solo cuenta los totales desfasados, sin corregirlos')
+
+    def handle(self, *args, **options):
+        desde, hasta = options['desde'], options['hasta']
+        if desde and hasta and desde > hasta:
+            raise CommandError('--desde no puede ser posterior a --hasta')
+        reparaciones = Reparacion.objects.all()
+        if desde:
+            reparaciones = reparaciones.filter(fecha_ingreso__date__gte=desde)
+        if hasta:
+            reparaciones = reparaciones.filter(fecha_ingreso__date__lte=hasta)
+
+        # Un total NULL (reparación que nunca tuvo detalles) equivale a 0; el
+        # redondeo evita diferencias de coma flotante (SQLite guarda los
+        # DecimalField como REAL)
+        desfasadas = (
+            reparaciones.annotate(
+                calculado=Round(costo_calculado(), 2),
+                actual=Round(Coalesce(F('costo_total'), Value(Decimal('0'))), 2),
+            )
+            .exclude(calculado=F('actual'))
+            .count()
+        )
+        if options['verificar']:
+            self.stdout.write(f'{desfasadas} reparaciones con costo_total desfasado')
+            return
+
+        actualizadas = reparaciones.update(costo_total=costo_calculado())
+        self.stdout.write(self.style.SUCCESS(
+            f'{actualizadas} reparaciones recalculadas ({desfasadas} tenían el total desfasado)'
+        ))
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reparaciones', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historialestadoreparacion',
+            index=models.Index(fields=['fecha_cambio', 'id'], name='hist_reparacion_cambio_idx'),
+        ),
+    ]
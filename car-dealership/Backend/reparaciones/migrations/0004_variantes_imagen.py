@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reparaciones', '0003_historialestadoreparacion_hist_reparacion_cambio_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicio',
+            name='imagen_variantes',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Variantes de imagen'),
+        ),
+    ]
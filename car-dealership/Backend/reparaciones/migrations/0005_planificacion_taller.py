@@ -0,0 +1,34 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('carros', '0005_variantes_imagen'),
+        ('reparaciones', '0004_variantes_imagen'),
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reparacion',
+            name='fin_programado',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Fin Programado'),
+        ),
+        migrations.AddField(
+            model_name='reparacion',
+            name='inicio_programado',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Inicio Programado'),
+        ),
+        migrations.AddField(
+            model_name='servicio',
+            name='especialidad',
+            field=models.CharField(blank=True, default='', max_length=100, verbose_name='Especialidad'),
+        ),
+        migrations.AddIndex(
+            model_name='reparacion',
+            index=models.Index(fields=['estado', 'tecnico_asignado'], name='reparacion_estado_tecnico_idx'),
+        ),
+    ]
@@ -1,4 +1,9 @@
-from django.db import models
+from contextvars import ContextVar
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import Case, F, Sum, Value, When
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 from carros.models import Carro
 from usuarios.models import Cliente, Empleado
@@ -8,7 +13,10 @@ class Servicio(models.Model):
     descripcion = models.TextField(_('Descripción'))
     precio = models.DecimalField(_('Precio'), max_digits=10, decimal_places=2)
     duracion_estimada = models.DurationField(_('Duración Estimada'))
+    # Especialidad de técnico (Empleado.especialidad) que requiere; vacío: cualquiera
+    especialidad = models.CharField(_('Especialidad'), max_length=100, blank=True, default='')
     imagen = models.ImageField(_('Imagen'), upload_to='servicios/', blank=True, null=True)
+    imagen_variantes = models.JSONField(_('Variantes de imagen'), default=dict, blank=True, editable=False)
     fecha_creacion = models.DateTimeField(_('Fecha de Creación'), auto_now_add=True)
 
     class Meta:
@@ -55,15 +63,110 @@ class Reparacion(models.Model):
         blank=True,
         verbose_name=_('Técnico Asignado')
     )
+    # Franja reservada en la agenda del técnico (reparaciones/planificacion.py)
+    inicio_programado = models.DateTimeField(_('Inicio Programado'), null=True, blank=True)
+    fin_programado = models.DateTimeField(_('Fin Programado'), null=True, blank=True)
 
     class Meta:
         verbose_name = _('Reparación')
         verbose_name_plural = _('Reparaciones')
         ordering = ['-fecha_ingreso']
+        indexes = [
+            # Carga de los técnicos: reparaciones abiertas por estado
+            models.Index(fields=['estado', 'tecnico_asignado'], name='reparacion_estado_tecnico_idx'),
+        ]
 
     def __str__(self):
         return f'Reparación #{self.id} - {self.vehiculo} - {self.get_estado_display()}'
 
+    def save(self, *args, **kwargs):
+        # costo_total lo mantienen los detalles con UPDATE atómicos (sumar_costos):
+        # al actualizar no se escribe el valor en memoria, que puede ser anterior
+        # a esos cambios, salvo que se pida en update_fields
+        if self._state.adding or kwargs.get('update_fields') is not None:
+            return super().save(*args, **kwargs)
+        deferidos = self.get_deferred_fields()
+        kwargs['update_fields'] = [
+            campo.name for campo in self._meta.concrete_fields
+            if not campo.primary_key and campo.name != 'costo_total' and campo.attname not in deferidos
+        ]
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=['costo_total'])
+
+    @classmethod
+    def sumar_costos(cls, deltas):
+        """
+        Suma a ``costo_total`` un delta por reparación (dict id -> Decimal) con
+        un UPDATE atómico en la base de datos, sin leer el total actual.
+        """
+        deltas = {pk: delta for pk, delta in deltas.items() if delta}
+        pks = list(deltas)
+        campo = cls._meta.get_field('costo_total')
+        for inicio in range(0, len(pks), TAMANO_LOTE_COSTOS):
+            lote = pks[inicio:inicio + TAMANO_LOTE_COSTOS]
+            if len(lote) == 1:
+                delta = Value(deltas[lote[0]], output_field=campo)
+            else:
+                delta = Case(*[When(pk=pk, then=Value(deltas[pk])) for pk in lote], output_field=campo)
+            cls.objects.filter(pk__in=lote).update(costo_total=Coalesce(F('costo_total'), Value(Decimal('0'))) + delta)
+
+# Reparaciones por UPDATE en sumar_costos (cada una usa dos parámetros)
+TAMANO_LOTE_COSTOS = 400
+
+# Activo mientras DetalleReparacionQuerySet.delete() descuenta los costos en bloque
+_descontando_en_bloque = ContextVar('descontando_en_bloque', default=False)
+
+
+def _costos_por_reparacion(queryset):
+    return dict(queryset.order_by().values('reparacion_id').annotate(total=Sum('costo')).values_list('reparacion_id', 'total'))
+
+
+class DetalleReparacionQuerySet(models.QuerySet):
+    """
+    Mantiene ``Reparacion.costo_total`` también en las operaciones masivas
+    (bulk_create, update y delete), agrupando los deltas por reparación.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            creados = super().bulk_create(objs, *args, **kwargs)
+            deltas = {}
+            for detalle in objs:
+                deltas[detalle.reparacion_id] = deltas.get(detalle.reparacion_id, 0) + detalle.costo
+            Reparacion.sumar_costos(deltas)
+        return creados
+
+    def update(self, **kwargs):
+        if not {'costo', 'reparacion', 'reparacion_id'} & set(kwargs):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            pks = list(self.select_for_update().values_list('pk', flat=True))
+            afectados = self.model._base_manager.using(self.db).filter(pk__in=pks)
+            antes = _costos_por_reparacion(afectados)
+            filas = super().update(**kwargs)
+            deltas = {pk: -total for pk, total in antes.items()}
+            for pk, total in _costos_por_reparacion(afectados).items():
+                deltas[pk] = deltas.get(pk, 0) + total
+            Reparacion.sumar_costos(deltas)
+        return filas
+
+    update.queryset_only = True
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            deltas = {pk: -total for pk, total in _costos_por_reparacion(self).items()}
+            token = _descontando_en_bloque.set(True)
+            try:
+                resultado = super().delete()
+            finally:
+                _descontando_en_bloque.reset(token)
+            Reparacion.sumar_costos(deltas)
+        return resultado
+
+    delete.queryset_only = True
+
+
 class DetalleReparacion(models.Model):
     reparacion = models.ForeignKey(
         Reparacion,
@@ -79,6 +182,8 @@ class DetalleReparacion(models.Model):
     fecha_ejecucion = models.DateTimeField(_('Fecha de Ejecución'), null=True, blank=True)
     notas = models.TextField(_('Notas'), blank=True, null=True)
 
+    objects = DetalleReparacionQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Detalle de Reparación')
         verbose_name_plural = _('Detalles de Reparación')
@@ -87,6 +192,25 @@ class DetalleReparacion(models.Model):
     def __str__(self):
         return f'Detalle de {self.reparacion} - {self.servicio}'
 
+    def save(self, *args, **kwargs):
+        # El detalle y el total de la reparación se guardan en la misma transacción
+        with transaction.atomic():
+            anterior = None
+            if self.pk:
+                anterior = (
+                    DetalleReparacion.objects.filter(pk=self.pk)
+                    .values_list('reparacion_id', 'costo')
+                    .first()
+                )
+            super().save(*args, **kwargs)
+
+            if anterior == (self.reparacion_id, self.costo):
+                return
+            deltas = {self.reparacion_id: self.costo}
+            if anterior:
+                deltas[anterior[0]] = deltas.get(anterior[0], 0) - anterior[1]
+            Reparacion.sumar_costos(deltas)
+
 class HistorialEstadoReparacion(models.Model):
     reparacion = models.ForeignKey(
         Reparacion,
@@ -108,6 +232,40 @@ class HistorialEstadoReparacion(models.Model):
         verbose_name = _('Historial de Estado de Reparación')
         verbose_name_plural = _('Historial de Estados de Reparaciones')
         ordering = ['-fecha_cambio']
+        indexes = [
+            models.Index(fields=['fecha_cambio', 'id'], name='hist_reparacion_cambio_idx'),
+        ]
 
     def __str__(self):
         return f'Cambio de estado en {self.reparacion} el {self.fecha_cambio}'
+
+class HistorialEstadoReparacionArchivado(models.Model):
+    # Filas de HistorialEstadoReparacion movidas por archivar_historial; conservan su id
+    id = models.BigIntegerField(primary_key=True)
+    reparacion = models.ForeignKey(
+        Reparacion,
+        on_delete=models.CASCADE,
+        related_name='historial_archivado',
+        db_index=False
+    )
+    estado_anterior = models.CharField(_('Estado Anterior'), max_length=20)
+    estado_nuevo = models.CharField(_('Estado Nuevo'), max_length=20)
+    fecha_cambio = models.DateTimeField(_('Fecha de Cambio'))
+    usuario = models.ForeignKey(
+        'usuarios.Usuario',
+        on_delete=models.SET_NULL,
+        null=True,
+        verbose_name=_('Usuario')
+    )
+    notas = models.TextField(_('Notas'), blank=True, null=True)
+
+    class Meta:
+        verbose_name = _('Historial Archivado de Reparación')
+        verbose_name_plural = _('Historial Archivado de Reparaciones')
+        ordering = ['-fecha_cambio']
+        indexes = [
+            models.Index(fields=['reparacion', 'fecha_cambio'], name='hist_rep_archivado_idx'),
+        ]
+
+    def __str__(self):
+        return f'Cambio de estado archivado en {self.reparacion_id} el {self.fecha_cambio}'
@@ -0,0 +1,217 @@
+"""
+Planificación del taller: qué técnico hace cada reparación y cuándo.
+
+La duración de una reparación es la suma de ``duracion_estimada`` de sus
+servicios, y las especialidades que requiere son las ``especialidad`` de esos
+servicios (se comparan con ``Empleado.especialidad`` sin tildes ni
+mayúsculas). Cada técnico tiene una agenda ``Intervalos`` en minutos
+laborables (``car_dealership.agenda.Jornada``) con las franjas de sus
+reparaciones abiertas; las que no tienen franja se encolan a partir de ahora
+por orden de ingreso.
+
+Para asignar se elige, entre los técnicos con alguna de las especialidades
+requeridas (o todos si no hay ninguno o la reparación no requiere ninguna),
+el que terminaría antes usando su primer hueco libre; a igualdad, el menos
+cargado.
+"""
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from car_dealership.agenda import Intervalos, Jornada
+from piezas.compatibilidad import normalizar
+from usuarios.models import Empleado
+from .models import DetalleReparacion, Reparacion
+
+ABIERTAS = ('PENDIENTE', 'EN_PROCESO')
+# Reparaciones sin servicios todavía
+DURACION_POR_DEFECTO = timedelta(hours=1)
+
+Propuesta = namedtuple('Propuesta', 'reparacion_id empleado_id inicio fin')
+
+
+def cargos_tecnicos():
+    return {normalizar(cargo) for cargo in getattr(settings, 'CARGOS_TECNICOS', ('Técnico', 'Mecánico'))}
+
+
+def requisitos(reparacion_ids, jornada):
+    """id -> (minutos laborables, especialidades) de cada reparación, con una sola consulta."""
+    resultado = {pk: [0, set()] for pk in reparacion_ids}
+    filas = DetalleReparacion.objects.filter(reparacion_id__in=resultado).values_list(
+        'reparacion_id', 'servicio__duracion_estimada', 'servicio__especialidad',
+    )
+    for reparacion_id, duracion, especialidad in filas:
+        resultado[reparacion_id][0] += jornada.duracion(duracion)
+        if especialidad:
+            resultado[reparacion_id][1].add(normalizar(especialidad))
+    por_defecto = jornada.duracion(DURACION_POR_DEFECTO)
+    return {pk: (minutos or por_defecto, frozenset(especialidades)) for pk, (minutos, especialidades) in resultado.items()}
+
+
+class Planificador:
+    """
+    Agendas de todos los técnicos a partir de ``desde`` (ahora por defecto).
+    Las reparaciones de ``excluir`` no cuentan como carga: son las que se van
+    a (re)planificar.
+    """
+
+    def __init__(self, desde=None, excluir=(), jornada=None):
+        self.jornada = jornada or Jornada()
+        self.desde = desde or timezone.now()
+        self.ahora = self.jornada.a_minutos(self.desde)
+        cargos = cargos_tecnicos()
+        self.tecnicos = {
+            pk: normalizar(especialidad or '')
+            for pk, cargo, especialidad in Empleado.objects.filter(usuario__is_active=True)
+            .order_by('pk').values_list('pk', 'cargo', 'especialidad')
+            if normalizar(cargo) in cargos
+        }
+        self.agendas = {pk: Intervalos() for pk in self.tecnicos}
+        self._cargar(set(excluir))
+
+    def _cargar(self, excluir):
+        abiertas = (
+            Reparacion.objects.filter(estado__in=ABIERTAS, tecnico_asignado__in=list(self.tecnicos))
+            .order_by('fecha_ingreso', 'pk')
+            .values_list('pk', 'tecnico_asignado_id', 'inicio_programado', 'fin_programado')
+        )
+        sin_franja = []
+        for pk, tecnico, inicio, fin in abiertas:
+            if pk in excluir:
+                continue
+            if inicio and fin and self.jornada.a_minutos(fin) > self.ahora:
+                self.agendas[tecnico].ocupar(self.jornada.a_minutos(inicio), self.jornada.a_minutos(fin))
+            else:
+                # Sin franja o vencida pero sin cerrar: sigue ocupando al técnico desde ahora
+                sin_franja.append((pk, tecnico))
+        duraciones = requisitos([pk for pk, _tecnico in sin_franja], self.jornada)
+        for pk, tecnico in sin_franja:
+            minutos = duraciones[pk][0]
+            inicio = self.agendas[tecnico].primer_hueco(self.ahora, minutos)
+            self.agendas[tecnico].ocupar(inicio, inicio + minutos)
+
+    def candidatos(self, especialidades):
+        if especialidades:
+            expertos = [pk for pk, especialidad in self.tecnicos.items() if especialidad in especialidades]
+            if expertos:
+                return expertos
+        return list(self.tecnicos)
+
+    def proponer(self, reparacion_id, minutos, especialidades, horizonte=None):
+        """Mejor ``Propuesta`` para una reparación, o None si no hay técnicos."""
+        opciones = []
+        for pk in self.candidatos(especialidades):
+            inicio = self.agendas[pk].primer_hueco(self.ahora, minutos)
+            opciones.append((inicio, pk))
+        if not opciones:
+            return None
+        inicio = min(opciones)[0]
+        empatados = [pk for candidato, pk in opciones if candidato == inicio]
+        if len(empatados) > 1:
+            # Solo se mide la carga para desempatar
+            horizonte = horizonte or self.ahora + self.jornada.semana
+            empatados.sort(key=lambda pk: (self.agendas[pk].ocupado(self.ahora, horizonte), pk))
+        return Propuesta(reparacion_id, empatados[0], inicio, inicio + minutos)
+
+    def reservar(self, propuesta):
+        self.agendas[propuesta.empleado_id].ocupar(propuesta.inicio, propuesta.fin)
+
+    def fechas(self, propuesta):
+        """La propuesta con fechas en lugar de minutos laborables."""
+        return propuesta._replace(
+            inicio=self.jornada.a_fecha(propuesta.inicio),
+            fin=self.jornada.a_fecha(propuesta.fin, fin=True),
+        )
+
+    def planificar(self, reparacion_ids):
+        """Propone técnico y franja para cada reparación, en el orden dado, reservando cada una."""
+        datos = requisitos(reparacion_ids, self.jornada)
+        propuestas = []
+        for pk in reparacion_ids:
+            propuesta = self.proponer(pk, *datos[pk])
+            if propuesta is not None:
+                self.reservar(propuesta)
+                propuestas.append(self.fechas(propuesta))
+        return propuestas
+
+    def carga(self, dias=7):
+        """Ocupación de cada técnico en los próximos ``dias`` naturales."""
+        hasta = self.jornada.a_minutos(self.desde + timedelta(days=dias))
+        capacidad = hasta - self.ahora
+        resultado = []
+        for pk, agenda in self.agendas.items():
+            ocupado = agenda.ocupado(self.ahora, hasta)
+            libre = agenda.primer_hueco(self.ahora, 1)
+            resultado.append({
+                'empleado': pk,
+                'especialidad': self.tecnicos[pk],
+                'minutos_ocupados': ocupado,
+                'minutos_disponibles': capacidad - ocupado,
+                'ocupacion': round(ocupado / capacidad, 3) if capacidad else 0,
+                'proximo_hueco': self.jornada.a_fecha(libre),
+            })
+        return resultado
+
+
+def _guardar(propuestas):
+    reparaciones = [
+        Reparacion(pk=p.reparacion_id, tecnico_asignado_id=p.empleado_id, inicio_programado=p.inicio, fin_programado=p.fin)
+        for p in propuestas
+    ]
+    Reparacion.objects.bulk_update(reparaciones, ['tecnico_asignado', 'inicio_programado', 'fin_programado'], batch_size=500)
+
+
+def _bloquear_tecnicos():
+    # Serializa a los planificadores concurrentes: cada uno lee las agendas
+    # con las filas de los empleados bloqueadas (en SQLite ya lo hace BEGIN IMMEDIATE)
+    list(Empleado.objects.select_for_update().order_by('pk').values_list('pk', flat=True))
+
+
+def _no_antes_de_ahora(desde):
+    # Nunca se reservan franjas que ya pasaron
+    ahora = timezone.now()
+    return max(desde or ahora, ahora)
+
+
+def asignar(reparacion_ids, desde=None, simular=False):
+    """Asigna técnico y franja a las reparaciones dadas (en ese orden), desde ``desde`` o ahora si es anterior."""
+    desde = _no_antes_de_ahora(desde)
+    with transaction.atomic():
+        _bloquear_tecnicos()
+        ids = list(
+            Reparacion.objects.select_for_update()
+            .filter(pk__in=reparacion_ids, estado__in=ABIERTAS)
+            .values_list('pk', flat=True)
+        )
+        orden = {pk: i for i, pk in enumerate(reparacion_ids)}
+        ids.sort(key=orden.__getitem__)
+        planificador = Planificador(desde, excluir=ids)
+        propuestas = planificador.planificar(ids)
+        if not simular:
+            _guardar(propuestas)
+    return propuestas
+
+
+def rebalancear(desde=None, simular=False):
+    """
+    Vuelve a repartir todas las reparaciones pendientes por orden de ingreso.
+    Las que están en proceso conservan su técnico y su franja. Como en
+    ``asignar``, ``desde`` nunca es anterior a ahora.
+    """
+    desde = _no_antes_de_ahora(desde)
+    with transaction.atomic():
+        _bloquear_tecnicos()
+        ids = list(
+            Reparacion.objects.select_for_update()
+            .filter(estado='PENDIENTE')
+            .order_by('fecha_ingreso', 'pk')
+            .values_list('pk', flat=True)
+        )
+        planificador = Planificador(desde, excluir=ids)
+        propuestas = planificador.planificar(ids)
+        if not simular:
+            _guardar(propuestas)
+    return propuestas
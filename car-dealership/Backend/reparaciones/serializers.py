@@ -1,4 +1,7 @@
 from rest_framework import serializers
+from car_dealership.campos import CamposDinamicosMixin
+from car_dealership.historial import RecientesListSerializer
+from car_dealership.imagenes import VariantesImagenField
 from .models import Servicio, Reparacion, DetalleReparacion, HistorialEstadoReparacion
 from carros.models import Carro
 from carros.serializers import CarroSerializer
@@ -6,6 +9,8 @@ from usuarios.models import Cliente, Usuario
 from usuarios.serializers import ClienteSerializer, EmpleadoSerializer
 
 class ServicioSerializer(serializers.ModelSerializer):
+    imagen_variantes = VariantesImagenField()
+
     class Meta:
         model = Servicio
         fields = [
@@ -14,7 +19,9 @@ class ServicioSerializer(serializers.ModelSerializer):
             'descripcion',
             'precio',
             'duracion_estimada',
+            'especialidad',
             'imagen',
+            'imagen_variantes',
             'fecha_creacion'
         ]
         read_only_fields = ['id', 'fecha_creacion']
@@ -70,7 +77,7 @@ class HistorialEstadoReparacionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'fecha_cambio']
 
-class ReparacionSerializer(serializers.ModelSerializer):
+class ReparacionSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     vehiculo_detalle = CarroSerializer(read_only=True, source='vehiculo')
     vehiculo_id = serializers.PrimaryKeyRelatedField(
         queryset=Carro.objects.all(),
@@ -83,8 +90,10 @@ class ReparacionSerializer(serializers.ModelSerializer):
         write_only=True,
         source='cliente'
     )
-    detalles = DetalleReparacionSerializer(many=True, read_only=True)
-    historial_estados = HistorialEstadoReparacionSerializer(many=True, read_only=True)
+    detalles = DetalleReparacionSerializer(many=True, read_only=True, source='detallereparacion_set')
+    # Solo los cambios más recientes; el historial completo está en <id>/historial/
+    historial_estados = RecientesListSerializer(child=HistorialEstadoReparacionSerializer(), read_only=True)
+    tecnico_asignado_detalle = EmpleadoSerializer(read_only=True, source='tecnico_asignado')
 
     class Meta:
         model = Reparacion
@@ -106,12 +115,16 @@ class ReparacionSerializer(serializers.ModelSerializer):
             'descripcion_solucion',
             'costo_total',
             'tecnico_asignado',
-            'tecnico_asignado_detalle'
+            'tecnico_asignado_detalle',
+            'inicio_programado',
+            'fin_programado'
         ]
         read_only_fields = [
             'id',
             'fecha_ingreso',
             'fecha_entrega',
             'costo_total',
-            'tecnico_asignado_detalle'
+            'tecnico_asignado_detalle',
+            'inicio_programado',
+            'fin_programado'
         ]
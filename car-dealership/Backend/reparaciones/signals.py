@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import DetalleReparacion, Reparacion, _descontando_en_bloque
+
+
+@receiver(post_delete, sender=DetalleReparacion)
+def descontar_costo(sender, instance, **kwargs):
+    # DetalleReparacionQuerySet.delete() ya descuenta en bloque; aquí llegan
+    # los borrados individuales y en cascada (p. ej. al borrar un Servicio)
+    if not _descontando_en_bloque.get():
+        Reparacion.sumar_costos({instance.reparacion_id: -instance.costo})
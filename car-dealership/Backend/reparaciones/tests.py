@@ -1,3 +1,187 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from carros.models import Carro
+from usuarios.models import Cliente, Empleado, Usuario
+from .models import DetalleReparacion, Reparacion, Servicio
+
+
+class CostoTotalTests(TestCase):
+    """``costo_total`` sigue a los detalles en todas las formas de escribirlos."""
+
+    @classmethod
+    def setUpTestData(cls):
+        usuario = Usuario.objects.create_user(email='costos@ejemplo.com', username='costos', password='clave')
+        cls.cliente = Cliente.objects.create(usuario=usuario)
+        cls.carro = Carro.objects.create(
+            marca='Toyota', modelo='Corolla', año=2015, precio=Decimal('15000'), kilometraje=1000,
+            transmision='manual', combustible='gasolina', estado='usado', descripcion='d',
+            imagen_principal='carros/x.png',
+        )
+        cls.aceite = Servicio.objects.create(
+            nombre='Aceite', descripcion='d', precio=Decimal('40'), duracion_estimada=timedelta(hours=1),
+        )
+        cls.frenos = Servicio.objects.create(
+            nombre='Frenos', descripcion='d', precio=Decimal('100'), duracion_estimada=timedelta(hours=2),
+        )
+
+    def setUp(self):
+        self.reparacion = self._reparacion()
+
+    def _reparacion(self):
+        return Reparacion.objects.create(cliente=self.cliente, vehiculo=self.carro, descripcion_problema='ruido')
+
+    def _detalle(self, servicio, costo, reparacion=None):
+        return DetalleReparacion.objects.create(
+            reparacion=reparacion or self.reparacion, servicio=servicio, costo=Decimal(costo),
+        )
+
+    def assertTotal(self, esperado, reparacion=None):
+        reparacion = reparacion or self.reparacion
+        reparacion.refresh_from_db(fields=['costo_total'])
+        self.assertEqual(reparacion.costo_total, Decimal(esperado))
+
+    def assertSinDesfase(self):
+        salida = StringIO()
+        call_command('recalcular_costos', verificar=True, stdout=salida)
+        self.assertTrue(salida.getvalue().startswith('0 '), salida.getvalue())
+
+    def test_crear_modificar_y_borrar_detalle(self):
+        detalle = self._detalle(self.aceite, '40')
+        self._detalle(self.frenos, '100')
+        self.assertTotal('140')
+        detalle.costo = Decimal('55')
+        detalle.save()
+        self.assertTotal('155')
+        detalle.delete()
+        self.assertTotal('100')
+        self.assertSinDesfase()
+
+    def test_mover_detalle_a_otra_reparacion(self):
+        otra = self._reparacion()
+        detalle = self._detalle(self.aceite, '40')
+        detalle.reparacion = otra
+        detalle.save()
+        self.assertTotal('0')
+        self.assertTotal('40', otra)
+
+    def test_bulk_create(self):
+        otra = self._reparacion()
+        DetalleReparacion.objects.bulk_create([
+            DetalleReparacion(reparacion=self.reparacion, servicio=self.aceite, costo=Decimal('40')),
+            DetalleReparacion(reparacion=self.reparacion, servicio=self.frenos, costo=Decimal('100')),
+            DetalleReparacion(reparacion=otra, servicio=self.frenos, costo=Decimal('90')),
+        ])
+        self.assertTotal('140')
+        self.assertTotal('90', otra)
+        self.assertSinDesfase()
+
+    def test_update_del_queryset(self):
+        otra = self._reparacion()
+        self._detalle(self.aceite, '40')
+        self._detalle(self.frenos, '100')
+        DetalleReparacion.objects.filter(servicio=self.frenos).update(costo=Decimal('120'))
+        self.assertTotal('160')
+        DetalleReparacion.objects.filter(servicio=self.aceite).update(reparacion=otra)
+        self.assertTotal('120')
+        self.assertTotal('40', otra)
+        self.assertSinDesfase()
+
+    def test_delete_del_queryset(self):
+        self._detalle(self.aceite, '40')
+        self._detalle(self.frenos, '100')
+        DetalleReparacion.objects.filter(servicio=self.aceite).delete()
+        self.assertTotal('100')
+        DetalleReparacion.objects.all().delete()
+        self.assertTotal('0')
+        self.assertSinDesfase()
+
+    def test_borrado_en_cascada(self):
+        self._detalle(self.aceite, '40')
+        self._detalle(self.frenos, '100')
+        self.frenos.delete()
+        self.assertTotal('40')
+        self.assertSinDesfase()
+
+    def test_guardar_instancia_cargada_antes_no_pierde_deltas(self):
+        cargada = Reparacion.objects.get(pk=self.reparacion.pk)
+        self._detalle(self.aceite, '40')
+        cargada.descripcion_solucion = 'cambio de aceite'
+        cargada.save()
+        self.assertEqual(cargada.costo_total, Decimal('40'))
+        self.assertTotal('40')
+        self.assertEqual(Reparacion.objects.get(pk=cargada.pk).descripcion_solucion, 'cambio de aceite')
+        self.assertSinDesfase()
+
+    def test_costo_total_explicito(self):
+        self._detalle(self.aceite, '40')
+        self.reparacion.costo_total = Decimal('10')
+        self.reparacion.save(update_fields=['costo_total'])
+        self.assertTotal('10')
+
+
+class PlanificacionTests(APITestCase):
+    """Las reparaciones nunca se programan en franjas que ya pasaron."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Usuario.objects.create_superuser(email='taller@ejemplo.com', username='taller', password='clave')
+        cliente = Cliente.objects.create(usuario=cls.admin)
+        tecnico = Usuario.objects.create_user(email='tecnico@ejemplo.com', username='tecnico', password='clave')
+        Empleado.objects.create(usuario=tecnico, cargo='Técnico', fecha_contratacion=date(2020, 1, 1))
+        carro = Carro.objects.create(
+            marca='Ford', modelo='Focus', año=2016, precio=Decimal('12000'), kilometraje=1000,
+            transmision='manual', combustible='gasolina', estado='usado', descripcion='d',
+            imagen_principal='carros/x.png',
+        )
+        cls.reparaciones = [
+            Reparacion.objects.create(cliente=cliente, vehiculo=carro, descripcion_problema='ruido') for _ in range(2)
+        ]
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def assertNoEnElPasado(self):
+        for reparacion in Reparacion.objects.all():
+            self.assertIsNotNone(reparacion.inicio_programado)
+            self.assertGreaterEqual(reparacion.inicio_programado, reparacion.fecha_ingreso)
+            self.assertGreaterEqual(reparacion.inicio_programado, timezone.now() - timedelta(minutes=1))
+
+    def test_comando_con_desde_pasado(self):
+        call_command('rebalancear_taller', desde='2020-01-01', stdout=StringIO())
+        self.assertNoEnElPasado()
+
+    def test_api_con_desde_pasado(self):
+        response = self.client.post('/api/reparaciones/taller/rebalancear/', {'desde': '2020-01-01T09:00'}, format='json', secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['asignadas'], 2)
+        self.assertNoEnElPasado()
+
+    def test_parametros_no_validos(self):
+        reparacion = self.reparaciones[0]
+        casos = [
+            (f'/api/reparaciones/{reparacion.pk}/asignar/', {'desde': 'mañana'}),
+            (f'/api/reparaciones/{reparacion.pk}/asignar/', {'simular': 'quizá'}),
+            ('/api/reparaciones/taller/rebalancear/', {'desde': '2026-13-01'}),
+        ]
+        for url, datos in casos:
+            with self.subTest(url=url, datos=datos):
+                response = self.client.post(url, datos, format='json', secure=True)
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get('/api/reparaciones/taller/carga/?desde=ayer', secure=True).status_code, 400)
+        self.assertFalse(Reparacion.objects.filter(tecnico_asignado__isnull=False).exists())
 
-# Create your tests here.
+    def test_simular_false_guarda(self):
+        reparacion = self.reparaciones[0]
+        response = self.client.post(
+            f'/api/reparaciones/{reparacion.pk}/asignar/', {'simular': 'false'}, format='json', secure=True,
+        )
+        self.assertEqual(response.status_code, 200)
+        reparacion.refresh_from_db()
+        self.assertIsNotNone(reparacion.tecnico_asignado_id)
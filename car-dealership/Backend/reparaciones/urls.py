@@ -3,7 +3,9 @@ from .views import (
     ServicioList, ServicioDetail,
     ReparacionList, ReparacionDetail,
     DetalleReparacionList, DetalleReparacionDetail,
-    HistorialEstadoReparacionList, HistorialEstadoReparacionDetail
+    HistorialEstadoReparacionList, HistorialEstadoReparacionDetail,
+    AsignarTecnicoView, CargaTallerView, RebalancearTallerView,
+    TransicionReparacionView, HistorialReparacionView
 )
 
 urlpatterns = [
@@ -14,6 +16,14 @@ urlpatterns = [
     # Reparaciones
     path('', ReparacionList.as_view(), name='reparacion-list'),
     path('<int:id>/', ReparacionDetail.as_view(), name='reparacion-detail'),
+    path('<int:id>/asignar/', AsignarTecnicoView.as_view(), name='reparacion-asignar'),
+    path('<int:id>/estado/', TransicionReparacionView.as_view(), name='reparacion-estado'),
+    path('estado/', TransicionReparacionView.as_view(), name='reparacion-estado-lote'),
+    path('<int:id>/historial/', HistorialReparacionView.as_view(), name='reparacion-historial'),
+
+    # Planificación del taller
+    path('taller/carga/', CargaTallerView.as_view(), name='taller-carga'),
+    path('taller/rebalancear/', RebalancearTallerView.as_view(), name='taller-rebalancear'),
     
     # Detalles de Reparación
     path('detalles/', DetalleReparacionList.as_view(), name='detalle-list'),
@@ -1,42 +1,131 @@
-from rest_framework import generics
+from datetime import datetime
+
+from django.utils import timezone
+from rest_framework import generics, serializers, status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from car_dealership.cache_respuestas import CacheVersionadaMixin
+from car_dealership.estados import TransicionView
+from car_dealership.historial import HistorialCompletoView
+from car_dealership.paginacion import PaginacionCursor
+from car_dealership.optimizacion import ConsultaOptimizadaMixin
+from . import estados, planificacion
 from .models import Servicio, Reparacion, DetalleReparacion, HistorialEstadoReparacion
 from .serializers import (
     ServicioSerializer, ReparacionSerializer,
     DetalleReparacionSerializer, HistorialEstadoReparacionSerializer
 )
 
-class ServicioList(generics.ListAPIView):
+class ServicioList(CacheVersionadaMixin, ConsultaOptimizadaMixin, generics.ListAPIView):
     queryset = Servicio.objects.all()
     serializer_class = ServicioSerializer
 
-class ServicioDetail(generics.RetrieveAPIView):
+class ServicioDetail(ConsultaOptimizadaMixin, generics.RetrieveAPIView):
     queryset = Servicio.objects.all()
     serializer_class = ServicioSerializer
     lookup_field = 'id'
 
-class ReparacionList(generics.ListAPIView):
+class ReparacionList(ConsultaOptimizadaMixin, generics.ListAPIView):
     queryset = Reparacion.objects.all()
     serializer_class = ReparacionSerializer
 
-class ReparacionDetail(generics.RetrieveAPIView):
+class ReparacionDetail(ConsultaOptimizadaMixin, generics.RetrieveAPIView):
     queryset = Reparacion.objects.all()
     serializer_class = ReparacionSerializer
     lookup_field = 'id'
 
-class DetalleReparacionList(generics.ListAPIView):
+class DetalleReparacionList(ConsultaOptimizadaMixin, generics.ListAPIView):
     queryset = DetalleReparacion.objects.all()
     serializer_class = DetalleReparacionSerializer
 
-class DetalleReparacionDetail(generics.RetrieveAPIView):
+class DetalleReparacionDetail(ConsultaOptimizadaMixin, generics.RetrieveAPIView):
     queryset = DetalleReparacion.objects.all()
     serializer_class = DetalleReparacionSerializer
     lookup_field = 'id'
 
-class HistorialEstadoReparacionList(generics.ListAPIView):
+class HistorialEstadoReparacionList(ConsultaOptimizadaMixin, generics.ListAPIView):
     queryset = HistorialEstadoReparacion.objects.all()
     serializer_class = HistorialEstadoReparacionSerializer
+    pagination_class = PaginacionCursor
 
-class HistorialEstadoReparacionDetail(generics.RetrieveAPIView):
+class HistorialEstadoReparacionDetail(ConsultaOptimizadaMixin, generics.RetrieveAPIView):
     queryset = HistorialEstadoReparacion.objects.all()
     serializer_class = HistorialEstadoReparacionSerializer
     lookup_field = 'id'
+
+class HistorialReparacionView(HistorialCompletoView):
+    archivo = estados.archivo
+
+class TransicionReparacionView(TransicionView):
+    maquina = estados.maquina
+    serializer_class = ReparacionSerializer
+
+def _propuestas(propuestas):
+    return [propuesta._asdict() for propuesta in propuestas]
+
+def _desde(valor):
+    """Fecha ISO opcional de ``desde``; None si no viene. Responde 400 si no es válida."""
+    if not valor:
+        return None
+    try:
+        fecha = datetime.fromisoformat(valor)
+    except (TypeError, ValueError):
+        raise serializers.ValidationError({'desde': 'Debe ser una fecha ISO (AAAA-MM-DD o AAAA-MM-DDTHH:MM)'})
+    return fecha if timezone.is_aware(fecha) else timezone.make_aware(fecha)
+
+def _simular(valor):
+    """``simular`` como booleano de DRF ("false", "0"... son falsos); None si no es válido."""
+    if valor is None:
+        return False
+    try:
+        return serializers.BooleanField().to_internal_value(valor)
+    except serializers.ValidationError:
+        return None
+
+def _simular_no_valido():
+    return Response({'error': 'simular debe ser un booleano'}, status=status.HTTP_400_BAD_REQUEST)
+
+class CargaTallerView(APIView):
+    """Ocupación de cada técnico en los próximos ``?dias=`` (7 por defecto) y su próximo hueco."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            dias = min(60, max(1, int(request.query_params.get('dias', 7))))
+        except ValueError:
+            dias = 7
+        planificador = planificacion.Planificador(_desde(request.query_params.get('desde')))
+        return Response({'desde': planificador.desde, 'dias': dias, 'tecnicos': planificador.carga(dias)})
+
+class AsignarTecnicoView(APIView):
+    """
+    Asigna a la reparación el técnico que la terminaría antes y reserva su
+    franja. Con ``simular`` solo devuelve la propuesta.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, id):
+        if not Reparacion.objects.filter(pk=id).exists():
+            return Response({'error': 'Reparación no encontrada'}, status=status.HTTP_404_NOT_FOUND)
+        simular = _simular(request.data.get('simular'))
+        if simular is None:
+            return _simular_no_valido()
+        propuestas = planificacion.asignar([id], _desde(request.data.get('desde')), simular)
+        if not propuestas:
+            return Response(
+                {'error': 'La reparación no está abierta o no hay técnicos disponibles'},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(_propuestas(propuestas)[0])
+
+class RebalancearTallerView(APIView):
+    """Reparte de nuevo todas las reparaciones pendientes entre los técnicos."""
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        simular = _simular(request.data.get('simular'))
+        if simular is None:
+            return _simular_no_valido()
+        propuestas = planificacion.rebalancear(_desde(request.data.get('desde')), simular)
+        return Response({'asignadas': len(propuestas), 'propuestas': _propuestas(propuestas)})
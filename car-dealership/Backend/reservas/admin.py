@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import Reserva
+
+@admin.register(Reserva)
+class ReservaAdmin(admin.ModelAdmin):
+    list_display = ('codigo', 'articulo', 'cantidad', 'estado', 'usuario', 'fecha_creacion', 'expira_en')
+    list_filter = ('estado', 'fecha_creacion')
+    search_fields = ('codigo', 'pieza__nombre', 'accesorio__nombre', 'usuario__email')
+    list_select_related = ('pieza', 'accesorio', 'usuario')
+    readonly_fields = ('codigo', 'usuario', 'pieza', 'accesorio', 'cantidad', 'estado', 'fecha_creacion', 'expira_en')
+    
+    def has_add_permission(self, request):
+        # El stock solo se descuenta a través de reservas.servicios
+        return False
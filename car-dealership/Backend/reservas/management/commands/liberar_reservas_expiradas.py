@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reservas.servicios import liberar_expiradas
+
+
+class Command(BaseCommand):
+    help = 'Devuelve al stock las reservas activas que ya vencieron'
+
+    def handle(self, *args, **options):
+        liberadas = liberar_expiradas()
+        self.stdout.write(self.style.SUCCESS(f'{liberadas} reservas vencidas liberadas'))
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:03
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accesorios', '0002_accesorio_accesorio_creacion_idx'),
+        ('piezas', '0005_calificaciones_pieza'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reserva',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codigo', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, verbose_name='Código')),
+                ('cantidad', models.PositiveIntegerField(verbose_name='Cantidad')),
+                ('estado', models.CharField(choices=[('ACTIVA', 'Activa'), ('CONFIRMADA', 'Confirmada'), ('LIBERADA', 'Liberada'), ('EXPIRADA', 'Expirada')], default='ACTIVA', max_length=20, verbose_name='Estado')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')),
+                ('expira_en', models.DateTimeField(verbose_name='Expira en')),
+                ('accesorio', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='accesorios.accesorio', verbose_name='Accesorio')),
+                ('pieza', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='piezas.pieza', verbose_name='Pieza')),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Reserva de Stock',
+                'verbose_name_plural': 'Reservas de Stock',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(fields=['estado', 'expira_en'], name='reserva_estado_expira_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='reserva',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('accesorio__isnull', True), ('pieza__isnull', False)), models.Q(('accesorio__isnull', False), ('pieza__isnull', True)), _connector='OR'), name='reserva_un_solo_articulo'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+import uuid
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+class Reserva(models.Model):
+    ESTADOS = [
+        ('ACTIVA', _('Activa')),
+        ('CONFIRMADA', _('Confirmada')),
+        ('LIBERADA', _('Liberada')),
+        ('EXPIRADA', _('Expirada')),
+    ]
+
+    # Todas las reservas de una misma petición comparten el código
+    codigo = models.UUIDField(_('Código'), default=uuid.uuid4, db_index=True, editable=False)
+    usuario = models.ForeignKey(
+        'usuarios.Usuario',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name=_('Usuario')
+    )
+    pieza = models.ForeignKey(
+        'piezas.Pieza',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name=_('Pieza')
+    )
+    accesorio = models.ForeignKey(
+        'accesorios.Accesorio',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name=_('Accesorio')
+    )
+    cantidad = models.PositiveIntegerField(_('Cantidad'))
+    estado = models.CharField(_('Estado'), max_length=20, choices=ESTADOS, default='ACTIVA')
+    fecha_creacion = models.DateTimeField(_('Fecha de Creación'), auto_now_add=True)
+    expira_en = models.DateTimeField(_('Expira en'))
+
+    class Meta:
+        verbose_name = _('Reserva de Stock')
+        verbose_name_plural = _('Reservas de Stock')
+        ordering = ['-fecha_creacion']
+        indexes = [
+            # Búsqueda de reservas activas vencidas
+            models.Index(fields=['estado', 'expira_en'], name='reserva_estado_expira_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=(
+                    models.Q(pieza__isnull=False, accesorio__isnull=True)
+                    | models.Q(pieza__isnull=True, accesorio__isnull=False)
+                ),
+                name='reserva_un_solo_articulo',
+            ),
+        ]
+
+    def __str__(self):
+        return f'Reserva {self.codigo} - {self.articulo} x{self.cantidad} - {self.get_estado_display()}'
+
+    @property
+    def articulo(self):
+        return self.pieza if self.pieza_id else self.accesorio
@@ -0,0 +1,27 @@
+from rest_framework import serializers
+from .models import Reserva
+from .servicios import MODELOS
+
+class ItemReservaSerializer(serializers.Serializer):
+    tipo = serializers.ChoiceField(choices=list(MODELOS))
+    id = serializers.IntegerField(min_value=1)
+    cantidad = serializers.IntegerField(min_value=1)
+
+class ReservaLoteSerializer(serializers.Serializer):
+    items = ItemReservaSerializer(many=True, allow_empty=False, max_length=100)
+    ttl_minutos = serializers.IntegerField(min_value=1, max_value=120, required=False)
+
+class ReservaSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Reserva
+        fields = [
+            'id',
+            'codigo',
+            'pieza',
+            'accesorio',
+            'cantidad',
+            'estado',
+            'fecha_creacion',
+            'expira_en'
+        ]
+        read_only_fields = fields
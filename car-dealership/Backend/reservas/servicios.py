@@ -0,0 +1,145 @@
+"""
+Reserva de stock para Pieza y Accesorio.
+
+El stock se descuenta con un UPDATE condicional (``stock >= n``) sobre la fila
+del artículo, así que dos compras simultáneas nunca pueden dejarlo negativo y
+no hace falta bloquear la tabla. La reserva queda ACTIVA hasta que se confirma,
+se libera o vence; al liberarse o vencer el stock se devuelve.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accesorios.models import Accesorio
+from car_dealership.cache_respuestas import invalidar
+from piezas.models import Pieza
+from .models import Reserva
+
+MODELOS = {
+    'pieza': Pieza,
+    'accesorio': Accesorio,
+}
+
+
+class StockInsuficiente(Exception):
+    def __init__(self, faltantes):
+        self.faltantes = faltantes
+        super().__init__('Stock insuficiente')
+
+
+def ttl_por_defecto():
+    return timedelta(minutes=getattr(settings, 'RESERVAS_TTL_MINUTOS', 15))
+
+
+def descontar(tipo, pk, cantidad):
+    """Descuenta stock solo si alcanza. Devuelve True si se pudo."""
+    descontado = MODELOS[tipo].objects.filter(pk=pk, stock__gte=cantidad).update(
+        stock=F('stock') - cantidad, fecha_actualizacion=timezone.now()
+    ) == 1
+    if descontado:
+        invalidar(MODELOS[tipo])
+    return descontado
+
+
+def reponer(tipo, pk, cantidad):
+    # fecha_actualizacion también invalida los ETag del artículo
+    MODELOS[tipo].objects.filter(pk=pk).update(stock=F('stock') + cantidad, fecha_actualizacion=timezone.now())
+    invalidar(MODELOS[tipo])
+
+
+def _tipo(reserva):
+    return 'pieza' if reserva.pieza_id else 'accesorio'
+
+
+def _articulo_id(reserva):
+    return reserva.pieza_id or reserva.accesorio_id
+
+
+def _cerrar(reservas, estado):
+    """
+    Pasa reservas ACTIVAS a ``estado`` y devuelve su stock. Cada fila se cambia
+    con un UPDATE ... WHERE estado='ACTIVA', así que una reserva solo se
+    repone una vez aunque se libere y venza al mismo tiempo.
+    """
+    a_reponer = defaultdict(int)
+    cerradas = 0
+    for reserva in reservas:
+        if Reserva.objects.filter(pk=reserva.pk, estado='ACTIVA').update(estado=estado):
+            a_reponer[(_tipo(reserva), _articulo_id(reserva))] += reserva.cantidad
+            cerradas += 1
+    for (tipo, pk), cantidad in a_reponer.items():
+        reponer(tipo, pk, cantidad)
+    return cerradas
+
+
+@transaction.atomic
+def liberar_expiradas(ahora=None, **filtros):
+    ahora = ahora or timezone.now()
+    vencidas = Reserva.objects.filter(estado='ACTIVA', expira_en__lte=ahora, **filtros).only(
+        'id', 'pieza', 'accesorio', 'cantidad'
+    )
+    return _cerrar(vencidas, 'EXPIRADA')
+
+
+@transaction.atomic
+def reservar(items, usuario=None, ttl=None):
+    """
+    Reserva varios artículos en una sola transacción: o se reservan todos o
+    ninguno. ``items`` es una lista de (tipo, id, cantidad).
+    """
+    agrupados = defaultdict(int)
+    for tipo, pk, cantidad in items:
+        agrupados[(tipo, pk)] += cantidad
+
+    # Antes de descontar, devolver lo que tengan vencido esos mismos artículos
+    for tipo in MODELOS:
+        ids = [pk for (t, pk) in agrupados if t == tipo]
+        if ids:
+            liberar_expiradas(**{f'{tipo}_id__in': ids})
+
+    faltantes = []
+    # Orden fijo para que dos lotes concurrentes bloqueen las filas en el mismo orden
+    for (tipo, pk), cantidad in sorted(agrupados.items()):
+        if not descontar(tipo, pk, cantidad):
+            faltantes.append({'tipo': tipo, 'id': pk, 'cantidad': cantidad})
+    if faltantes:
+        # La excepción deshace también los descuentos que sí se aplicaron
+        raise StockInsuficiente(faltantes)
+
+    expira_en = timezone.now() + (ttl or ttl_por_defecto())
+    reservas = [
+        Reserva(usuario=usuario, cantidad=cantidad, expira_en=expira_en, **{f'{tipo}_id': pk})
+        for (tipo, pk), cantidad in sorted(agrupados.items())
+    ]
+    codigo = reservas[0].codigo
+    for reserva in reservas:
+        reserva.codigo = codigo
+    return Reserva.objects.bulk_create(reservas)
+
+
+def del_usuario(codigo, usuario=None):
+    """Reservas de ``codigo``; con ``usuario`` solo las suyas, salvo que sea staff."""
+    reservas = Reserva.objects.filter(codigo=codigo)
+    if usuario is not None and not usuario.is_staff:
+        reservas = reservas.filter(usuario=usuario)
+    return reservas
+
+
+@transaction.atomic
+def confirmar(codigo, usuario=None):
+    """El stock ya está descontado: solo se marca la reserva como definitiva."""
+    return del_usuario(codigo, usuario).filter(estado='ACTIVA', expira_en__gt=timezone.now()).update(
+        estado='CONFIRMADA'
+    )
+
+
+@transaction.atomic
+def liberar(codigo, usuario=None):
+    activas = del_usuario(codigo, usuario).filter(estado='ACTIVA').only(
+        'id', 'pieza', 'accesorio', 'cantidad'
+    )
+    return _cerrar(activas, 'LIBERADA')
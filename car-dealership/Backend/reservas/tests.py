@@ -0,0 +1,144 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accesorios.models import Accesorio, Categoria
+from car_dealership.estados import estado_cambiado
+from devoluciones.models import Devolucion
+from piezas.models import Pieza
+from usuarios.models import Cliente, Usuario
+from . import servicios
+from .models import Reserva
+
+
+class ReservasTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = Usuario.objects.create_user(email='compras@ejemplo.com', username='compras', password='clave')
+        cls.otro = Usuario.objects.create_user(email='otro@ejemplo.com', username='otro', password='clave')
+        cls.staff = Usuario.objects.create_user(
+            email='staff@ejemplo.com', username='staff', password='clave', is_staff=True,
+        )
+        cls.pieza = Pieza.objects.create(
+            nombre='Pastilla', descripcion='d', precio=Decimal('25'), stock=5, imagen='piezas/p.png', garantia=6,
+        )
+        cls.accesorio = Accesorio.objects.create(
+            categoria=Categoria.objects.create(nombre='Interior'), nombre='Alfombra', descripcion='d',
+            precio=Decimal('10'), stock=2, imagen='accesorios/a.png',
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.usuario)
+
+    def _reservar(self, *items, **extra):
+        return self.client.post('/api/reservas/', {
+            'items': [{'tipo': tipo, 'id': pk, 'cantidad': cantidad} for tipo, pk, cantidad in items], **extra,
+        }, format='json', secure=True)
+
+    def assertStock(self, pieza, accesorio):
+        self.pieza.refresh_from_db()
+        self.accesorio.refresh_from_db()
+        self.assertEqual((self.pieza.stock, self.accesorio.stock), (pieza, accesorio))
+
+    def test_reservar_descuenta_stock(self):
+        response = self._reservar(('pieza', self.pieza.pk, 2), ('accesorio', self.accesorio.pk, 1))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['reservas']), 2)
+        self.assertStock(3, 1)
+
+    def test_lote_sin_stock_suficiente_no_reserva_nada(self):
+        response = self._reservar(('pieza', self.pieza.pk, 2), ('accesorio', self.accesorio.pk, 3))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['faltantes'], [{'tipo': 'accesorio', 'id': self.accesorio.pk, 'cantidad': 3}])
+        self.assertStock(5, 2)
+        self.assertFalse(Reserva.objects.exists())
+
+    def test_cantidades_del_mismo_articulo_se_suman(self):
+        response = self._reservar(('pieza', self.pieza.pk, 3), ('pieza', self.pieza.pk, 3))
+        self.assertEqual(response.status_code, 409)
+        self.assertStock(5, 2)
+
+    def test_liberar_dos_veces_repone_una(self):
+        codigo = self._reservar(('pieza', self.pieza.pk, 2)).json()['codigo']
+        primera = self.client.post(f'/api/reservas/{codigo}/liberar/', secure=True)
+        segunda = self.client.post(f'/api/reservas/{codigo}/liberar/', secure=True)
+        self.assertEqual((primera.json()['liberadas'], segunda.json()['liberadas']), (1, 0))
+        self.assertStock(5, 2)
+
+    def test_confirmar(self):
+        codigo = self._reservar(('pieza', self.pieza.pk, 2)).json()['codigo']
+        self.assertEqual(self.client.post(f'/api/reservas/{codigo}/confirmar/', secure=True).status_code, 200)
+        # Confirmada: liberarla ya no devuelve stock
+        self.assertEqual(self.client.post(f'/api/reservas/{codigo}/liberar/', secure=True).json()['liberadas'], 0)
+        self.assertStock(3, 2)
+
+    def test_codigo_de_otro_usuario(self):
+        codigo = self._reservar(('pieza', self.pieza.pk, 2)).json()['codigo']
+        self.client.force_authenticate(self.otro)
+        for accion in ('confirmar', 'liberar'):
+            with self.subTest(accion):
+                self.assertEqual(self.client.post(f'/api/reservas/{codigo}/{accion}/', secure=True).status_code, 404)
+        self.assertStock(3, 2)
+        self.assertEqual(Reserva.objects.get(codigo=codigo).estado, 'ACTIVA')
+        self.client.force_authenticate(self.staff)
+        self.assertEqual(self.client.post(f'/api/reservas/{codigo}/liberar/', secure=True).json()['liberadas'], 1)
+        self.assertStock(5, 2)
+
+    def test_reserva_vencida(self):
+        codigo = self._reservar(('pieza', self.pieza.pk, 4), ttl_minutos=1).json()['codigo']
+        Reserva.objects.filter(codigo=codigo).update(expira_en=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.client.post(f'/api/reservas/{codigo}/confirmar/', secure=True).status_code, 409)
+        # La siguiente reserva del mismo artículo recupera el stock vencido
+        self.assertEqual(self._reservar(('pieza', self.pieza.pk, 5)).status_code, 201)
+        self.assertEqual(Reserva.objects.get(codigo=codigo).estado, 'EXPIRADA')
+        self.assertStock(0, 2)
+        self.assertEqual(servicios.liberar_expiradas(), 0)
+
+
+class ReposicionDevolucionTests(APITestCase):
+    """Una devolución de producto completada devuelve la pieza al stock una sola vez."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Usuario.objects.create_superuser(email='admin@ejemplo.com', username='admin', password='clave')
+        cls.cliente = Cliente.objects.create(usuario=cls.admin)
+        cls.pieza = Pieza.objects.create(
+            nombre='Filtro', descripcion='d', precio=Decimal('25'), stock=5, imagen='piezas/p.png', garantia=6,
+        )
+
+    def _devolucion(self):
+        return Devolucion.objects.create(
+            cliente=self.cliente, tipo='PRODUCTO', motivo='defectuosa', producto_devuelto=self.pieza,
+            estado='EN_PROCESO',
+        )
+
+    def assertStock(self, esperado):
+        self.pieza.refresh_from_db()
+        self.assertEqual(self.pieza.stock, esperado)
+
+    def test_guardar_completada(self):
+        devolucion = self._devolucion()
+        devolucion.estado = 'COMPLETADA'
+        devolucion.save()
+        devolucion.save()
+        Devolucion.objects.get(pk=devolucion.pk).save()
+        self.assertStock(6)
+        # Si después pasa también por la máquina de estados, no se repone otra vez
+        estado_cambiado.send(
+            sender=Devolucion, ids=[devolucion.pk], anteriores={devolucion.pk: 'EN_PROCESO'},
+            estado='COMPLETADA', usuario=None,
+        )
+        self.assertStock(6)
+
+    def test_transicion_a_completada(self):
+        devolucion = self._devolucion()
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(
+            f'/api/devoluciones/{devolucion.pk}/estado/', {'estado': 'COMPLETADA'}, format='json', secure=True,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertStock(6)
+        Devolucion.objects.get(pk=devolucion.pk).save()
+        self.assertStock(6)
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import ReservaLoteView, ReservaConfirmarView, ReservaLiberarView
+
+urlpatterns = [
+    path('', ReservaLoteView.as_view(), name='reserva-lote'),
+    path('<uuid:codigo>/confirmar/', ReservaConfirmarView.as_view(), name='reserva-confirmar'),
+    path('<uuid:codigo>/liberar/', ReservaLiberarView.as_view(), name='reserva-liberar'),
+]
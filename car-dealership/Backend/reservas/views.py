@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from . import servicios
+from .serializers import ReservaLoteSerializer, ReservaSerializer
+
+class ReservaLoteView(APIView):
+    """Reserva varios artículos a la vez: todos o ninguno."""
+
+    def post(self, request):
+        serializer = ReservaLoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        datos = serializer.validated_data
+        ttl = timedelta(minutes=datos['ttl_minutos']) if 'ttl_minutos' in datos else None
+        items = [(item['tipo'], item['id'], item['cantidad']) for item in datos['items']]
+
+        try:
+            reservas = servicios.reservar(items, usuario=request.user, ttl=ttl)
+        except servicios.StockInsuficiente as e:
+            return Response({
+                'error': 'Stock insuficiente',
+                'faltantes': e.faltantes
+            }, status=status.HTTP_409_CONFLICT)
+
+        datos = ReservaSerializer(reservas, many=True).data
+        return Response({
+            'codigo': datos[0]['codigo'],
+            'expira_en': datos[0]['expira_en'],
+            'reservas': datos
+        }, status=status.HTTP_201_CREATED)
+
+def _no_encontrada():
+    return Response({'error': 'Reserva no encontrada'}, status=status.HTTP_404_NOT_FOUND)
+
+class ReservaConfirmarView(APIView):
+    def post(self, request, codigo):
+        # Las reservas de otros usuarios se tratan como inexistentes
+        if not servicios.del_usuario(codigo, request.user).exists():
+            return _no_encontrada()
+        if not servicios.confirmar(codigo, request.user):
+            return Response({'error': 'La reserva no existe, ya se cerró o venció'}, status=status.HTTP_409_CONFLICT)
+        return Response({'codigo': codigo, 'estado': 'CONFIRMADA'})
+
+class ReservaLiberarView(APIView):
+    def post(self, request, codigo):
+        if not servicios.del_usuario(codigo, request.user).exists():
+            return _no_encontrada()
+        liberadas = servicios.liberar(codigo, request.user)
+        return Response({'codigo': codigo, 'liberadas': liberadas})
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class UsuariosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'usuarios'
+
+    def ready(self):
+        from car_dealership.cache_respuestas import invalidar_al_cambiar
+
+        invalidar_al_cambiar(self.get_model('Usuario'))
+        invalidar_al_cambiar(self.get_model('Empleado'))